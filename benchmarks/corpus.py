@@ -0,0 +1,144 @@
+"""
+Curated Hungarian benchmark corpus, grouped by the rule family the sentences exercise.
+"""
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+NOW = datetime(2021, 3, 10, 14, 25)
+
+CORPUS: Dict[str, List[str]] = {
+    'named_month': [
+        'tavaly február',
+        '2020 február 3',
+        'jövő március',
+        'jövő február 12-én',
+        'március elsején',
+        'május 21-én délután találkozunk',
+        'a határidő december harmincegyedike',
+        '2019 szeptemberében történt',
+        'január 5-én reggel',
+        'idén októberben lesz a konferencia',
+    ],
+    'iso_date': [
+        '2020-01-15',
+        '2020-12-30-án',
+        '2020.12.29',
+        'a számla kelte 2021.03.01., fizetési határidő 2021.03.15.',
+        '2019/05/06 óta',
+        '2022-11-02 10:30',
+        'a szerződés 2018-06-01 napján lépett hatályba',
+        '2021.07.31-ig',
+    ],
+    'relative_day': [
+        'holnap',
+        'ma este',
+        'tegnapelőtt',
+        'holnapután reggel',
+        'tegnap délután hívtalak',
+        'ma reggel óta nem ettem',
+        '3 nap múlva',
+        '2 nappal ezelőtt',
+        'az elmúlt 3 órában',
+        'most',
+    ],
+    'weekday': [
+        'jövő kedden',
+        'múlt pénteken',
+        'szombaton',
+        'ezen a héten csütörtökön',
+        'jövő hét hétfő délelőtt',
+        'két hét múlva szerdán',
+        'vasárnap este',
+        'találkozzunk jövő kedd délután!',
+        'múlt héten',
+        'jövő hónap',
+    ],
+    'clock_words': [
+        'reggel 8-kor',
+        'este fél 9-kor',
+        'délután háromnegyed négykor',
+        'hajnali 5 óra 20 perc',
+        '10 perccel 8 előtt',
+        'negyed 11 után 5 perccel',
+        '14:30-kor',
+        'találkozzunk jövő héten szombaton háromnegyed nyolc előtt két perccel',
+        'éjjel 2-kor',
+        'dél',
+    ],
+    'interval': [
+        '2020 decemberétől 2021 januárig',
+        '2021 januárig',
+        'ma 8-tól 10-ig',
+        'január 5-től február 3-ig',
+        'holnaptól 5 napig',
+        'hétfőtől péntekig',
+        'reggel 9 és délután 5 között',
+        'március 20-tól 22-ig',
+        'jövő héttől',
+        'múlt kedd óta',
+    ],
+    'duration': [
+        '2 órát tart',
+        'fél óra',
+        'három napig',
+        'két hétre foglalnék',
+        '45 perc',
+        'másfél óra',
+        'egy hónapig tart',
+        'végtelen ideig',
+        '1,5 óra',
+        'napi fél óra',
+    ],
+    'frequency': [
+        'hetente',
+        'minden nap',
+        'havonta egyszer',
+        'kéthetente kedden',
+        'negyedévente',
+        'évente kétszer',
+        'heti rendszerességgel',
+        'félévente',
+        'minden évben',
+        'naponta háromszor',
+    ],
+    'negative': [
+        'nincs benne dátum',
+        'köszönöm szépen a segítséget',
+        'a kutya ugat, a karaván halad',
+        'kérem küldje el a dokumentumot',
+        'ez egy hosszabb mondat, amelyben semmilyen időpontra vagy időtartamra utaló kifejezés nem szerepel',
+        'ok',
+        'igen, rendben van',
+        'a csomag megérkezett a raktárba',
+    ],
+}
+
+LONG_INPUTS: List[str] = [
+    'találkozzunk jövő kedd délután, ha a többiek is ráérnek, különben szerdán este nyolc órakor a szokott helyen',
+    'a megbeszélés holnap reggel kezdődik, a szünet tíz perccel dél előtt lesz, utána fél kettőkor folytatjuk ' * 3,
+]
+
+# inputs of datetime2text
+DATETIMES: List[datetime] = [
+    datetime(2021, 3, 10, 14, 25),
+    datetime(2021, 3, 11, 8, 0),
+    datetime(2021, 3, 8, 19, 43, 12),
+    datetime(2020, 12, 20, 18, 34),
+    datetime(2021, 7, 1, 0, 0),
+    datetime(2022, 1, 15, 12, 30, 45),
+]
+
+# (interval start, interval end, query) inputs of extract_datetime_within_interval
+RESTRICTED_QUERIES: List[Tuple[datetime, datetime, str]] = [
+    (datetime(2021, 3, 8), datetime(2021, 3, 14, 23, 59, 59), query)
+    for query in ['kedden', 'holnap reggel', 'délután 3-kor', 'pénteken este fél 8', 'jövő héten', '10:30',
+                  'hétfőtől szerdáig', 'nincs benne dátum']
+]
+
+
+def text_families() -> List[str]:
+    return list(CORPUS)
+
+
+def all_sentences() -> List[str]:
+    return [s for sentences in CORPUS.values() for s in sentences] + LONG_INPUTS
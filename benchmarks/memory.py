@@ -0,0 +1,107 @@
+"""
+tracemalloc based allocation measurements, the --memory mode of benchmarks/suite.py.
+
+tracemalloc only tracks the live blocks, so two things are measured: the high-water mark of the memory allocated
+during a call (peak bytes, the transient working set of a parse) and what the calls leave allocated behind
+(retained blocks and bytes, e.g. growing caches). The batch measurements report the peak memory of parsing a large
+number of sentences at once.
+"""
+import tracemalloc
+from array import array
+from typing import Any, Callable, Dict, List, Sequence
+
+from hun_date_parser import text2datetime
+from hun_date_parser.batch import parse_many
+
+from benchmarks.corpus import NOW
+
+
+def _retained(before: tracemalloc.Snapshot, after: tracemalloc.Snapshot) -> Dict[str, int]:
+    blocks, size = 0, 0
+    for stat in after.compare_to(before, 'filename'):
+        blocks += stat.count_diff
+        size += stat.size_diff
+    return {'blocks': blocks, 'bytes': size}
+
+
+def measure_allocations(func: Callable[[Any], Any], inputs: Sequence[Any], rounds: int) -> Dict[str, float]:
+    """
+    Calls func on every input rounds times (after one warm-up pass) while tracing the allocations, once for the
+    retained blocks and once for the peaks.
+    :return: dictionary with the number of calls, the mean and maximum peak bytes of a call and the blocks and bytes
+    retained per call
+    """
+    for x in inputs:
+        func(x)
+
+    # the retained blocks are measured over all the calls traced as a whole, the peaks with the tracing restarted around
+    # every call (tracemalloc.reset_peak is only available from Python 3.9), so that each peak is the one of its call
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        for _ in range(rounds):
+            for x in inputs:
+                func(x)
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    peaks = array('q', bytes(8 * rounds * len(inputs)))
+    i = 0
+    for _ in range(rounds):
+        for x in inputs:
+            tracemalloc.start()
+            try:
+                func(x)
+                peaks[i] = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+            i += 1
+
+    retained = _retained(before, after)
+    return {
+        'calls': len(peaks),
+        'peak_bytes_mean': sum(peaks) / len(peaks),
+        'peak_bytes_max': max(peaks),
+        'retained_blocks_per_call': retained['blocks'] / len(peaks),
+        'retained_bytes_per_call': retained['bytes'] / len(peaks),
+    }
+
+
+def _batch_runs() -> Dict[str, Callable[[List[str]], Any]]:
+    runs: Dict[str, Callable[[List[str]], Any]] = {
+        'text2datetime_loop': lambda sentences: [text2datetime(s, now=NOW) for s in sentences],
+        'parse_many_records': lambda sentences: parse_many(sentences, now=NOW),
+    }
+    try:
+        import numpy  # noqa: F401
+        runs['parse_many_numpy'] = lambda sentences: parse_many(sentences, now=NOW, output='numpy')
+    except ImportError:
+        pass
+    return runs
+
+
+def measure_batches(sentences: List[str], batch_size: int) -> List[Dict[str, Any]]:
+    """
+    Peak memory of parsing batch_size sentences (the input cycled) with each batch function, the result is kept alive
+    until the end of the measurement, so its size is part of the retained bytes.
+    """
+    batch = [sentences[i % len(sentences)] for i in range(batch_size)]
+    results = []
+    for name, run in _batch_runs().items():
+        tracemalloc.start()
+        try:
+            # the tracing was just started, so its peak is the one of the run
+            before = tracemalloc.take_snapshot()
+            current, _ = tracemalloc.get_traced_memory()
+            output = run(batch)
+            peak = tracemalloc.get_traced_memory()[1] - current
+            after = tracemalloc.take_snapshot()
+        finally:
+            tracemalloc.stop()
+        del output
+
+        retained = _retained(before, after)
+        results.append({'batch': name, 'batch_size': batch_size, 'peak_bytes': peak,
+                        'retained_blocks': retained['blocks'], 'retained_bytes': retained['bytes']})
+    return results
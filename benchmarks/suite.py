@@ -0,0 +1,236 @@
+"""
+Benchmark suite of the public entry points over the curated corpus (benchmarks/corpus.py).
+
+Every entry point is timed call by call on each corpus family, the results (throughput and latency percentiles) are
+printed as a table and optionally written as JSON, which a later run can be compared against. With --memory the
+allocations are measured instead of the latencies (see benchmarks/memory.py).
+
+Usage: python -m benchmarks.suite [--rounds N] [--entry-point NAME] [--family NAME] [--output FILE]
+                                  [--compare FILE [--max-regression PCT]] [--profile] [--memory [--batch-size N]]
+                                  [--slow-log FILE] [--synthetic N [--seed S]]
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import hun_date_parser
+from hun_date_parser import (DatetimeExtractor, text2datetime, text2date_with_spans, parse_duration, parse_frequency,
+                             datetime2text, has_temporal_expression, Profiler)
+from hun_date_parser.date_parser.prefilter import default_prefilter
+from hun_date_parser.date_parser.interval_restriction import extract_datetime_within_interval
+from hun_date_parser.batch.metrics import percentile
+from hun_date_parser.batch.synthetic import sentences as synthetic_sentences
+
+from benchmarks.corpus import CORPUS, LONG_INPUTS, DATETIMES, RESTRICTED_QUERIES, NOW, all_sentences
+from benchmarks.memory import measure_allocations, measure_batches
+
+TEXT_FAMILIES = {**CORPUS, 'long': LONG_INPUTS}
+
+# entry point name -> (function of a single input, inputs by family)
+ENTRY_POINTS: Dict[str, Tuple[Callable[[Any], Any], Mapping[str, Sequence[Any]]]] = {
+    'text2datetime': (lambda s: text2datetime(s, now=NOW), TEXT_FAMILIES),
+    'text2date_with_spans': (lambda s: text2date_with_spans(s, now=NOW), TEXT_FAMILIES),
+    'text2datetime_prefilter': (DatetimeExtractor(now=NOW, prefilter=True).parse_datetime, TEXT_FAMILIES),
+    'has_temporal_expression': (has_temporal_expression, TEXT_FAMILIES),
+    'parse_duration': (parse_duration, TEXT_FAMILIES),
+    'parse_frequency': (parse_frequency, TEXT_FAMILIES),
+    'datetime2text': (lambda dt: datetime2text(dt, now=NOW), {'datetimes': DATETIMES}),
+    'extract_datetime_within_interval': (lambda q: extract_datetime_within_interval(*q, fallback_now=NOW),
+                                         {'restricted': RESTRICTED_QUERIES}),
+}
+
+PERCENTILES = (50, 90, 99)
+
+
+def measure_latency(func: Callable[[Any], Any], inputs: Sequence[Any], rounds: int) -> Dict[str, float]:
+    """
+    Calls func on every input rounds times (after one warm-up pass), timing each call.
+    :return: dictionary with the number of calls, throughput (calls/s) and latency statistics in microseconds
+    """
+    for x in inputs:
+        func(x)
+
+    latencies = []
+    for _ in range(rounds):
+        for x in inputs:
+            start = time.perf_counter_ns()
+            func(x)
+            latencies.append((time.perf_counter_ns() - start) / 1000)
+
+    latencies.sort()
+    total = sum(latencies)
+    stats = {
+        'calls': len(latencies),
+        'throughput': len(latencies) / total * 1e6 if total else 0.0,
+        'mean_us': total / len(latencies),
+    }
+    for p in PERCENTILES:
+        stats[f'p{p}_us'] = percentile(latencies, p)
+    stats['max_us'] = latencies[-1]
+    return stats
+
+
+def select(entry_points: Optional[List[str]], families: Optional[List[str]]) -> List[Tuple[str, str]]:
+    """(entry point, family) pairs to run, all of them by default."""
+    pairs = []
+    for name, (_, inputs) in ENTRY_POINTS.items():
+        if entry_points and name not in entry_points:
+            continue
+        for family in inputs:
+            if families and family not in families:
+                continue
+            pairs.append((name, family))
+    return pairs
+
+
+def run(pairs: List[Tuple[str, str]], rounds: int,
+        measure: Callable[[Callable[[Any], Any], Sequence[Any], int], Dict[str, float]] = measure_latency
+        ) -> List[Dict[str, Any]]:
+    results = []
+    for name, family in pairs:
+        func, inputs = ENTRY_POINTS[name]
+        results.append({'entry_point': name, 'family': family, **measure(func, inputs[family], rounds)})
+    return results
+
+
+def metadata(**settings: Any) -> Dict[str, Any]:
+    return {
+        'version': hun_date_parser.__version__,
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'created': datetime.now().isoformat(timespec='seconds'),
+        **settings,
+    }
+
+
+def print_table(results: List[Dict[str, Any]], baseline: Optional[Dict[Tuple[str, str], Dict[str, Any]]]) -> None:
+    header = f'{"entry point":<34}{"family":<13}{"calls/s":>10}{"p50 us":>10}{"p90 us":>10}{"p99 us":>10}'
+    print(header + (f'{"vs base":>10}' if baseline is not None else ''))
+    for r in results:
+        line = (f'{r["entry_point"]:<34}{r["family"]:<13}{r["throughput"]:>10.0f}{r["p50_us"]:>10.1f}'
+                f'{r["p90_us"]:>10.1f}{r["p99_us"]:>10.1f}')
+        if baseline is not None:
+            base = baseline.get((r['entry_point'], r['family']))
+            line += f'{r["throughput"] / base["throughput"] - 1:>+10.1%}' if base else f'{"-":>10}'
+        print(line)
+
+
+def print_memory_table(results: List[Dict[str, Any]], batches: List[Dict[str, Any]],
+                       baseline: Optional[Dict[Tuple[str, str], Dict[str, Any]]]) -> None:
+    header = f'{"entry point":<34}{"family":<13}{"peak B":>10}{"max B":>10}{"kept blk":>10}{"kept B":>10}'
+    print(header + (f'{"vs base":>10}' if baseline is not None else ''))
+    for r in results:
+        line = (f'{r["entry_point"]:<34}{r["family"]:<13}{r["peak_bytes_mean"]:>10.0f}{r["peak_bytes_max"]:>10.0f}'
+                f'{r["retained_blocks_per_call"]:>10.2f}{r["retained_bytes_per_call"]:>10.1f}')
+        if baseline is not None:
+            base = baseline.get((r['entry_point'], r['family']))
+            line += (f'{r["peak_bytes_mean"] / base["peak_bytes_mean"] - 1:>+10.1%}'
+                     if base and base.get('peak_bytes_mean') else f'{"-":>10}')
+        print(line)
+
+    if batches:
+        print()
+        print(f'{"batch":<34}{"size":>10}{"peak MiB":>12}{"kept MiB":>12}')
+        for b in batches:
+            print(f'{b["batch"]:<34}{b["batch_size"]:>10}{b["peak_bytes"] / 2 ** 20:>12.2f}'
+                  f'{b["retained_bytes"] / 2 ** 20:>12.2f}')
+
+
+def regressions(results: List[Dict[str, Any]], baseline: Dict[Tuple[str, str], Dict[str, Any]], memory: bool,
+                max_regression: float) -> List[str]:
+    """Entry point and family pairs which got slower (or allocate more) than the baseline by more than the limit."""
+    failed = []
+    for r in results:
+        base = baseline.get((r['entry_point'], r['family']))
+        if memory and base and base.get('peak_bytes_mean'):
+            change = r['peak_bytes_mean'] / base['peak_bytes_mean'] - 1
+        elif not memory and base and base.get('throughput'):
+            change = base['throughput'] / r['throughput'] - 1
+        else:
+            continue
+        if change > max_regression / 100:
+            failed.append(f'{r["entry_point"]} {r["family"]}: {change:+.1%}')
+    return failed
+
+
+def load_baseline(path: str) -> Dict[Tuple[str, str], Dict[str, Any]]:
+    with open(path, encoding='utf-8') as f:
+        report = json.load(f)
+    return {(r['entry_point'], r['family']): r for r in report['results']}
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rounds', type=int, default=20, help='timed passes over the inputs of each family')
+    parser.add_argument('--entry-point', action='append', choices=list(ENTRY_POINTS),
+                        help='entry point to run, can be repeated (default: all)')
+    parser.add_argument('--family', action='append', help='corpus family to run, can be repeated (default: all)')
+    parser.add_argument('--output', help='write the results as JSON to this file')
+    parser.add_argument('--compare', help='JSON results of an earlier run to compare the throughput with')
+    parser.add_argument('--max-regression', type=float,
+                        help='with --compare, exit with status 1 if an entry point got slower (with --memory: its peak '
+                             'memory grew) by more than this percentage')
+    parser.add_argument('--profile', action='store_true',
+                        help='profile the pipeline stages and rules during the run (slows the measured calls down)')
+    parser.add_argument('--memory', action='store_true',
+                        help='measure the allocations (peak and retained bytes per call) instead of the latencies')
+    parser.add_argument('--batch-size', type=int, default=0,
+                        help='with --memory, also measure the peak memory of parsing this many sentences at once')
+    parser.add_argument('--slow-log', help='JSON dump of a SlowLog, its texts are run as the slow_log family')
+    parser.add_argument('--synthetic', type=int, default=0,
+                        help='run this many generated sentences as the synthetic family')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the generated sentences')
+    args = parser.parse_args(argv)
+
+    if args.slow_log:
+        with open(args.slow_log, encoding='utf-8') as f:
+            TEXT_FAMILIES['slow_log'] = [entry['text'] for entry in json.load(f)['entries']]
+    if args.synthetic:
+        TEXT_FAMILIES['synthetic'] = synthetic_sentences(args.synthetic, seed=args.seed)
+
+    baseline = load_baseline(args.compare) if args.compare else None
+    pairs = select(args.entry_point, args.family)
+    measure = measure_allocations if args.memory else measure_latency
+    profiler = Profiler()
+    if args.profile:
+        with profiler:
+            results = run(pairs, args.rounds, measure)
+    else:
+        results = run(pairs, args.rounds, measure)
+
+    batches = measure_batches(all_sentences(), args.batch_size) if args.memory and args.batch_size else []
+    if args.memory:
+        print_memory_table(results, batches, baseline)
+    else:
+        print_table(results, baseline)
+
+    report: Dict[str, Any] = {'meta': metadata(rounds=args.rounds, profile=args.profile, memory=args.memory,
+                                               synthetic=args.synthetic, seed=args.seed),
+                              'results': results}
+    if batches:
+        report['batches'] = batches
+    if default_prefilter.checked:
+        print(f'\nprefilter reject rate: {default_prefilter.reject_rate:.1%}')
+        report['prefilter'] = default_prefilter.to_dict()
+    if args.profile:
+        print()
+        print(profiler.report())
+        report['profile'] = profiler.to_dict()
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    if baseline is not None and args.max_regression is not None:
+        failed = regressions(results, baseline, args.memory, args.max_regression)
+        if failed:
+            print(f'\nregressions over {args.max_regression}%:', *failed, sep='\n  ')
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
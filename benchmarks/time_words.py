@@ -0,0 +1,44 @@
+"""
+Micro-benchmark of the clock word rule (match_time_words) on its own.
+
+Usage: python -m benchmarks.time_words [--number N] [--repeat R]
+"""
+import argparse
+import timeit
+
+from hun_date_parser.date_parser.time_parsers import match_time_words
+
+INPUTS = [
+    'reggel 8-kor',
+    'este fél 9-kor',
+    'délután háromnegyed négykor',
+    'hajnali 5 óra 20 perc',
+    '10 perccel 8 előtt',
+    'negyed 11 után 5 perccel',
+    'holnap 3-kor',
+    'jövő hét kedden',
+    '2021 január 5',
+    'nincs benne időpont',
+    'találkozzunk jövő kedd délután, ha a többiek is ráérnek, különben szerdán este nyolc órakor a szokott helyen',
+    'a megbeszélés holnap reggel kezdődik, a szünet tíz perccel dél előtt lesz, utána fél kettőkor folytatjuk ' * 3,
+]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--number', type=int, default=2000, help='calls per input and repetition')
+    parser.add_argument('--repeat', type=int, default=5, help='repetitions, the fastest one is reported')
+    args = parser.parse_args()
+
+    total = 0.0
+    for s in INPUTS:
+        best = min(timeit.repeat(lambda: match_time_words(s), number=args.number, repeat=args.repeat))
+        total += best
+        label = s if len(s) <= 40 else s[:37] + '...'
+        print(f'{label:<40} {len(s):>4} chars {best / args.number * 1e6:>9.1f} us/call')
+
+    print(f'{"mean":<40} {"":>10} {total / args.number / len(INPUTS) * 1e6:>9.1f} us/call')
+
+
+if __name__ == '__main__':
+    main()
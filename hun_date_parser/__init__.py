@@ -1,11 +1,20 @@
 from hun_date_parser.date_textualizer.datetime_textualizer import DatetimeTextualizer, datetime2text
 from hun_date_parser.date_parser.datetime_extractor import (DatetimeExtractor, text2datetime, text2date, text2time,
                                                             text2datetime_with_spans, text2date_with_spans)
-from hun_date_parser.duration_parser.duration_parsers import parse_duration, parse_duration_with_spans
+from hun_date_parser.duration_parser.duration_parsers import (parse_duration, parse_duration_with_spans,
+                                                              parse_durations_with_spans)
 from hun_date_parser.frequency_parser.frequency_parsers import parse_frequency
+from hun_date_parser.frequency_parser.recurrence import parse_recurrence, Recurrence
+from hun_date_parser.date_parser.profiling import Profiler
+from hun_date_parser.date_parser.slow_log import SlowLog
+from hun_date_parser.date_parser.prefilter import Prefilter, has_temporal_expression
+from hun_date_parser.date_parser.parse_cache import ParseCache
+from hun_date_parser.analyzer.text_analyzer import analyze, Analysis
 
 __all__ = ["DatetimeTextualizer", "DatetimeExtractor", "datetime2text", "text2datetime", "text2date", "text2time",
            "text2datetime_with_spans", "text2date_with_spans", "parse_duration", "parse_duration_with_spans",
-           "parse_frequency"]
+           "parse_durations_with_spans", "parse_frequency", "parse_recurrence", "Recurrence",
+           "Profiler", "SlowLog", "Prefilter",
+           "has_temporal_expression", "ParseCache", "analyze", "Analysis"]
 
 __version__ = "0.3.3"
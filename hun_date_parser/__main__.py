@@ -0,0 +1,6 @@
+import sys
+
+from hun_date_parser.batch.cli import main
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,3 @@
+from hun_date_parser.analyzer.text_analyzer import analyze, Analysis
+
+__all__ = ["analyze", "Analysis"]
@@ -0,0 +1,85 @@
+"""
+Dates, durations and frequencies of a text in one call.
+
+    analysis = analyze('Jövő héttől hetente kétszer edzek 45 percet', now=datetime(2024, 5, 8))
+    analysis.dates        # as text2datetime_with_spans
+    analysis.durations    # as parse_durations_with_spans
+    analysis.frequencies  # as scan_frequencies
+    analysis.spans()      # [(0, 8, 'date'), (12, 19, 'frequency'), (34, 43, 'duration')]
+
+Calling text2datetime_with_spans, parse_duration_with_spans and parse_frequency one after the other lowercases and
+accent folds the text three times. analyze normalizes it once: the lowercase form (lower_keep_positions) goes to the
+rules of the datetime extractor, the accent folded one to the temporal hints of the prefilter, the duration scan and
+the frequency scan. A text without any temporal hint has none of the three, so it is answered without running the
+parsers. Both forms keep the character positions of the text, so every span of the result is an offset into the
+input text and every match_text is the slice of the input text at that span.
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from hun_date_parser.date_parser.datetime_extractor import DatetimeExtractor
+from hun_date_parser.date_parser.prefilter import has_temporal_expression
+from hun_date_parser.duration_parser.duration_parsers import parse_durations_with_spans
+from hun_date_parser.frequency_parser.frequency_parsers import scan_frequencies
+from hun_date_parser.utils import SearchScopes, lower_keep_positions, remove_accent
+
+
+@dataclass
+class Analysis:
+    """
+    The temporal expressions of a text, with spans in the coordinates of the text.
+    :param text: the analyzed text
+    :param dates: datetime intervals in the format of text2datetime_with_spans
+    :param durations: every duration in the format of parse_durations_with_spans
+    :param frequencies: every frequency in the format of scan_frequencies
+    """
+    text: str
+    dates: List[Dict[str, Any]] = field(default_factory=list)
+    durations: List[Dict[str, Any]] = field(default_factory=list)
+    frequencies: List[Dict[str, Any]] = field(default_factory=list)
+
+    def spans(self) -> List[Tuple[int, int, str]]:
+        """
+        :return: (start, end, kind) of every expression in the order of the text, kind is 'date', 'duration' or
+        'frequency'
+        """
+        return sorted((result['match_start'], result['match_end'], kind)
+                      for kind, results in (('date', self.dates), ('duration', self.durations),
+                                            ('frequency', self.frequencies))
+                      for result in results if 'match_start' in result)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'text': self.text, 'dates': self.dates, 'durations': self.durations, 'frequencies': self.frequencies}
+
+
+def analyze(text: str, now: datetime = datetime.now(), search_scope: SearchScopes = SearchScopes.NOT_RESTRICTED,
+            realistic_year_required: bool = True, return_preferred_unit: bool = False,
+            extractor: Optional[DatetimeExtractor] = None) -> Analysis:
+    """
+    Extracts the dates, durations and frequencies of a text from one normalization of it.
+    :param text: Input text.
+    :param now: Current timestamp to calculate relative dates.
+    :param search_scope: Defines whether the timeframe should be restricted to past or future.
+    :param realistic_year_required: Defines whether to restrict year candidates to be between 1900 and 2100.
+    :param return_preferred_unit: If True, the durations include their preferred unit information.
+    :param extractor: DatetimeExtractor to extract the dates with (to reuse its cache, profiler, ...), now,
+    search_scope and realistic_year_required are taken from it if given.
+    :return: the analysis of the text
+    """
+    lowered = lower_keep_positions(text)
+    folded = remove_accent(lowered)
+    if not has_temporal_expression(text, folded):
+        return Analysis(text)
+
+    if extractor is None:
+        extractor = DatetimeExtractor(now=now, output_container='datetime', search_scope=search_scope,
+                                      realistic_year_required=realistic_year_required)
+    dates: List[Dict[str, Any]] = extractor._parse_datetime(text, include_spans=True, lowered=lowered)
+    for date in dates:
+        if 'match_start' in date:
+            date['match_text'] = text[date['match_start']:date['match_end']]
+
+    return Analysis(text, dates, parse_durations_with_spans(text, return_preferred_unit, folded),
+                    scan_frequencies(text, folded))
@@ -0,0 +1,8 @@
+from hun_date_parser.batch.vectorized import resolve_datetime, ResolvedIntervals
+from hun_date_parser.batch.columnar import IntervalColumns, to_columns
+from hun_date_parser.batch.parsing import parse_many
+from hun_date_parser.batch.micro_batcher import MicroBatcher
+from hun_date_parser.batch.file_parsing import FileColumns, parse_file
+
+__all__ = ["resolve_datetime", "ResolvedIntervals", "IntervalColumns", "to_columns", "parse_many", "MicroBatcher",
+           "FileColumns", "parse_file"]
@@ -0,0 +1,237 @@
+"""
+Command line interface for parsing many texts, run as `python -m hun_date_parser`.
+
+    python -m hun_date_parser messages.txt --mode analyze --workers 4 > parsed.jsonl
+    cat messages.jsonl | python -m hun_date_parser --format jsonl --now 2024-05-08T10:00:00
+    python -m hun_date_parser tickets.csv --text-field body --now-field created_at --mode duration
+
+The input is newline delimited text (one text per line), JSONL (one object per line with a text field and an optional
+reference time field in ISO format) or CSV with a header row, read from a file or stdin. It is streamed in chunks:
+every chunk is parsed (by a worker process if --workers > 1) and written before the input is read further than a few
+chunks ahead, so inputs of any size run in constant memory.
+
+Every input record gives one JSONL output line: its record number, the text and the results of the mode, with
+datetimes in ISO format and spans as offsets into the text (or an error). A closing stats line reports the throughput
+and the latency percentiles of the parses.
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import date, datetime, time
+from enum import Enum
+from functools import partial
+from time import perf_counter
+from typing import Any, Deque, Dict, IO, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from hun_date_parser.analyzer.text_analyzer import analyze
+from hun_date_parser.batch.metrics import latency_summary
+from hun_date_parser.date_parser.datetime_extractor import DatetimeExtractor
+from hun_date_parser.duration_parser.duration_parsers import parse_durations_with_spans
+from hun_date_parser.frequency_parser.frequency_parsers import scan_frequencies
+from hun_date_parser.utils import SearchScopes
+
+MODES = ('datetime', 'date', 'time', 'duration', 'frequency', 'analyze')
+FORMATS = ('auto', 'text', 'jsonl', 'csv')
+
+# record number, text, reference time in ISO format (None for the default one), error of reading the record
+Record = Tuple[int, str, Optional[str], Optional[str]]
+# record number, text, results, error, seconds spent parsing
+Output = Tuple[int, str, Any, Optional[str], float]
+
+
+def json_default(value: Any) -> Any:
+    """JSON encoder fallback of the results: ISO format of the datetimes, value of the enums."""
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f'{type(value).__name__} is not JSON serializable')
+
+
+def _parse_text(text: str, now: datetime, mode: str, search_scope: SearchScopes) -> Any:
+    """Results of one text in the given mode."""
+    if mode in ('datetime', 'date', 'time'):
+        extractor = DatetimeExtractor(now=now, output_container=mode, search_scope=search_scope)
+        return extractor._parse_datetime(text, include_spans=True)
+    if mode == 'duration':
+        return parse_durations_with_spans(text, return_preferred_unit=True)
+    if mode == 'frequency':
+        return scan_frequencies(text)
+    analysis = analyze(text, now, search_scope=search_scope, return_preferred_unit=True).to_dict()
+    del analysis['text']
+    return analysis
+
+
+def _parse_chunk(records: List[Record], mode: str, search_scope: SearchScopes, default_now: datetime) -> List[Output]:
+    """Parses a chunk of records, the failures of single records are reported in their output."""
+    outputs = []
+    for number, text, now, error in records:
+        start = perf_counter()
+        results = None
+        if error is None:
+            try:
+                results = _parse_text(text, default_now if now is None else datetime.fromisoformat(now), mode,
+                                      search_scope)
+            except Exception as e:
+                error = repr(e)
+        outputs.append((number, text, results, error, perf_counter() - start))
+    return outputs
+
+
+def read_records(stream: IO[str], input_format: str, text_field: str = 'text',
+                 now_field: str = 'now') -> Iterator[Record]:
+    """
+    Reads the input records, the records which can't be read are yielded with their error.
+    :param stream: input stream
+    :param input_format: 'text', 'jsonl' or 'csv'
+    :param text_field: field of the text in the JSONL objects and the CSV columns
+    :param now_field: field of the reference time in the JSONL objects and the CSV columns
+    :return: iterator of (record number, text, reference time or None, error or None), numbered from 1
+    """
+    if input_format == 'text':
+        for number, line in enumerate(stream, 1):
+            yield number, line.rstrip('\r\n'), None, None
+
+    elif input_format == 'jsonl':
+        for number, line in enumerate(stream, 1):
+            try:
+                obj = json.loads(line)
+                yield number, str(obj[text_field]), obj.get(now_field), None
+            except (ValueError, KeyError, TypeError, AttributeError) as e:
+                yield number, line.rstrip('\r\n'), None, repr(e)
+
+    else:
+        reader = csv.DictReader(stream)
+        if reader.fieldnames is not None and text_field not in reader.fieldnames:
+            raise ValueError(f'the CSV input has no {text_field!r} column')
+        for number, row in enumerate(reader, 1):
+            yield number, row[text_field] or '', row.get(now_field) or None, None
+
+
+def _chunks(records: Iterable[Record], chunk_size: int) -> Iterator[List[Record]]:
+    chunk: List[Record] = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def parse_records(records: Iterable[Record], mode: str = 'datetime',
+                  search_scope: SearchScopes = SearchScopes.NOT_RESTRICTED, now: Optional[datetime] = None,
+                  workers: int = 1, chunk_size: int = 256) -> Iterator[Output]:
+    """
+    Parses the records in chunks, in the order of the records.
+    :param records: records of read_records
+    :param mode: one of MODES
+    :param search_scope: Defines whether the timeframe should be restricted to past or future.
+    :param now: reference time of the records without one, defaults to the current time
+    :param workers: number of worker processes, 1 parses in the current process
+    :param chunk_size: number of records sent to a worker at once
+    :return: iterator of (record number, text, results, error or None, seconds spent parsing)
+    """
+    if mode not in MODES:
+        raise ValueError(f'mode must be one of {MODES}, got {mode!r}')
+    parse = partial(_parse_chunk, mode=mode, search_scope=search_scope, default_now=now or datetime.now())
+
+    if workers <= 1:
+        for chunk in _chunks(records, chunk_size):
+            yield from parse(chunk)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # a few chunks per worker in flight, so the input is not read ahead of the output
+        pending: Deque[Future] = deque()
+        for chunk in _chunks(records, chunk_size):
+            pending.append(executor.submit(parse, chunk))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def _stats(latencies: List[float], errors: int, seconds: float) -> Dict[str, Any]:
+    latencies.sort()
+    return {'items': len(latencies), 'errors': errors, 'seconds': round(seconds, 6),
+            'items_per_second': round(len(latencies) / seconds, 2) if seconds > 0 else 0.0,
+            'latency_ms': latency_summary(latencies)}
+
+
+def _detect_format(path: str) -> str:
+    if path.endswith('.jsonl') or path.endswith('.ndjson'):
+        return 'jsonl'
+    if path.endswith('.csv'):
+        return 'csv'
+    return 'text'
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='python -m hun_date_parser',
+                                     description='Extracts dates, durations and frequencies from Hungarian texts, '
+                                                 'one JSONL output line per input record.')
+    parser.add_argument('input', nargs='?', default='-', help='input file, - for stdin (default)')
+    parser.add_argument('-o', '--output', default='-', help='output file, - for stdout (default)')
+    parser.add_argument('-f', '--format', choices=FORMATS, default='auto',
+                        help='input format, auto detects jsonl and csv by the file extension, text otherwise')
+    parser.add_argument('-m', '--mode', choices=MODES, default='datetime', help='what to extract (default datetime)')
+    parser.add_argument('--now', type=datetime.fromisoformat, default=None,
+                        help='reference time in ISO format of the records without one, defaults to the current time')
+    parser.add_argument('--search-scope', choices=[scope.value for scope in SearchScopes],
+                        default=SearchScopes.NOT_RESTRICTED.value, help='time horizon of the ambiguous dates')
+    parser.add_argument('--text-field', default='text', help='text field of the JSONL and CSV inputs')
+    parser.add_argument('--now-field', default='now', help='reference time field of the JSONL and CSV inputs')
+    parser.add_argument('-w', '--workers', type=int, default=1, help='number of worker processes (default 1)')
+    parser.add_argument('--chunk-size', type=int, default=256,
+                        help='number of records parsed by a worker at once (default 256)')
+    parser.add_argument('--stats', choices=('stderr', 'stdout', 'none'), default='stderr',
+                        help='where to write the closing stats line (default stderr)')
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.workers < 1 or args.chunk_size < 1:
+        raise SystemExit('--workers and --chunk-size must be positive')
+    input_format = _detect_format(args.input) if args.format == 'auto' else args.format
+
+    stream = sys.stdin if args.input == '-' else open(args.input, encoding='utf-8', newline='')
+    out = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+    latencies: List[float] = []
+    errors = 0
+    start = perf_counter()
+    try:
+        records = read_records(stream, input_format, args.text_field, args.now_field)
+        for number, text, results, error, elapsed in parse_records(records, args.mode, SearchScopes(args.search_scope),
+                                                                   args.now, args.workers, args.chunk_size):
+            line: Dict[str, Any] = {'record': number, 'text': text}
+            if error is None:
+                line['results'] = results
+            else:
+                line['error'] = error
+                errors += 1
+            out.write(json.dumps(line, ensure_ascii=False, default=json_default) + '\n')
+            latencies.append(elapsed)
+
+        stats = json.dumps({'stats': _stats(latencies, errors, perf_counter() - start)})
+        if args.stats == 'stdout':
+            out.write(stats + '\n')
+        elif args.stats == 'stderr':
+            print(stats, file=sys.stderr)
+        out.flush()
+    except BrokenPipeError:
+        # the reader of the output went away (| head), the rest of the output is discarded silently
+        os.dup2(os.open(os.devnull, os.O_WRONLY), out.fileno())
+        return 1
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+        if out is not sys.stdout:
+            out.close()
+    return 0
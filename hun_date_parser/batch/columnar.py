@@ -0,0 +1,116 @@
+"""
+Columnar representation of the intervals extracted from many sentences.
+
+Each extracted interval is one row of the columns, the intervals of the i-th input are the rows
+offsets[i]:offsets[i + 1] (input_index holds the same information per row). Open or missing interval ends are NaT
+in the numpy columns and nulls in the Arrow table.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Sequence
+
+from hun_date_parser.batch.vectorized import _numpy
+
+COLUMNS = ('input_index', 'start', 'end', 'match_start', 'match_end', 'rule')
+
+
+def _pyarrow() -> Any:
+    try:
+        import pyarrow  # type: ignore
+    except ImportError as e:
+        raise ImportError('Arrow output requires pyarrow (pip install pyarrow).') from e
+    return pyarrow
+
+
+def has_pyarrow() -> bool:
+    try:
+        _pyarrow()
+    except ImportError:
+        return False
+    return True
+
+
+@dataclass
+class IntervalColumns:
+    """
+    Intervals of n input sentences as numpy arrays. offsets has n + 1 elements, the other arrays have one element
+    per interval: start and end are datetime64 (NaT for open ends), match_start and match_end are character offsets
+    in the input (-1 if unknown), rule is the comma separated names of the rules which matched the interval.
+    """
+    offsets: Any
+    input_index: Any
+    start: Any
+    end: Any
+    match_start: Any
+    match_end: Any
+    rule: Any
+
+    def __len__(self) -> int:
+        return len(self.input_index)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        :return: dictionary of the interval columns (without offsets)
+        """
+        return {name: getattr(self, name) for name in COLUMNS}
+
+    def to_arrow(self, nested: bool = False) -> Any:
+        """
+        Converts the columns to a pyarrow.Table, open interval ends become nulls.
+        :param nested: If True, the table has one row per input with a list of interval structs built from the
+        offsets, otherwise one row per interval.
+        :return: pyarrow.Table
+        """
+        pa = _pyarrow()
+        np = _numpy()
+        arrays = [
+            pa.array(self.input_index, type=pa.int64()),
+            pa.array(self.start, mask=np.isnat(self.start)),
+            pa.array(self.end, mask=np.isnat(self.end)),
+            pa.array(self.match_start, type=pa.int64(), mask=self.match_start < 0),
+            pa.array(self.match_end, type=pa.int64(), mask=self.match_end < 0),
+            pa.array(self.rule, type=pa.string()),
+        ]
+        if not nested:
+            return pa.Table.from_arrays(arrays, names=list(COLUMNS))
+
+        intervals = pa.StructArray.from_arrays(arrays[1:], names=list(COLUMNS[1:]))
+        return pa.Table.from_arrays([
+            pa.array(np.arange(len(self.offsets) - 1), type=pa.int64()),
+            pa.LargeListArray.from_arrays(pa.array(self.offsets, type=pa.int64()), intervals),
+        ], names=['input_index', 'intervals'])
+
+
+def to_columns(results: Sequence[List[Dict[str, Any]]], output_container: str = 'datetime') -> IntervalColumns:
+    """
+    Converts per input interval lists (the output of text2datetime_with_spans or text2date_with_spans, optionally
+    with the 'rules' key) to columns.
+    :param results: list of interval lists, one per input sentence
+    :param output_container: 'datetime' for datetime64[s] or 'date' for datetime64[D] columns
+    :return: IntervalColumns
+    """
+    np = _numpy()
+    if output_container not in ('datetime', 'date'):
+        raise ValueError(f"output_container must be 'datetime' or 'date', got {output_container!r}")
+    unit = 's' if output_container == 'datetime' else 'D'
+
+    offsets = np.zeros(len(results) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(intervals) for intervals in results])
+    intervals = [interval for intervals in results for interval in intervals]
+
+    def dates(key: str) -> Any:
+        return np.array([np.datetime64('NaT') if interval[key] is None else interval[key] for interval in intervals],
+                        dtype=f'datetime64[{unit}]')
+
+    def positions(key: str) -> Any:
+        return np.array([interval.get(key, -1) for interval in intervals], dtype=np.int64)
+
+    return IntervalColumns(
+        offsets=offsets,
+        input_index=np.repeat(np.arange(len(results), dtype=np.int64), np.diff(offsets)),
+        start=dates('start_date'),
+        end=dates('end_date'),
+        match_start=positions('match_start'),
+        match_end=positions('match_end'),
+        rule=np.array([','.join(interval.get('rules', [])) for interval in intervals], dtype=object),
+    )
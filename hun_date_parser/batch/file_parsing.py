@@ -0,0 +1,244 @@
+"""
+Parsing of large newline delimited files without loading them.
+
+    for line_number, byte_offset, intervals in parse_file('dump.txt', now, workers=8):
+        ...
+    columns = parse_file('dump.txt', now, workers=8, output='numpy')  # FileColumns, one row per interval
+
+The file is memory-mapped and cut into byte ranges of about chunk_bytes, every range ending at a line boundary (the
+parent only reads the bytes around the cut points). A worker gets the path and the byte range only, maps the file
+itself, decodes the lines of its range and parses them with parse_many, so no text goes through the pipes of the
+process pool and no process holds more of the file than a range. The ranges are parsed a few per worker ahead and
+their results are returned in the order of the file, with the line numbers (from 1) and the byte offsets of the lines.
+"""
+
+import mmap
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from functools import partial
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple, Union
+
+from hun_date_parser.batch.columnar import _pyarrow
+from hun_date_parser.batch.parsing import parse_many
+from hun_date_parser.batch.vectorized import _numpy
+from hun_date_parser.date_parser.parse_cache import ParseCache
+from hun_date_parser.date_parser.prefilter import Prefilter
+from hun_date_parser.utils import SearchScopes
+
+OUTPUTS = ('records', 'numpy', 'arrow')
+FILE_COLUMNS = ('line_number', 'byte_offset', 'start', 'end', 'match_start', 'match_end', 'rule')
+
+# line number, byte offset of the line, intervals of the line in the format of text2datetime_with_spans
+FileRecord = Tuple[int, int, List[Dict[str, Any]]]
+
+
+@dataclass
+class FileColumns:
+    """
+    Intervals of the lines of a file as numpy arrays with one element per interval: line_number (from 1) and
+    byte_offset of the line the interval is found in, and the columns of IntervalColumns (match_start and match_end
+    are character offsets in the line).
+    """
+    num_lines: int
+    line_number: Any
+    byte_offset: Any
+    start: Any
+    end: Any
+    match_start: Any
+    match_end: Any
+    rule: Any
+
+    def __len__(self) -> int:
+        return len(self.line_number)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        :return: dictionary of the interval columns
+        """
+        return {name: getattr(self, name) for name in FILE_COLUMNS}
+
+    def to_arrow(self) -> Any:
+        """
+        Converts the columns to a pyarrow.Table with one row per interval, open interval ends become nulls.
+        :return: pyarrow.Table
+        """
+        pa = _pyarrow()
+        np = _numpy()
+        return pa.Table.from_arrays([
+            pa.array(self.line_number, type=pa.int64()),
+            pa.array(self.byte_offset, type=pa.int64()),
+            pa.array(self.start, mask=np.isnat(self.start)),
+            pa.array(self.end, mask=np.isnat(self.end)),
+            pa.array(self.match_start, type=pa.int64(), mask=self.match_start < 0),
+            pa.array(self.match_end, type=pa.int64(), mask=self.match_end < 0),
+            pa.array(self.rule, type=pa.string()),
+        ], names=list(FILE_COLUMNS))
+
+
+def line_ranges(path: Union[str, 'os.PathLike[str]'], chunk_bytes: int = 1 << 22) -> List[Tuple[int, int]]:
+    """
+    Cuts a file into byte ranges of at least chunk_bytes (except the last one), each ending after a newline or at
+    the end of the file.
+    :param path: path of the file
+    :param chunk_bytes: target size of the ranges
+    :return: (start, end) byte ranges covering the file
+    """
+    if chunk_bytes < 1:
+        raise ValueError('chunk_bytes must be positive')
+    size = os.path.getsize(path)
+    if size == 0:
+        return []
+
+    ranges = []
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        start = 0
+        while start < size:
+            newline = mm.find(b'\n', min(start + chunk_bytes, size) - 1)
+            end = size if newline < 0 else newline + 1
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def _read_lines(path: Union[str, 'os.PathLike[str]'], start: int, end: int,
+                encoding: str) -> Tuple[List[str], List[int]]:
+    """Decoded lines (without line endings) of a byte range of the file and their byte offsets."""
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        raw_lines = mm[start:end].split(b'\n')
+    if raw_lines[-1] == b'':
+        raw_lines.pop()
+
+    lines, offsets = [], []
+    offset = start
+    for raw in raw_lines:
+        lines.append(raw.decode(encoding, errors='replace').rstrip('\r'))
+        offsets.append(offset)
+        offset += len(raw) + 1
+    return lines, offsets
+
+
+def _parse_range(byte_range: Tuple[int, int], path: Union[str, 'os.PathLike[str]'], encoding: str, columnar: bool,
+                 parse_options: Dict[str, Any]) -> Tuple[int, Any]:
+    """
+    Parses the lines of a byte range of the file.
+    :return: number of lines of the range, and the (line index in the range, byte offset, intervals) of every line or
+    the columns of the intervals with the line indices in the range
+    """
+    lines, offsets = _read_lines(path, *byte_range, encoding)
+    if not columnar:
+        return len(lines), list(zip(range(len(lines)), offsets, parse_many(lines, **parse_options)))
+
+    np = _numpy()
+    columns = parse_many(lines, output='numpy', **parse_options)
+    return len(lines), {
+        'line_number': columns.input_index,
+        'byte_offset': np.array(offsets, dtype=np.int64)[columns.input_index],
+        'start': columns.start,
+        'end': columns.end,
+        'match_start': columns.match_start,
+        'match_end': columns.match_end,
+        'rule': columns.rule,
+    }
+
+
+def _parse_ranges(path: Union[str, 'os.PathLike[str]'], workers: int, chunk_bytes: int, encoding: str,
+                  columnar: bool, parse_options: Dict[str, Any]) -> Iterator[Tuple[int, Any]]:
+    """Results of _parse_range for every range of the file, in the order of the file."""
+    parse = partial(_parse_range, path=os.fspath(path), encoding=encoding, columnar=columnar,
+                    parse_options=parse_options)
+    ranges = line_ranges(path, chunk_bytes)
+    if workers <= 1 or len(ranges) <= 1:
+        for byte_range in ranges:
+            yield parse(byte_range)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # a few ranges per worker in flight, so the results of the whole file are not held at once
+        pending: Deque[Future] = deque()
+        for byte_range in ranges:
+            pending.append(executor.submit(parse, byte_range))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _iter_records(ranges: Iterator[Tuple[int, Any]]) -> Iterator[FileRecord]:
+    first_line = 1
+    for num_lines, records in ranges:
+        for index, offset, intervals in records:
+            yield first_line + index, offset, intervals
+        first_line += num_lines
+
+
+def _collect_columns(ranges: Iterator[Tuple[int, Any]], output_container: str) -> FileColumns:
+    np = _numpy()
+    unit = 's' if output_container == 'datetime' else 'D'
+    parts: Dict[str, List[Any]] = {name: [] for name in FILE_COLUMNS}
+    first_line = 1
+    for num_lines, columns in ranges:
+        columns['line_number'] = columns['line_number'] + first_line
+        for name in FILE_COLUMNS:
+            parts[name].append(columns[name])
+        first_line += num_lines
+
+    def concatenate(name: str, dtype: Any) -> Any:
+        return np.concatenate(parts[name]) if parts[name] else np.array([], dtype=dtype)
+
+    return FileColumns(
+        num_lines=first_line - 1,
+        line_number=concatenate('line_number', np.int64),
+        byte_offset=concatenate('byte_offset', np.int64),
+        start=concatenate('start', f'datetime64[{unit}]'),
+        end=concatenate('end', f'datetime64[{unit}]'),
+        match_start=concatenate('match_start', np.int64),
+        match_end=concatenate('match_end', np.int64),
+        rule=concatenate('rule', object),
+    )
+
+
+def parse_file(path: Union[str, 'os.PathLike[str]'], now: Optional[datetime] = None,
+               search_scope: SearchScopes = SearchScopes.NOT_RESTRICTED,
+               realistic_year_required: bool = True,
+               output_container: str = 'datetime',
+               output: str = 'records',
+               workers: int = 1,
+               chunk_bytes: int = 1 << 22,
+               encoding: str = 'utf-8',
+               prefilter: Union[bool, Prefilter] = False,
+               cache: Optional[ParseCache] = None) -> Any:
+    """
+    Extracts the datetime intervals with span information from every line of a newline delimited file.
+    :param path: path of the file, its lines are decoded with the encoding (undecodable bytes are replaced)
+    :param now: Reference timestamp of the lines, defaults to the current time.
+    :param search_scope: Defines whether the timeframe should be restricted to past or future.
+    :param realistic_year_required: Defines whether to restrict year candidates to be between 1900 and 2100.
+    :param output_container: 'datetime' or 'date'
+    :param output: 'records' for an iterator of (line number, byte offset of the line, intervals) of every line
+    in the order of the file, 'numpy' for FileColumns, 'arrow' for a pyarrow.Table with one row per interval
+    :param workers: number of worker processes parsing the byte ranges
+    :param chunk_bytes: size of the byte ranges parsed at once
+    :param encoding: encoding of the file, it must be ASCII compatible (the lines are split at the newline bytes)
+    :param prefilter: prefilter of parse_many, a Prefilter counts the rejected lines only if workers is 1
+    :param cache: ParseCache shared by the workers
+    :return: intervals in the requested output format
+    """
+    if output not in OUTPUTS:
+        raise ValueError(f'output must be one of {OUTPUTS}, got {output!r}')
+    if output_container not in ('datetime', 'date'):
+        raise ValueError(f"output_container must be 'datetime' or 'date', got {output_container!r}")
+    if chunk_bytes < 1:
+        raise ValueError('chunk_bytes must be positive')
+
+    parse_options = dict(now=now or datetime.now(), search_scope=search_scope,
+                         realistic_year_required=realistic_year_required, output_container=output_container,
+                         prefilter=prefilter, cache=cache)
+    ranges = _parse_ranges(path, workers, chunk_bytes, encoding, output != 'records', parse_options)
+    if output == 'records':
+        return _iter_records(ranges)
+
+    columns = _collect_columns(ranges, output_container)
+    return columns.to_arrow() if output == 'arrow' else columns
@@ -0,0 +1,67 @@
+"""
+Small thread-safe metrics of the batch services: latency windows with percentiles and size histograms.
+"""
+
+import math
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, Sequence
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    """Nearest-rank percentile of sorted values, 0.0 if there are none."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(q / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+def latency_summary(sorted_seconds: Sequence[float]) -> Dict[str, float]:
+    """p50, p90, p99 and max of sorted latencies, in milliseconds."""
+    summary = {f'p{q}': round(percentile(sorted_seconds, q) * 1000, 4) for q in (50, 90, 99)}
+    summary['max'] = round(sorted_seconds[-1] * 1000, 4) if sorted_seconds else 0.0
+    return summary
+
+
+class LatencyWindow:
+    """Count, errors and the latencies of the last `size` events."""
+
+    def __init__(self, size: int = 10_000) -> None:
+        self.count = 0
+        self.errors = 0
+        self._latencies: Deque[float] = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def add(self, seconds: float, error: bool = False) -> None:
+        with self._lock:
+            self.count += 1
+            self.errors += error
+            self._latencies.append(seconds)
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            latencies = sorted(self._latencies)
+            return {'count': self.count, 'errors': self.errors, 'latency_ms': latency_summary(latencies)}
+
+
+class SizeHistogram:
+    """Histogram of sizes in power of two buckets, the key of a bucket is its upper bound (0, 1, 2, 4, 8, ...)."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0
+        self.buckets: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def add(self, size: int) -> None:
+        bucket = 1 << (size - 1).bit_length() if size > 0 else 0
+        with self._lock:
+            self.count += 1
+            self.total += size
+            self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {'count': self.count, 'total': self.total,
+                    'mean': round(self.total / self.count, 4) if self.count else 0.0,
+                    'histogram': {str(bucket): n for bucket, n in sorted(self.buckets.items())}}
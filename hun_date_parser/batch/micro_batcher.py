@@ -0,0 +1,153 @@
+"""
+asyncio micro-batching of single parse requests.
+
+    async with MicroBatcher(max_batch_size=64, max_wait_ms=2, executor=ProcessPoolExecutor(4)) as batcher:
+        intervals = await batcher.parse('holnap reggel 8-kor', now)
+        ...
+        batcher.to_dict()  # queue depth, batch size and queue depth histograms
+
+Thousands of coroutines awaiting one parse each would pay a dispatch to the executor (and pickling with a process
+pool) per message. The batcher queues the requests instead: the first request of a batch waits at most max_wait_ms
+for others, up to max_batch_size requests are parsed by one parse_many call on the executor, and the future of every
+caller is resolved with its intervals. The next batch is collected while the previous ones are parsed, at most
+max_concurrent_batches batches are parsed at the same time.
+"""
+
+import asyncio
+from concurrent.futures import Executor
+from datetime import datetime
+from functools import partial
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from hun_date_parser.batch.metrics import SizeHistogram
+from hun_date_parser.batch.parsing import parse_many
+
+# text, reference time and the future of the caller
+_Request = Tuple[str, datetime, 'asyncio.Future[List[Dict[str, Any]]]']
+
+
+class MicroBatcher:
+    """Collects concurrent parse requests into parse_many calls on an executor."""
+
+    def __init__(self, max_batch_size: int = 64, max_wait_ms: float = 2.0, executor: Optional[Executor] = None,
+                 max_concurrent_batches: int = 1, **parse_options: Any) -> None:
+        """
+        :param max_batch_size: maximum number of requests parsed by one parse_many call
+        :param max_wait_ms: maximum time the first request of a batch waits for the others
+        :param executor: executor the batches are parsed on, None for the default executor of the event loop
+        :param max_concurrent_batches: maximum number of batches parsed at the same time (the number of workers of
+        the executor to use them all)
+        :param parse_options: options of parse_many (search_scope, output_container, cache, prefilter, ...), the
+        output is always 'records'
+        """
+        if max_batch_size < 1 or max_concurrent_batches < 1:
+            raise ValueError('max_batch_size and max_concurrent_batches must be positive')
+        if 'output' in parse_options:
+            raise ValueError("the batcher returns the records of parse_many, output can't be set")
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.executor = executor
+        self.max_concurrent_batches = max_concurrent_batches
+        self.parse_options = parse_options
+        self.batch_sizes = SizeHistogram()
+        self.queue_depths = SizeHistogram()
+        self._queue: Optional['asyncio.Queue[Optional[_Request]]'] = None
+        self._collector: Optional['asyncio.Task[None]'] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._batches: Set['asyncio.Task[None]'] = set()
+        self._closed = False
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of requests waiting to be collected into a batch."""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def _start(self) -> None:
+        self._queue = asyncio.Queue()
+        self._slots = asyncio.Semaphore(self.max_concurrent_batches)
+        self._collector = asyncio.ensure_future(self._collect())
+
+    async def parse(self, text: str, now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """
+        :param text: input sentence
+        :param now: reference time, defaults to the current time
+        :return: the intervals of the sentence in the format of text2datetime_with_spans
+        """
+        if self._closed:
+            raise RuntimeError('the batcher is closed')
+        if self._collector is None:
+            self._start()
+        assert self._queue is not None
+        future: 'asyncio.Future[List[Dict[str, Any]]]' = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((text, now or datetime.now(), future))
+        return await future
+
+    async def _collect(self) -> None:
+        assert self._queue is not None and self._slots is not None
+        loop = asyncio.get_running_loop()
+        while True:
+            first = await self._queue.get()
+            if first is None:
+                return
+            batch, stop = [first], False
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                try:
+                    if self._queue.empty():
+                        request = await asyncio.wait_for(self._queue.get(), max(0.0, deadline - loop.time()))
+                    else:
+                        request = self._queue.get_nowait()
+                except asyncio.TimeoutError:
+                    break
+                if request is None:
+                    stop = True
+                    break
+                batch.append(request)
+
+            self.batch_sizes.add(len(batch))
+            self.queue_depths.add(self._queue.qsize())
+            await self._slots.acquire()
+            task = asyncio.ensure_future(self._run(batch))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+            if stop:
+                return
+
+    async def _run(self, batch: List[_Request]) -> None:
+        assert self._slots is not None
+        try:
+            parse = partial(parse_many, [text for text, _, _ in batch], now=[now for _, now, _ in batch],
+                            **self.parse_options)
+            results = await asyncio.get_running_loop().run_in_executor(self.executor, parse)
+        except Exception as e:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            for (_, _, future), intervals in zip(batch, results):
+                if not future.done():
+                    future.set_result(intervals)
+        finally:
+            self._slots.release()
+
+    async def close(self) -> None:
+        """Parses the requests already queued and stops collecting new ones."""
+        self._closed = True
+        if self._collector is None or self._queue is None:
+            return
+        if not self._collector.done():
+            self._queue.put_nowait(None)
+        await self._collector
+        if self._batches:
+            await asyncio.gather(*self._batches)
+
+    async def __aenter__(self) -> 'MicroBatcher':
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Current queue depth, and the histograms of the batch sizes and of the queue depth after each batch."""
+        return {'queue_depth': self.queue_depth, 'batches_in_flight': len(self._batches),
+                'batch_sizes': self.batch_sizes.to_dict(), 'queue_depths': self.queue_depths.to_dict()}
@@ -0,0 +1,144 @@
+"""
+The Series.hun_date pandas accessor, registered by importing this module:
+
+    import hun_date_parser.batch.pandas_accessor  # noqa: F401
+    df['msg'].hun_date.parse(now=datetime(2021, 3, 1), container='date')
+
+The values of the column are deduplicated first, every distinct value is parsed once through the batch functions
+and the results are scattered back to the rows. The methods return tidy DataFrames with one row per match, indexed
+by the index labels of the rows the matches come from.
+"""
+
+from datetime import datetime
+from functools import partial
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from hun_date_parser.batch.parsing import parse_many, map_unique
+from hun_date_parser.batch.vectorized import _numpy
+from hun_date_parser.date_parser.parse_cache import ParseCache
+from hun_date_parser.date_parser.prefilter import Prefilter
+from hun_date_parser.date_parser.slow_log import SlowLog
+from hun_date_parser.duration_parser.duration_parsers import parse_duration_with_spans
+from hun_date_parser.frequency_parser.frequency_parsers import parse_frequency
+from hun_date_parser.utils import SearchScopes
+
+try:
+    import pandas as pd  # type: ignore
+except ImportError as e:
+    raise ImportError('The hun_date accessor requires pandas (pip install pandas).') from e
+
+INTERVAL_COLUMNS = ['start', 'end', 'match_text', 'match_start', 'match_end', 'rule']
+DURATION_COLUMNS = ['match_text', 'match_start', 'match_end', 'minutes']
+DURATION_UNIT_COLUMNS = ['match_text', 'match_start', 'match_end', 'value', 'unit', 'preferred_unit', 'minutes']
+FREQUENCY_COLUMNS = ['frequency', 'match_start', 'match_end']
+
+
+def _frequency_record(s: str) -> Optional[Dict[str, Any]]:
+    match = parse_frequency(s)
+    if match is None:
+        return None
+    return {'frequency': match['frequency'].value, 'match_start': match['start'], 'match_end': match['end']}
+
+
+def _scatter(codes: Any, offsets: Any) -> Tuple[Any, Any]:
+    """
+    Maps the results of the distinct values back to the rows.
+    :param codes: index of the distinct value of each row, -1 for missing values
+    :param offsets: the results of the i-th distinct value are offsets[i]:offsets[i + 1]
+    :return: row position and result position of every output row
+    """
+    np = _numpy()
+    counts = np.diff(offsets)
+    row_counts = np.where(codes >= 0, counts[codes], 0)
+    rows = np.repeat(np.arange(len(codes)), row_counts)
+    row_starts = np.repeat(offsets[codes] - (np.cumsum(row_counts) - row_counts), row_counts)
+    return rows, row_starts + np.arange(len(rows))
+
+
+@pd.api.extensions.register_series_accessor('hun_date')
+class HunDateAccessor:
+    """Date, duration and frequency extraction for Series of Hungarian texts."""
+
+    def __init__(self, series: 'pd.Series') -> None:
+        self._series = series
+
+    def _unique_values(self) -> Tuple[Any, List[str]]:
+        codes, uniques = pd.factorize(self._series)
+        # values which are not strings have no matches
+        return codes, [value if isinstance(value, str) else '' for value in uniques]
+
+    def _frame(self, rows: Any, columns: Dict[str, Any], names: Sequence[str]) -> 'pd.DataFrame':
+        index = self._series.index.take(rows)
+        return pd.DataFrame({name: columns[name] for name in names}, index=index, columns=list(names))
+
+    def _records_frame(self, codes: Any, results: List[Optional[Dict[str, Any]]],
+                       names: Sequence[str]) -> 'pd.DataFrame':
+        np = _numpy()
+        found = [result for result in results if result is not None]
+        offsets = np.zeros(len(results) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([result is not None for result in results])
+        rows, take = _scatter(codes, offsets)
+
+        columns = {name: np.array([result[name] for result in found], dtype=object)[take] for name in names}
+        frame = self._frame(rows, columns, names)
+        return frame.infer_objects()
+
+    def parse(self, now: Optional[datetime] = None, container: str = 'datetime',
+              search_scope: SearchScopes = SearchScopes.NOT_RESTRICTED, realistic_year_required: bool = True,
+              workers: int = 1, slow_log: Optional[SlowLog] = None,
+              prefilter: Union[bool, Prefilter] = False, cache: Optional[ParseCache] = None) -> 'pd.DataFrame':
+        """
+        Extracts the datetime intervals of every value, same as text2datetime_with_spans (text2date_with_spans).
+        :param now: Current timestamp to calculate relative dates, defaults to the current time.
+        :param container: 'datetime' or 'date'
+        :param search_scope: Defines whether the timeframe should be restricted to past or future.
+        :param realistic_year_required: Defines whether to restrict year candidates to be between 1900 and 2100.
+        :param workers: number of worker processes parsing the distinct values
+        :param slow_log: SlowLog which keeps the slowest of the distinct values
+        :param prefilter: True (or a Prefilter) to skip the parsing of the values without temporal expressions
+        :param cache: ParseCache which stores the compiled parses of the values
+        :return: DataFrame with the start, end, match_text, match_start, match_end and rule columns, open interval
+        ends are NaT
+        """
+        np = _numpy()
+        codes, uniques = self._unique_values()
+        parsed = parse_many(uniques, now=now, search_scope=search_scope,
+                            realistic_year_required=realistic_year_required, output_container=container,
+                            output='numpy', workers=workers, slow_log=slow_log,
+                            prefilter=prefilter, cache=cache)
+        rows, take = _scatter(codes, parsed.offsets)
+
+        match_text = np.array([uniques[i][start:end] for i, start, end in
+                               zip(parsed.input_index, parsed.match_start, parsed.match_end)], dtype=object)
+        columns = {
+            'start': parsed.start[take],
+            'end': parsed.end[take],
+            'match_text': match_text[take],
+            'match_start': parsed.match_start[take],
+            'match_end': parsed.match_end[take],
+            'rule': parsed.rule[take],
+        }
+        return self._frame(rows, columns, INTERVAL_COLUMNS)
+
+    def durations(self, return_preferred_unit: bool = False, workers: int = 1) -> 'pd.DataFrame':
+        """
+        Extracts the duration of every value, same as parse_duration_with_spans.
+        :param return_preferred_unit: If True, includes the value, unit and preferred_unit columns.
+        :param workers: number of worker processes parsing the distinct values
+        :return: DataFrame with one row per value which contains a duration
+        """
+        codes, uniques = self._unique_values()
+        parse = partial(parse_duration_with_spans, return_preferred_unit=return_preferred_unit)
+        results = map_unique(parse, uniques, workers=workers)
+        return self._records_frame(codes, results, DURATION_UNIT_COLUMNS if return_preferred_unit else DURATION_COLUMNS)
+
+    def frequencies(self, workers: int = 1) -> 'pd.DataFrame':
+        """
+        Extracts the frequency of every value, same as parse_frequency.
+        :param workers: number of worker processes parsing the distinct values
+        :return: DataFrame with the frequency, match_start and match_end columns, one row per value which contains
+        a frequency
+        """
+        codes, uniques = self._unique_values()
+        results = map_unique(_frequency_record, uniques, workers=workers)
+        return self._records_frame(codes, results, FREQUENCY_COLUMNS)
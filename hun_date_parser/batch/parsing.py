@@ -0,0 +1,146 @@
+"""
+Parsing of many sentences at once, with records or columnar (numpy, Arrow) output.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from functools import partial
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, TypeVar, Union
+
+from hun_date_parser.batch.columnar import to_columns, has_pyarrow
+from hun_date_parser.date_parser.datetime_extractor import DatetimeExtractor
+from hun_date_parser.date_parser.parse_cache import ParseCache
+from hun_date_parser.date_parser.prefilter import Prefilter, default_prefilter
+from hun_date_parser.date_parser.slow_log import SlowLog
+from hun_date_parser.utils import SearchScopes
+
+OUTPUTS = ('records', 'numpy', 'arrow', 'columnar', 'shared')
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+
+def map_unique(func: Callable[[T], R], items: Sequence[T], workers: int = 1, chunk_size: int = 256) -> List[R]:
+    """
+    Applies func to every item, in worker processes if workers > 1. The items are expected to be distinct already.
+    :param func: picklable function (module level function or partial of one) when workers > 1
+    :param items: distinct input values
+    :param workers: number of worker processes, 1 runs everything in the current process
+    :param chunk_size: number of items sent to a worker at once
+    :return: list of the results in the order of the items
+    """
+    if workers <= 1 or len(items) <= chunk_size:
+        return [func(item) for item in items]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(func, items, chunksize=chunk_size))
+
+
+def _parse_one(key: Tuple[str, datetime], search_scope: SearchScopes, realistic_year_required: bool,
+               output_container: str, include_rules: bool,
+               cache: Optional[ParseCache] = None) -> List[Dict[str, Any]]:
+    sentence, now = key
+    extractor = DatetimeExtractor(now=now, output_container=output_container, search_scope=search_scope,
+                                  realistic_year_required=realistic_year_required, cache=cache)
+    try:
+        return extractor._parse_datetime(sentence, include_spans=True, include_rules=include_rules)
+    except Exception:
+        return []
+
+
+def _parse_one_timed(key: Tuple[str, datetime], search_scope: SearchScopes, realistic_year_required: bool,
+                     output_container: str,
+                     cache: Optional[ParseCache] = None) -> Tuple[List[Dict[str, Any]], float, Optional[str]]:
+    """Same as _parse_one with the rules included, also returns the parse time and the error raised by the parse."""
+    sentence, now = key
+    extractor = DatetimeExtractor(now=now, output_container=output_container, search_scope=search_scope,
+                                  realistic_year_required=realistic_year_required, cache=cache)
+    start = perf_counter()
+    try:
+        return extractor._parse_datetime(sentence, include_spans=True, include_rules=True), perf_counter() - start, None
+    except Exception as e:
+        return [], perf_counter() - start, repr(e)
+
+
+def parse_many(sentences: Iterable[str], now: Any = None,
+               search_scope: SearchScopes = SearchScopes.NOT_RESTRICTED,
+               realistic_year_required: bool = True,
+               output_container: str = 'datetime',
+               output: str = 'records',
+               workers: int = 1,
+               slow_log: Optional[SlowLog] = None,
+               prefilter: Union[bool, Prefilter] = False,
+               cache: Optional[ParseCache] = None) -> Any:
+    """
+    Extracts the datetime intervals with span information from every input sentence. Repeated sentences (with the
+    same reference time) are parsed once, sentences which fail to parse yield no intervals.
+    :param sentences: Input sentence strings.
+    :param now: Reference timestamp for all of the sentences, or a sequence of timestamps with one per sentence,
+    defaults to the current time.
+    :param search_scope: Defines whether the timeframe should be restricted to past or future.
+    :param realistic_year_required: Defines whether to restrict year candidates to be between 1900 and 2100.
+    :param output_container: 'datetime' or 'date'
+    :param output: 'records' for a list of interval lists in the format of text2datetime_with_spans,
+    'numpy' for IntervalColumns, 'arrow' for a pyarrow.Table with one row per interval,
+    'columnar' for 'arrow' if pyarrow is installed and 'numpy' otherwise, 'shared' for SharedIntervals which the
+    workers return through shared memory instead of pickling (see shared_results)
+    :param workers: number of worker processes parsing the distinct sentences
+    :param slow_log: SlowLog which keeps the slowest of the distinct sentences
+    :param prefilter: True (or a Prefilter, which counts the rejected sentences) to skip the parsing of the distinct
+    sentences without temporal expressions before they are sent to the workers, True uses default_prefilter
+    :param cache: ParseCache shared by the workers (and later runs) which stores the compiled parses of the sentences
+    :return: intervals in the requested output format
+    """
+    if output not in OUTPUTS:
+        raise ValueError(f'output must be one of {OUTPUTS}, got {output!r}')
+    if output_container not in ('datetime', 'date'):
+        raise ValueError(f"output_container must be 'datetime' or 'date', got {output_container!r}")
+
+    sentences = list(sentences)
+    if now is None:
+        now = datetime.now()
+    nows = [now] * len(sentences) if isinstance(now, datetime) else list(now)
+    if len(nows) != len(sentences):
+        raise ValueError(f'got {len(nows)} reference times for {len(sentences)} sentences')
+
+    if output == 'shared':
+        if slow_log is not None:
+            raise ValueError("slow_log can't be used with the 'shared' output")
+        from hun_date_parser.batch.shared_results import parse_shared
+        return parse_shared(sentences, nows, search_scope=search_scope, realistic_year_required=realistic_year_required,
+                            output_container=output_container, workers=workers, prefilter=prefilter, cache=cache)
+
+    keys = list(zip(sentences, nows))
+    unique_keys = list(dict.fromkeys(keys))
+    parsed: Dict[Tuple[str, datetime], List[Dict[str, Any]]] = {}
+    if prefilter:
+        gate = prefilter if isinstance(prefilter, Prefilter) else default_prefilter
+        passed = {sentence for sentence in dict.fromkeys(key[0] for key in unique_keys) if gate(sentence)}
+        parsed = {key: [] for key in unique_keys if key[0] not in passed}
+        unique_keys = [key for key in unique_keys if key[0] in passed]
+
+    if slow_log is None:
+        parse = partial(_parse_one, search_scope=search_scope, realistic_year_required=realistic_year_required,
+                        output_container=output_container, include_rules=output != 'records', cache=cache)
+        parsed.update(zip(unique_keys, map_unique(parse, unique_keys, workers=workers)))
+    else:
+        parse_timed = partial(_parse_one_timed, search_scope=search_scope,
+                              realistic_year_required=realistic_year_required, output_container=output_container,
+                              cache=cache)
+        for key, (intervals, elapsed, error) in zip(unique_keys, map_unique(parse_timed, unique_keys, workers=workers)):
+            if slow_log.sample():
+                slow_log.add(key[0], elapsed, key[1], intervals, error=error)
+            if output == 'records':
+                for interval in intervals:
+                    del interval['rules']
+            parsed[key] = intervals
+    results = [parsed[key] for key in keys]
+
+    if output == 'records':
+        return [[dict(interval) for interval in intervals] for intervals in results]
+
+    columns = to_columns(results, output_container=output_container)
+    if output == 'arrow' or (output == 'columnar' and has_pyarrow()):
+        return columns.to_arrow()
+    return columns
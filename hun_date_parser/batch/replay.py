@@ -0,0 +1,279 @@
+"""
+Replays logged inputs through the parser and compares the results of two runs (e.g. before and after an upgrade).
+
+The input is JSONL with a 'text' and an optional 'now' (ISO format) field per line. Run it with both versions of the
+package (in their own environments), then compare the two result files. The runner only uses the public API of the
+package, so releases without hun_date_parser.batch can run this file by its path:
+
+    python path/to/hun_date_parser/batch/replay.py run inputs.jsonl old.jsonl --workers 4
+    python -m hun_date_parser.batch.replay run inputs.jsonl new.jsonl --workers 4
+    python -m hun_date_parser.batch.replay compare old.jsonl new.jsonl --report diff.json
+
+The result files start with a metadata line followed by one line per input with the intervals (with spans and the
+rules which fired, None with versions which can't report them), the duration, the frequency and the parse time. The
+comparison reports the differing outputs grouped by the rules which fired and the latency distributions and throughput
+of both runs.
+"""
+
+import argparse
+import json
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, date, time
+from functools import partial
+from inspect import signature
+from time import perf_counter
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import hun_date_parser
+from hun_date_parser import text2datetime_with_spans, parse_duration_with_spans, parse_frequency
+from hun_date_parser.utils import SearchScopes
+
+DIFF_KINDS = ('intervals', 'spans', 'durations', 'frequencies')
+SPAN_KEYS = ('match_text', 'match_start', 'match_end')
+
+# older versions of the package don't report the rules which fired
+RULES_SUPPORTED = 'include_rules' in signature(text2datetime_with_spans).parameters
+
+
+def _json_value(value: Any) -> Any:
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    return value
+
+
+def read_inputs(path: str, default_now: datetime) -> Iterator[Tuple[str, datetime]]:
+    """
+    Reads the (text, now) pairs of a JSONL file, lines without 'now' get default_now.
+    """
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            now = datetime.fromisoformat(record['now']) if record.get('now') else default_now
+            yield record['text'], now
+
+
+def replay_one(item: Tuple[str, datetime], search_scope: SearchScopes = SearchScopes.NOT_RESTRICTED,
+               realistic_year_required: bool = True) -> Dict[str, Any]:
+    """
+    Parses the intervals, the duration and the frequency of a single input.
+    :param item: text and reference time
+    :return: JSON serializable result record, elapsed is the total parse time in seconds
+    """
+    text, now = item
+    options: Dict[str, Any] = {'include_rules': True} if RULES_SUPPORTED else {}
+    error = None
+    start = perf_counter()
+    try:
+        intervals = text2datetime_with_spans(text, now=now, search_scope=search_scope,
+                                             realistic_year_required=realistic_year_required, **options)
+    except Exception as e:
+        intervals, error = [], repr(e)
+    try:
+        duration = parse_duration_with_spans(text, return_preferred_unit=True)
+    except Exception as e:
+        duration, error = None, error or repr(e)
+    try:
+        frequency = parse_frequency(text)
+    except Exception as e:
+        frequency, error = None, error or repr(e)
+    elapsed = perf_counter() - start
+
+    rules: List[str] = []
+    for interval in intervals:
+        rules += [rule for rule in interval.pop('rules', []) if rule not in rules]
+    return {
+        'text': text,
+        'now': now.isoformat(),
+        'intervals': [{key: _json_value(value) for key, value in interval.items()} for interval in intervals],
+        'rules': rules if RULES_SUPPORTED else None,
+        'duration': duration,
+        'frequency': None if frequency is None else {**frequency, 'frequency': frequency['frequency'].value},
+        'elapsed': elapsed,
+        'error': error,
+    }
+
+
+def replay(input_path: str, output_path: str, workers: int = 1, chunk_size: int = 256,
+           default_now: Optional[datetime] = None, search_scope: SearchScopes = SearchScopes.NOT_RESTRICTED,
+           realistic_year_required: bool = True) -> Dict[str, Any]:
+    """
+    Replays the inputs of a JSONL file and writes the result records to output_path.
+    :param input_path: JSONL file with 'text' and optional 'now' fields
+    :param output_path: JSONL result file
+    :param workers: number of worker processes
+    :param chunk_size: number of inputs sent to a worker at once
+    :param default_now: reference time of the inputs without 'now', defaults to the current time
+    :param search_scope: Defines whether the timeframe should be restricted to past or future.
+    :param realistic_year_required: Defines whether to restrict year candidates to be between 1900 and 2100.
+    :return: metadata of the run (also written as the first line of the output)
+    """
+    items = list(read_inputs(input_path, default_now or datetime.now()))
+    parse = partial(replay_one, search_scope=search_scope, realistic_year_required=realistic_year_required)
+
+    start = perf_counter()
+    if workers <= 1:
+        records = [parse(item) for item in items]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            records = list(executor.map(parse, items, chunksize=chunk_size))
+    wall_time = perf_counter() - start
+
+    meta = {'version': hun_date_parser.__version__, 'python': sys.version.split()[0], 'inputs': len(records),
+            'workers': workers, 'wall_time': wall_time, 'created': datetime.now().isoformat(timespec='seconds')}
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.write(json.dumps({'meta': meta}) + '\n')
+        for i, record in enumerate(records):
+            f.write(json.dumps({'id': i, **record}, ensure_ascii=False) + '\n')
+    return meta
+
+
+def read_results(path: str) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """
+    :return: metadata and result records of a replay output file
+    """
+    with open(path, encoding='utf-8') as f:
+        meta = json.loads(f.readline())['meta']
+        records = [json.loads(line) for line in f if line.strip()]
+    return meta, records
+
+
+def run_summary(meta: Dict[str, Any], records: List[Dict[str, Any]]) -> Dict[str, float]:
+    """Number of inputs, throughput and latencies of a replay run, the latencies in milliseconds."""
+    # imported here, so that the runner doesn't depend on hun_date_parser.batch
+    from hun_date_parser.batch.metrics import latency_summary
+
+    latencies = sorted(record['elapsed'] for record in records)
+    if not latencies:
+        return {'inputs': 0}
+
+    return {
+        'inputs': len(latencies),
+        'throughput': len(latencies) / meta['wall_time'] if meta.get('wall_time') else 0.0,
+        'mean_ms': sum(latencies) / len(latencies) * 1e3,
+        **{f'{name}_ms': value for name, value in latency_summary(latencies).items()},
+    }
+
+
+def diff_kinds(old: Dict[str, Any], new: Dict[str, Any]) -> List[str]:
+    """Kinds of output which differ between two result records of the same input."""
+    kinds = []
+
+    def dates(record: Dict[str, Any]) -> List[Tuple]:
+        return [(i['start_date'], i['end_date']) for i in record['intervals']]
+
+    def spans(record: Dict[str, Any]) -> List[Tuple]:
+        return [tuple(i.get(key) for key in SPAN_KEYS) for i in record['intervals']]
+
+    if dates(old) != dates(new):
+        kinds.append('intervals')
+    elif spans(old) != spans(new):
+        kinds.append('spans')
+    if old['duration'] != new['duration']:
+        kinds.append('durations')
+    if old['frequency'] != new['frequency']:
+        kinds.append('frequencies')
+    return kinds
+
+
+def compare(old_path: str, new_path: str, examples: int = 5) -> Dict[str, Any]:
+    """
+    Compares two replay result files of the same inputs.
+    :param old_path: result file of the baseline version
+    :param new_path: result file of the new version
+    :param examples: number of example inputs kept per rule group
+    :return: report with the number of differences by kind, the differences grouped by the rules which fired
+    (in either version) and the latency summaries of both runs
+    """
+    old_meta, old_records = read_results(old_path)
+    new_meta, new_records = read_results(new_path)
+    if len(old_records) != len(new_records):
+        raise ValueError(f'the result files have {len(old_records)} and {len(new_records)} records')
+
+    by_kind = {kind: 0 for kind in DIFF_KINDS}
+    by_rule: Dict[str, Dict[str, Any]] = {}
+    changed = 0
+    for old, new in zip(old_records, new_records):
+        if (old['text'], old['now']) != (new['text'], new['now']):
+            raise ValueError(f'record {old["id"]} belongs to different inputs in the two files')
+
+        kinds = diff_kinds(old, new)
+        if not kinds:
+            continue
+        changed += 1
+        for kind in kinds:
+            by_kind[kind] += 1
+
+        rules = sorted(set(old['rules'] or []) | set(new['rules'] or [])) or ['(none)']
+        group = by_rule.setdefault(','.join(rules), {'count': 0, 'kinds': {}, 'examples': []})
+        group['count'] += 1
+        for kind in kinds:
+            group['kinds'][kind] = group['kinds'].get(kind, 0) + 1
+        if len(group['examples']) < examples:
+            group['examples'].append({'id': old['id'], 'text': old['text'], 'now': old['now'], 'kinds': kinds,
+                                      'old': {key: old[key] for key in ('intervals', 'duration', 'frequency')},
+                                      'new': {key: new[key] for key in ('intervals', 'duration', 'frequency')}})
+
+    old_latency, new_latency = run_summary(old_meta, old_records), run_summary(new_meta, new_records)
+    return {
+        'old': {'version': old_meta.get('version'), **old_latency},
+        'new': {'version': new_meta.get('version'), **new_latency},
+        'throughput_change': (new_latency['throughput'] / old_latency['throughput'] - 1
+                              if old_latency.get('throughput') else None),
+        'inputs': len(old_records),
+        'changed': changed,
+        'by_kind': by_kind,
+        'by_rule': dict(sorted(by_rule.items(), key=lambda item: -item[1]['count'])),
+    }
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    lines = [f'{report["changed"]} of {report["inputs"]} inputs changed: ' +
+             ', '.join(f'{kind} {count}' for kind, count in report['by_kind'].items())]
+    for name in ('old', 'new'):
+        r = report[name]
+        if r['inputs']:
+            lines.append(f'{name} ({r["version"]}): {r["throughput"]:.0f} inputs/s, p50 {r["p50_ms"]:.2f} ms, '
+                         f'p90 {r["p90_ms"]:.2f} ms, p99 {r["p99_ms"]:.2f} ms, max {r["max_ms"]:.2f} ms')
+    if report['throughput_change'] is not None:
+        lines.append(f'throughput change: {report["throughput_change"]:+.1%}')
+    for rules, group in report['by_rule'].items():
+        kinds = ', '.join(f'{kind} {count}' for kind, count in group['kinds'].items())
+        lines.append(f'  {group["count"]:>6}  {rules}  ({kinds})')
+    return '\n'.join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description='Replays logged inputs and compares the results of two runs.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help='replay a JSONL file of inputs')
+    run_parser.add_argument('input', help="JSONL file with 'text' and optional 'now' fields")
+    run_parser.add_argument('output', help='JSONL result file')
+    run_parser.add_argument('--workers', type=int, default=1, help='number of worker processes')
+    run_parser.add_argument('--chunk-size', type=int, default=256, help='inputs sent to a worker at once')
+    run_parser.add_argument('--now', type=datetime.fromisoformat, help="reference time of inputs without 'now'")
+
+    compare_parser = commands.add_parser('compare', help='compare two result files')
+    compare_parser.add_argument('old', help='result file of the baseline version')
+    compare_parser.add_argument('new', help='result file of the new version')
+    compare_parser.add_argument('--report', help='write the full report as JSON to this file')
+    compare_parser.add_argument('--examples', type=int, default=5, help='example inputs per rule group')
+
+    args = parser.parse_args(argv)
+    if args.command == 'run':
+        meta = replay(args.input, args.output, workers=args.workers, chunk_size=args.chunk_size,
+                      default_now=args.now)
+        print(f'replayed {meta["inputs"]} inputs in {meta["wall_time"]:.2f} s')
+    else:
+        report = compare(args.old, args.new, examples=args.examples)
+        print(format_report(report))
+        if args.report:
+            with open(args.report, 'w', encoding='utf-8') as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,421 @@
+"""
+Local HTTP parsing service, stdlib only.
+
+    python -m hun_date_parser.batch.server --port 8080 --workers 2 --max-batch-size 64 --max-wait-ms 2
+    curl -d '{"text": "holnap reggel 8-kor", "now": "2024-05-08T10:00:00"}' localhost:8080/parse
+
+Endpoints (POST with JSON bodies, datetimes in ISO format):
+
+    /parse        {"text", "now"?, "output_container"?, "search_scope"?}  -> {"results": [...]}
+    /parse_batch  {"texts", "now"? or "nows"?, ...}                     -> {"results": [[...], ...]}
+    /duration     {"text", "return_preferred_unit"?}                    -> {"result": {...} or null}
+    /frequency    {"text"}                                              -> {"result": {...} or null}
+    /textualize   {"datetime", "now"?, "time_precision"?}               -> {"result": {"dates", "times"}}
+    GET /metrics  request counts, latency percentiles, batch sizes, queue depth and cache statistics
+
+The datetime parses run on a pool of warm workers (processes, or one thread with --workers 0): the phrase tables of
+the fast path are built and the ParseCache is opened when a worker starts, not on the first request. Concurrent
+/parse requests are coalesced into micro-batches: the first request waits at most max_wait_ms for others, up to
+max_batch_size requests are parsed by one parse_many call on a worker. A /parse_batch request is a batch of its own.
+The durations, frequencies and texts are cheap to compute and are answered on the request thread. A parse which
+isn't done within the timeout is answered with 503 Service Unavailable, and it is dropped if it hasn't started yet.
+"""
+
+import argparse
+import json
+import queue
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from time import monotonic, perf_counter
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from hun_date_parser.batch.cli import json_default
+from hun_date_parser.batch.metrics import LatencyWindow, SizeHistogram
+from hun_date_parser.batch.parsing import parse_many
+from hun_date_parser.date_parser.datetime_extractor import get_phrase_table
+from hun_date_parser.date_parser.parse_cache import ParseCache
+from hun_date_parser.date_textualizer.datetime_textualizer import datetime2text
+from hun_date_parser.duration_parser.duration_parsers import parse_duration_with_spans
+from hun_date_parser.frequency_parser.frequency_parsers import parse_frequency
+from hun_date_parser.utils import SearchScopes
+
+OUTPUT_CONTAINERS = ('datetime', 'date')
+
+# text, reference time, output container, search scope
+Item = Tuple[str, datetime, str, SearchScopes]
+
+# state of the current worker, set up by _init_worker
+_worker_cache: Optional[ParseCache] = None
+
+
+def _init_worker(cache_path: Optional[str]) -> None:
+    """Opens the cache of the worker and builds the phrase tables of every configuration."""
+    global _worker_cache
+    _worker_cache = ParseCache(cache_path) if cache_path else None
+    for output_container in OUTPUT_CONTAINERS:
+        get_phrase_table(output_container, SearchScopes.NOT_RESTRICTED)
+
+
+def _run_batch(items: List[Item]) -> Tuple[List[List[Dict[str, Any]]], Dict[str, int]]:
+    """
+    Parses a batch in the worker, one parse_many call per configuration.
+    :return: the intervals of every item, and the cache hits, misses and errors of the batch
+    """
+    before = _worker_cache.to_dict() if _worker_cache is not None else {}
+    results: List[List[Dict[str, Any]]] = [[] for _ in items]
+    groups: Dict[Tuple[str, SearchScopes], List[int]] = {}
+    for i, (_, _, output_container, search_scope) in enumerate(items):
+        groups.setdefault((output_container, search_scope), []).append(i)
+
+    for (output_container, search_scope), indices in groups.items():
+        parsed = parse_many([items[i][0] for i in indices], now=[items[i][1] for i in indices],
+                            search_scope=search_scope, output_container=output_container, cache=_worker_cache)
+        for i, intervals in zip(indices, parsed):
+            results[i] = intervals
+
+    after = _worker_cache.to_dict() if _worker_cache is not None else {}
+    return results, {key: after[key] - before[key] for key in after}
+
+
+class RequestBatcher:
+    """Coalesces single requests into batches, which are run by a function on an executor."""
+
+    def __init__(self, executor: Executor, run: Callable[[List[Any]], Tuple[List[Any], Dict[str, int]]],
+                 on_stats: Callable[[Dict[str, int]], None], max_batch_size: int = 64,
+                 max_wait_ms: float = 2.0) -> None:
+        """
+        :param executor: executor the batches are run on
+        :param run: picklable function of a batch, returns the result of every item and statistics to report
+        :param on_stats: called with the statistics of every batch
+        :param max_batch_size: maximum number of items in a batch
+        :param max_wait_ms: maximum time the first item of a batch waits for the others
+        """
+        if max_batch_size < 1:
+            raise ValueError(f'max_batch_size must be positive, got {max_batch_size}')
+        self.executor = executor
+        self.run = run
+        self.on_stats = on_stats
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.batch_sizes = SizeHistogram()
+        self._queue: 'queue.Queue[Optional[Tuple[Any, Future]]]' = queue.Queue()
+        self._thread = threading.Thread(target=self._collect, name='hun-date-parser-batcher', daemon=True)
+        self._thread.start()
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def submit(self, item: Any) -> Future:
+        """:return: future of the result of the item, cancelling it drops the item if its batch hasn't started"""
+        future: Future = Future()
+        self._queue.put((item, future))
+        return future
+
+    def run_batch(self, items: List[Any], timeout: Optional[float] = None) -> List[Any]:
+        """
+        Runs a batch of items right away, without coalescing, and waits for its results.
+        :param timeout: seconds to wait, the batch is cancelled if it hasn't started by then
+        :raise concurrent.futures.TimeoutError: if the batch isn't done within the timeout
+        """
+        future = self.executor.submit(self.run, items)
+        try:
+            results, stats = future.result(timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise
+        self.on_stats(stats)
+        return results
+
+    def _collect(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = [first]
+            deadline = monotonic() + self.max_wait
+            stop = False
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - monotonic()
+                try:
+                    pending = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if pending is None:
+                    stop = True
+                    break
+                batch.append(pending)
+            self._dispatch(batch)
+            if stop:
+                return
+
+    def _dispatch(self, batch: List[Tuple[Any, Future]]) -> None:
+        # the items whose requests gave up waiting are dropped, the others can't be cancelled any more
+        batch = [(item, future) for item, future in batch if future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+        self.batch_sizes.add(len(batch))
+        futures = [future for _, future in batch]
+
+        def resolve(done: Future) -> None:
+            try:
+                results, stats = done.result()
+            except BaseException as e:
+                for future in futures:
+                    future.set_exception(e)
+                return
+            self.on_stats(stats)
+            for future, result in zip(futures, results):
+                future.set_result(result)
+
+        try:
+            self.executor.submit(self.run, [item for item, _ in batch]).add_done_callback(resolve)
+        except RuntimeError as e:  # the executor is shut down
+            for future in futures:
+                future.set_exception(e)
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._thread.join()
+
+
+class RequestError(ValueError):
+    """Invalid request, answered with 400 Bad Request."""
+
+
+class RequestTimeout(Exception):
+    """The parse of a request isn't done within the timeout, answered with 503 Service Unavailable."""
+
+
+def _datetime(value: Any, name: str) -> datetime:
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise RequestError(f'{name} must be a datetime in ISO format, got {value!r}')
+
+
+def _text(body: Dict[str, Any], name: str = 'text') -> str:
+    if not isinstance(body.get(name), str):
+        raise RequestError(f'{name} must be a string')
+    return body[name]
+
+
+def _options(body: Dict[str, Any]) -> Tuple[str, SearchScopes]:
+    output_container = body.get('output_container', 'datetime')
+    if output_container not in OUTPUT_CONTAINERS:
+        raise RequestError(f'output_container must be one of {OUTPUT_CONTAINERS}, got {output_container!r}')
+    try:
+        search_scope = SearchScopes(body.get('search_scope', SearchScopes.NOT_RESTRICTED.value))
+    except ValueError:
+        raise RequestError(f"search_scope must be one of {[scope.value for scope in SearchScopes]}")
+    return output_container, search_scope
+
+
+class ParsingService:
+    """The warm workers, the request batcher and the metrics of the server, usable without HTTP as well."""
+
+    def __init__(self, workers: int = 1, max_batch_size: int = 64, max_wait_ms: float = 2.0,
+                 cache_path: Optional[str] = None, timeout: float = 60.0) -> None:
+        """
+        :param workers: number of worker processes, 0 parses on one thread of the server process
+        :param max_batch_size: maximum number of /parse requests parsed together
+        :param max_wait_ms: maximum time a /parse request waits for others to be batched with
+        :param cache_path: path of a ParseCache shared by the workers, None for no cache
+        :param timeout: seconds a request waits for its parse
+        """
+        self.executor: Executor
+        if workers > 0:
+            self.executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                                initargs=(cache_path,))
+        else:
+            self.executor = ThreadPoolExecutor(max_workers=1, initializer=_init_worker, initargs=(cache_path,))
+        self.cache_path = cache_path
+        self.timeout = timeout
+        self.started = monotonic()
+        self.endpoints: Dict[str, LatencyWindow] = {}
+        self.cache_stats = {'hits': 0, 'misses': 0, 'errors': 0}
+        self._lock = threading.Lock()
+        self.batcher = RequestBatcher(self.executor, _run_batch, self._add_cache_stats, max_batch_size, max_wait_ms)
+        # the workers are started and warmed up before the first request
+        for future in [self.executor.submit(_run_batch, []) for _ in range(max(1, workers))]:
+            future.result()
+
+    def _add_cache_stats(self, stats: Dict[str, int]) -> None:
+        with self._lock:
+            for key, value in stats.items():
+                self.cache_stats[key] += value
+
+    def record(self, endpoint: str, seconds: float, error: bool = False) -> None:
+        with self._lock:
+            window = self.endpoints.setdefault(endpoint, LatencyWindow())
+        window.add(seconds, error)
+
+    def parse(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        text = _text(body)
+        now = _datetime(body['now'], 'now') if 'now' in body else datetime.now()
+        output_container, search_scope = _options(body)
+        future = self.batcher.submit((text, now, output_container, search_scope))
+        try:
+            return {'results': future.result(self.timeout)}
+        except FutureTimeoutError:
+            future.cancel()
+            raise RequestTimeout(f'the parse is not done within {self.timeout} seconds')
+
+    def parse_batch(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        texts = body.get('texts')
+        if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+            raise RequestError('texts must be a list of strings')
+        if 'nows' in body:
+            if not isinstance(body['nows'], list) or len(body['nows']) != len(texts):
+                raise RequestError('nows must be a list with one datetime per text')
+            nows = [_datetime(now, 'nows') for now in body['nows']]
+        else:
+            nows = [_datetime(body['now'], 'now') if 'now' in body else datetime.now()] * len(texts)
+        output_container, search_scope = _options(body)
+        items = [(text, now, output_container, search_scope) for text, now in zip(texts, nows)]
+        if not items:
+            return {'results': []}
+        try:
+            return {'results': self.batcher.run_batch(items, self.timeout)}
+        except FutureTimeoutError:
+            raise RequestTimeout(f'the parses are not done within {self.timeout} seconds')
+
+    def duration(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        return {'result': parse_duration_with_spans(_text(body), bool(body.get('return_preferred_unit', False)))}
+
+    def frequency(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        return {'result': parse_frequency(_text(body))}
+
+    def textualize(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        value = _datetime(body.get('datetime'), 'datetime')
+        now = _datetime(body['now'], 'now') if 'now' in body else datetime.now()
+        time_precision = body.get('time_precision', 3)
+        if time_precision not in (1, 2, 3):
+            raise RequestError(f'time_precision must be 1, 2 or 3, got {time_precision!r}')
+        return {'result': datetime2text(value, time_precision=time_precision, now=now)}
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            endpoints = dict(self.endpoints)
+            cache = dict(self.cache_stats) if self.cache_path else None
+        return {'uptime_seconds': round(monotonic() - self.started, 3),
+                'endpoints': {endpoint: window.to_dict() for endpoint, window in sorted(endpoints.items())},
+                'batches': self.batcher.batch_sizes.to_dict(),
+                'queue_depth': self.batcher.queue_depth,
+                'cache': cache}
+
+    def close(self) -> None:
+        self.batcher.close()
+        self.executor.shutdown()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    server: 'ParsingServer'
+
+    ROUTES = {'/parse': 'parse', '/parse_batch': 'parse_batch', '/duration': 'duration', '/frequency': 'frequency',
+              '/textualize': 'textualize'}
+
+    def _send(self, status: int, body: Dict[str, Any]) -> None:
+        payload = json.dumps(body, ensure_ascii=False, default=json_default).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self) -> None:
+        if self.path == '/metrics':
+            self._send(200, self.server.service.metrics())
+        elif self.path in self.ROUTES:
+            self._send(405, {'error': f'{self.path} expects POST'})
+        else:
+            self._send(404, {'error': f'unknown path {self.path}'})
+
+    def do_POST(self) -> None:
+        body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        if self.path not in self.ROUTES:
+            self._send(404 if self.path != '/metrics' else 405, {'error': f'unknown path {self.path}'})
+            return
+
+        service = self.server.service
+        start = perf_counter()
+        status, response = 200, {}
+        try:
+            request = json.loads(body or b'{}')
+            if not isinstance(request, dict):
+                raise RequestError('the body must be a JSON object')
+            response = getattr(service, self.ROUTES[self.path])(request)
+        except (RequestError, json.JSONDecodeError, UnicodeDecodeError) as e:
+            status, response = 400, {'error': str(e)}
+        except RequestTimeout as e:
+            status, response = 503, {'error': str(e)}
+        except Exception as e:
+            status, response = 500, {'error': repr(e)}
+        service.record(self.path, perf_counter() - start, error=status != 200)
+        self._send(status, response)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class ParsingServer(ThreadingHTTPServer):
+    """Threading HTTP server of a ParsingService, every connection is served by its own thread."""
+    daemon_threads = True
+    # the connections of concurrent clients wait in the listen backlog until they are accepted
+    request_queue_size = 1024
+
+    def __init__(self, address: Tuple[str, int], service: ParsingService, verbose: bool = False) -> None:
+        self.service = service
+        self.verbose = verbose
+        super().__init__(address, _Handler)
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.service.close()
+
+
+def make_server(host: str = '127.0.0.1', port: int = 8080, verbose: bool = False, **options: Any) -> ParsingServer:
+    """
+    :param host: address to listen on
+    :param port: port to listen on, 0 picks a free one (see server.server_address)
+    :param verbose: log every request to stderr
+    :param options: options of ParsingService
+    :return: the server, run it with serve_forever()
+    """
+    return ParsingServer((host, port), ParsingService(**options), verbose=verbose)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog='python -m hun_date_parser.batch.server',
+                                     description='Local HTTP service for parsing Hungarian dates.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('-w', '--workers', type=int, default=1,
+                        help='number of worker processes, 0 parses in the server process (default 1)')
+    parser.add_argument('--max-batch-size', type=int, default=64, help='maximum /parse requests per batch')
+    parser.add_argument('--max-wait-ms', type=float, default=2.0,
+                        help='maximum time a /parse request waits to be batched with others')
+    parser.add_argument('--cache', default=None, help='path of a ParseCache database shared by the workers')
+    parser.add_argument('--timeout', type=float, default=60.0,
+                        help='seconds a request waits for its parse before it is answered with 503 (default 60)')
+    parser.add_argument('-v', '--verbose', action='store_true', help='log every request')
+    args = parser.parse_args(argv)
+
+    server = make_server(args.host, args.port, args.verbose, workers=args.workers, max_batch_size=args.max_batch_size,
+                         max_wait_ms=args.max_wait_ms, cache_path=args.cache, timeout=args.timeout)
+    print(f'serving on http://{args.host}:{server.server_address[1]}')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
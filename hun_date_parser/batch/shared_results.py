@@ -0,0 +1,294 @@
+"""
+Process pool parsing with the results returned through shared memory.
+
+    with parse_many(sentences, now, workers=4, output='shared') as results:
+        results[7]               # intervals of the 8th sentence, built when accessed
+        results.segments[0]      # numpy structured array over the shared memory of the first chunk
+        results.to_columns()     # IntervalColumns
+
+Pickling the interval dicts (datetimes, match texts and rule lists) back from the workers takes a large share of the
+time of a process pool parse. Here the workers write every interval as a fixed width record (record_dtype()) into a
+shared memory segment per chunk of sentences and return only the name of the segment, the number of records and the
+rule names of the chunk. The parent maps the segments into numpy arrays without copying them, and builds the
+datetimes, match texts and rule names of an input only when it is accessed.
+
+Interval ends are microseconds since 1970-01-01 (the naive datetimes of the parser, seconds since midnight for
+times), NAT_VALUE for open ends, so the start and end fields can be viewed as datetime64[us] arrays. kind tells the
+type of the ends (KIND_DATETIME, KIND_DATE or KIND_TIME), rule is an index into the rule names of the segment (-1 if
+the interval has none).
+"""
+
+import weakref
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from functools import partial
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from hun_date_parser.batch.columnar import IntervalColumns
+from hun_date_parser.batch.parsing import _parse_one
+from hun_date_parser.batch.vectorized import _numpy
+from hun_date_parser.date_parser.parse_cache import ParseCache
+from hun_date_parser.date_parser.prefilter import Prefilter, default_prefilter
+from hun_date_parser.utils import SearchScopes
+
+RECORD_FIELDS = [('input_index', '<i8'), ('start', '<i8'), ('end', '<i8'), ('kind', 'i1'),
+                 ('match_start', '<i4'), ('match_end', '<i4'), ('rule', '<i4')]
+KIND_DATETIME, KIND_DATE, KIND_TIME = 0, 1, 2
+NAT_VALUE = -2 ** 63
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+# first input index of the chunk, sentences of the chunk (None for the ones rejected by the prefilter), reference times
+Chunk = Tuple[int, List[Optional[str]], List[datetime]]
+# name of the shared memory segment (None if the chunk has no intervals), number of records, rule names of the chunk
+SegmentInfo = Tuple[Optional[str], int, List[str]]
+
+
+def record_dtype() -> Any:
+    """numpy dtype of the interval records, packed to 37 bytes."""
+    return _numpy().dtype(RECORD_FIELDS)
+
+
+def _encode_end(value: Any) -> Tuple[int, int]:
+    """Microseconds of an interval end and its kind."""
+    if value is None:
+        return NAT_VALUE, -1
+    if isinstance(value, datetime):
+        return (value - _EPOCH) // _MICROSECOND, KIND_DATETIME
+    if isinstance(value, date):
+        return (value - _EPOCH.date()).days * 86_400_000_000, KIND_DATE
+    return ((value.hour * 60 + value.minute) * 60 + value.second) * 1_000_000 + value.microsecond, KIND_TIME
+
+
+def _decode_end(value: int, kind: int) -> Any:
+    if value == NAT_VALUE:
+        return None
+    if kind == KIND_DATE:
+        return _EPOCH.date() + timedelta(days=value // 86_400_000_000)
+    if kind == KIND_TIME:
+        return (datetime.min + value * _MICROSECOND).time()
+    return _EPOCH + value * _MICROSECOND
+
+
+def encode_chunk(chunk: Chunk, search_scope: SearchScopes = SearchScopes.NOT_RESTRICTED,
+                 realistic_year_required: bool = True, output_container: str = 'datetime',
+                 cache: Optional[ParseCache] = None) -> Tuple[Any, List[str]]:
+    """
+    Parses the sentences of a chunk into interval records, repeated sentences of the chunk are parsed once.
+    :param chunk: (index of the first sentence, sentences, reference times)
+    :return: records in the order of the inputs and the rule names the rule field refers to
+    """
+    np = _numpy()
+    first, sentences, nows = chunk
+    parse = partial(_parse_one, search_scope=search_scope, realistic_year_required=realistic_year_required,
+                    output_container=output_container, include_rules=True, cache=cache)
+    parsed: Dict[Tuple[str, datetime], List[Dict[str, Any]]] = {}
+    rule_ids: Dict[str, int] = {}
+    records = []
+    for index, (sentence, now) in enumerate(zip(sentences, nows), first):
+        if sentence is None:
+            continue
+        key = (sentence, now)
+        if key not in parsed:
+            parsed[key] = parse(key)
+        for interval in parsed[key]:
+            start, start_kind = _encode_end(interval['start_date'])
+            end, end_kind = _encode_end(interval['end_date'])
+            rule = ','.join(interval.get('rules', []))
+            records.append((index, start, end, max(start_kind, end_kind, KIND_DATETIME),
+                            interval.get('match_start', -1), interval.get('match_end', -1),
+                            rule_ids.setdefault(rule, len(rule_ids)) if rule else -1))
+    return np.array(records, dtype=record_dtype()), list(rule_ids)
+
+
+def _encode_chunk_to_shared_memory(chunk: Chunk, **options: Any) -> SegmentInfo:
+    """Worker side: writes the records of a chunk into a new shared memory segment owned by the parent."""
+    import multiprocessing.resource_tracker
+    from multiprocessing import shared_memory
+
+    np = _numpy()
+    records, rules = encode_chunk(chunk, **options)
+    if not len(records):
+        return None, 0, rules
+    shm = shared_memory.SharedMemory(create=True, size=records.nbytes)
+    np.ndarray(records.shape, dtype=records.dtype, buffer=shm.buf)[:] = records
+    # the parent unlinks the segment, it must outlive the worker
+    multiprocessing.resource_tracker.unregister(shm._name, 'shared_memory')  # type: ignore[attr-defined]
+    shm.close()
+    return shm.name, len(records), rules
+
+
+def _release(handles: List[Any]) -> None:
+    for shm in handles:
+        shm.unlink()
+        try:
+            shm.close()
+        except BufferError:
+            # views of the segment are still alive, the mapping goes away with the last of them
+            pass
+    handles.clear()
+
+
+@dataclass
+class Segment:
+    """Interval records of a chunk of inputs and the rule names their rule field refers to."""
+    first_input: int
+    records: Any
+    rules: List[str]
+
+
+class SharedIntervals:
+    """
+    Intervals of n input sentences in interval records, from shared memory segments written by the workers (or from
+    local arrays if the parse ran in the current process). The segments are unlinked by close() (or when the object
+    is garbage collected), the arrays must not be used after it.
+    """
+
+    def __init__(self, sentences: Sequence[str], output_container: str = 'datetime') -> None:
+        self.sentences = sentences
+        self.output_container = output_container
+        self.segments: List[Segment] = []
+        self._firsts: List[int] = []
+        self._handles: List[Any] = []
+        self._finalizer = weakref.finalize(self, _release, self._handles)
+
+    def _add(self, first_input: int, records: Any, rules: List[str], handle: Any = None) -> None:
+        if handle is not None:
+            self._handles.append(handle)
+        if len(records):
+            self.segments.append(Segment(first_input, records, rules))
+            self._firsts.append(first_input)
+
+    def _attach(self, first_input: int, info: SegmentInfo) -> None:
+        from multiprocessing import shared_memory
+
+        name, count, rules = info
+        if name is None:
+            return
+        shm = shared_memory.SharedMemory(name=name)
+        self._add(first_input, _numpy().ndarray((count,), dtype=record_dtype(), buffer=shm.buf), rules, shm)
+
+    def __len__(self) -> int:
+        return len(self.sentences)
+
+    @property
+    def num_intervals(self) -> int:
+        return sum(len(segment.records) for segment in self.segments)
+
+    def records(self, i: int) -> Tuple[Any, List[str]]:
+        """
+        :param i: input index
+        :return: the records of the input (a view of its segment) and the rule names of the segment
+        """
+        if not -len(self.sentences) <= i < len(self.sentences):
+            raise IndexError(f'input index {i} out of range')
+        i %= len(self.sentences)
+        position = bisect_right(self._firsts, i) - 1
+        if position < 0:
+            return _numpy().empty(0, dtype=record_dtype()), []
+        segment = self.segments[position]
+        indices = segment.records['input_index']
+        return segment.records[indices.searchsorted(i):indices.searchsorted(i, side='right')], segment.rules
+
+    def __getitem__(self, i: int) -> List[Dict[str, Any]]:
+        """
+        :param i: input index
+        :return: the intervals of the input in the format of text2datetime_with_spans (text2date_with_spans)
+        """
+        records, _ = self.records(i)
+        sentence = self.sentences[i]
+        intervals = []
+        for record in records.tolist():
+            _, start, end, kind, match_start, match_end, _ = record
+            interval: Dict[str, Any] = {'start_date': _decode_end(start, kind), 'end_date': _decode_end(end, kind)}
+            if match_start >= 0:
+                interval.update(match_text=sentence[match_start:match_end], match_start=match_start,
+                                match_end=match_end)
+            intervals.append(interval)
+        return intervals
+
+    def __iter__(self) -> Iterator[List[Dict[str, Any]]]:
+        return (self[i] for i in range(len(self)))
+
+    def to_records(self) -> List[List[Dict[str, Any]]]:
+        """:return: the intervals of every input, as parse_many(output='records')"""
+        return list(self)
+
+    def to_columns(self) -> IntervalColumns:
+        """
+        Copies the records into IntervalColumns, the ends are datetime64[s] for the 'datetime' and datetime64[D]
+        for the 'date' output container.
+        """
+        np = _numpy()
+        records = np.concatenate([segment.records for segment in self.segments]) if self.segments else \
+            np.empty(0, dtype=record_dtype())
+        unit = 's' if self.output_container == 'datetime' else 'D'
+        rules = np.array([segment.rules[rule] if rule >= 0 else '' for segment in self.segments
+                          for rule in segment.records['rule'].tolist()], dtype=object)
+        offsets = np.zeros(len(self.sentences) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum(np.bincount(records['input_index'], minlength=len(self.sentences)))
+        return IntervalColumns(
+            offsets=offsets,
+            input_index=records['input_index'].astype(np.int64),
+            start=records['start'].view('datetime64[us]').astype(f'datetime64[{unit}]'),
+            end=records['end'].view('datetime64[us]').astype(f'datetime64[{unit}]'),
+            match_start=records['match_start'].astype(np.int64),
+            match_end=records['match_end'].astype(np.int64),
+            rule=rules,
+        )
+
+    def close(self) -> None:
+        """Unlinks the shared memory segments."""
+        self.segments.clear()
+        self._firsts.clear()
+        self._finalizer()
+
+    def __enter__(self) -> 'SharedIntervals':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def parse_shared(sentences: Sequence[str], nows: Sequence[datetime],
+                 search_scope: SearchScopes = SearchScopes.NOT_RESTRICTED,
+                 realistic_year_required: bool = True,
+                 output_container: str = 'datetime',
+                 workers: int = 1,
+                 prefilter: Union[bool, Prefilter] = False,
+                 cache: Optional[ParseCache] = None,
+                 chunk_size: int = 256) -> SharedIntervals:
+    """
+    Parses the sentences in chunks, the records of the chunks come back through shared memory if workers > 1.
+    The parameters are the ones of parse_many, the chunk_size consecutive sentences of a chunk are parsed by one
+    worker, repeated sentences are parsed once per chunk.
+    :return: SharedIntervals
+    """
+    passed = None
+    if prefilter:
+        gate = prefilter if isinstance(prefilter, Prefilter) else default_prefilter
+        passed = {sentence for sentence in dict.fromkeys(sentences) if gate(sentence)}
+    chunks: List[Chunk] = [(first, [sentence if passed is None or sentence in passed else None
+                                    for sentence in sentences[first:first + chunk_size]],
+                            list(nows[first:first + chunk_size]))
+                           for first in range(0, len(sentences), chunk_size)]
+    options: Dict[str, Any] = dict(search_scope=search_scope, realistic_year_required=realistic_year_required,
+                                   output_container=output_container, cache=cache)
+
+    results = SharedIntervals(sentences, output_container)
+    if workers <= 1 or len(chunks) <= 1:
+        for chunk in chunks:
+            results._add(chunk[0], *encode_chunk(chunk, **options))
+        return results
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for chunk, info in zip(chunks, executor.map(partial(_encode_chunk_to_shared_memory, **options), chunks)):
+                results._attach(chunk[0], info)
+    except BaseException:
+        results.close()
+        raise
+    return results
@@ -0,0 +1,292 @@
+"""
+Seeded generator of synthetic Hungarian sentences with temporal expressions, for load testing at any size.
+
+The sentences are built from the forms the parser recognizes (named months and their abbreviations, weekdays,
+relative days and dayparts, clock times with digits or number words, date intervals with -tól/-ig, durations and
+frequencies), optionally wrapped in filler text, mixed with non-temporal negatives. Given a reference time, every
+sentence comes with its gold output: the intervals text2datetime should return, the duration in minutes and the
+frequency.
+
+    python -m hun_date_parser.batch.synthetic 1000000 --seed 7 --now 2021-03-10T14:25 > inputs.jsonl
+
+The output lines have a 'text' (and with --now a 'now') field, so they can be replayed directly
+(see hun_date_parser.batch.replay). The same seed always yields the same sentences, regardless of the reference
+time.
+"""
+
+import argparse
+import json
+import random
+import sys
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from hun_date_parser.frequency_parser.frequency_parsers import Frequency
+from hun_date_parser.utils.general_utils import num_to_word
+
+# (full name, abbreviation) forms accepted by R_NAMED_MONTH, dotted abbreviations are not read together with a day
+MONTHS = [('január', 'jan'), ('február', 'feb'), ('március', 'márc'), ('április', 'ápr'), ('május', 'máj'),
+          ('június', 'jún'), ('július', 'júl'), ('augusztus', 'aug'), ('szeptember', 'szept'), ('október', 'okt'),
+          ('november', 'nov'), ('december', 'dec')]
+
+# weekday (-n suffixed) forms, Monday first
+WEEKDAYS = ['hétfőn', 'kedden', 'szerdán', 'csütörtökön', 'pénteken', 'szombaton', 'vasárnap']
+WEEKDAYS_TOL = ['hétfőtől', 'keddtől', 'szerdától', 'csütörtöktől', 'péntektől', 'szombattól', 'vasárnaptól']
+WEEKDAYS_IG = ['hétfőig', 'keddig', 'szerdáig', 'csütörtökig', 'péntekig', 'szombatig', 'vasárnapig']
+
+# explicit years of the generated dates
+YEARS = list(range(2018, 2025))
+
+# tegnapelőtt is left out, it is also matched as tegnap
+RELATIVE_DAYS = {'tegnap': -1, 'ma': 0, 'holnap': 1, 'holnapután': 2}
+
+# daypart -> (first hour, last hour) of the interval, and the clock hours which can follow it with their offset
+DAYPARTS = {'reggel': (6, 10), 'délelőtt': (8, 11), 'délután': (12, 18), 'este': (18, 21)}
+DAYPART_HOURS = {'reggel': (range(6, 11), 0), 'délután': (range(1, 6), 12), 'este': (range(6, 10), 12)}
+
+# durations as (unit, minutes, possible amounts)
+DURATION_UNITS = [('percre', 1, range(5, 60, 5)), ('napra', 24 * 60, range(1, 15)),
+                  ('hétre', 7 * 24 * 60, range(1, 5))]
+DURATION_PHRASES = {'negyed órára': 15, 'fél órára': 30, 'háromnegyed órára': 45, 'másfél órára': 90}
+
+FREQUENCIES = {
+    'naponta': Frequency.DAILY, 'minden nap': Frequency.DAILY, 'napi rendszerességgel': Frequency.DAILY,
+    'hetente': Frequency.WEEKLY, 'minden héten': Frequency.WEEKLY, 'heti rendszerességgel': Frequency.WEEKLY,
+    'kéthetente': Frequency.FORTNIGHTLY,
+    'havonta': Frequency.MONTHLY, 'havi rendszerességgel': Frequency.MONTHLY,
+    'negyedévente': Frequency.QUARTERLY, 'háromhavonta': Frequency.QUARTERLY,
+    'félévente': Frequency.EVERY_HALF_YEAR,
+    'évente': Frequency.YEARLY, 'minden évben': Frequency.YEARLY,
+}
+
+PREFIXES = ['találkozzunk', 'a megbeszélést áttettük', 'kérlek hívj vissza', 'a csomag megérkezik', 'beszéljünk',
+            'szeretnék időpontot foglalni', 'a szerződés lejár', 'a jelentést leadjuk', 'a kiállítás nyitva lesz',
+            'a vonat indulása', 'az értekezletet megtartjuk', 'a tanfolyam']
+SUFFIXES = ['a szokott helyen', 'a budapesti irodában', 'ahogy kérted', 'a projekt miatt', 'online',
+            'a tárgyalóban', 'kérem jelezze', 'a csapattal', 'szerintem', 'ahogy megbeszéltük']
+NEGATIVES = ['köszönöm a segítséget', 'a kutya a kertben játszik', 'kérem küldje el a dokumentumot',
+             'nem tudom mi a helyzet', 'a csapat megnyerte a meccset', 'a kávé kihűlt', 'hol van a kulcs',
+             'szeretném módosítani a címemet', 'a termék nem felel meg a leírásnak', 'melyik busz megy a belvárosba',
+             'a számla összege nem stimmel', 'kérek egy visszahívást', 'a csomag sérülten érkezett',
+             'rendben van minden', 'nem értem a kérdést', 'a jelszavam nem működik']
+
+Gold = Dict[str, Any]
+Template = Tuple[str, Callable[[datetime], Gold]]
+
+
+def _front(num: int) -> bool:
+    """Whether the suffixes of a number take front vowels, decided by the last word of its Hungarian reading."""
+    return not any(vowel in num_to_word(num % 10 or num) for vowel in 'aáoóuú')
+
+
+def _on_day(day: int) -> str:
+    """-án/-én suffixed day number, e.g. 1-jén, 2-án, 5-én."""
+    if day == 1:
+        return '1-jén'
+    if day == 2:
+        return '2-án'
+    return f'{day}-én' if _front(day) else f'{day}-án'
+
+
+def _from_day(day: int) -> str:
+    return f'{day}-től' if _front(day) else f'{day}-tól'
+
+
+def _day(d: datetime) -> Tuple[datetime, datetime]:
+    start = datetime(d.year, d.month, d.day)
+    return start, start + timedelta(hours=23, minutes=59, seconds=59)
+
+
+def _hours(d: datetime, first: int, last: int) -> Tuple[datetime, datetime]:
+    start = datetime(d.year, d.month, d.day)
+    return start + timedelta(hours=first), start + timedelta(hours=last, minutes=59, seconds=59)
+
+
+def _gold(intervals: Sequence[Tuple[datetime, datetime]] = (), duration: Optional[int] = None,
+          frequency: Optional[Frequency] = None) -> Gold:
+    return {'intervals': [{'start_date': start, 'end_date': end} for start, end in intervals],
+            'duration': duration, 'frequency': frequency.value if frequency else None}
+
+
+def _month_name(rng: random.Random, month: int) -> str:
+    name, abbreviation = MONTHS[month - 1]
+    return name if rng.random() < 0.7 else abbreviation
+
+
+def named_month(rng: random.Random) -> Template:
+    """Named month and day, optionally with the year, e.g. '2022. márc 5-én'."""
+    month, day = rng.randint(1, 12), rng.randint(1, 28)
+    year = rng.choice([None, None, *YEARS])
+    text = f'{_month_name(rng, month)} {rng.choice([str(day), f"{day}.", _on_day(day), _on_day(day)])}'
+    if year is not None:
+        text = f'{year}{rng.choice(["", "."])} {text}'
+    return text, lambda now: _gold([_day(datetime(year or now.year, month, day))])
+
+
+def iso_date(rng: random.Random) -> Template:
+    """Numeric dates, e.g. '2021-03-05' or '2021.03.05.'."""
+    year, month, day = rng.choice(YEARS), rng.randint(1, 12), rng.randint(1, 28)
+    separator, end = rng.choice([('-', ''), ('.', ''), ('.', '.'), ('/', '')])
+    return (f'{year}{separator}{month:02d}{separator}{day:02d}{end}',
+            lambda now: _gold([_day(datetime(year, month, day))]))
+
+
+def relative_day(rng: random.Random) -> Template:
+    """Relative day, optionally with a daypart, e.g. 'holnapután délután'."""
+    word, offset = rng.choice(list(RELATIVE_DAYS.items()))
+    daypart = rng.choice([None, *DAYPARTS])
+    if daypart is None:
+        return word, lambda now: _gold([_day(now + timedelta(days=offset))])
+    first, last = DAYPARTS[daypart]
+    return f'{word} {daypart}', lambda now: _gold([_hours(now + timedelta(days=offset), first, last)])
+
+
+def weekday(rng: random.Random) -> Template:
+    """Weekday of the previous, current or next week, e.g. 'jövő kedden', 'ezen a héten pénteken'."""
+    index = rng.randrange(7)
+    week, modifier = rng.choice([(-1, 'múlt '), (1, 'jövő '), (0, 'ezen a héten '), (1, 'a jövő héten ')])
+    return f'{modifier}{WEEKDAYS[index]}', lambda now: _gold(
+        [_day(now - timedelta(days=now.weekday()) + timedelta(days=7 * week + index))])
+
+
+def clock(rng: random.Random) -> Template:
+    """Relative day with a clock time, e.g. 'holnap este 8-kor', 'ma reggel hétkor', 'tegnap 14:35-kor'."""
+    word, offset = rng.choice(list(RELATIVE_DAYS.items()))
+    if rng.random() < 0.3:
+        # 0:mm is not read as a clock time
+        hour, minute = rng.randint(1, 23), rng.randrange(0, 60, 5)
+        # a full hour stands for the whole hour
+        last = (59 if minute == 0 else minute, 59)
+        return f'{word} {hour}:{minute:02d}-kor', lambda now: _gold(
+            [(datetime(now.year, now.month, now.day, hour, minute) + timedelta(days=offset),
+              datetime(now.year, now.month, now.day, hour, *last) + timedelta(days=offset))])
+
+    daypart = rng.choice(list(DAYPART_HOURS))
+    hours, shift = DAYPART_HOURS[daypart]
+    hour = rng.choice(hours)
+    hour_form = f'{hour}-kor' if rng.random() < 0.5 else f'{num_to_word(hour)}kor'
+    return f'{word} {daypart} {hour_form}', lambda now: _gold(
+        [_hours(now + timedelta(days=offset), hour + shift, hour + shift)])
+
+
+def interval(rng: random.Random) -> Template:
+    """Date intervals, e.g. 'március 5-től április 2-ig', 'jövő hétfőtől jövő péntekig'."""
+    if rng.random() < 0.3:
+        # vasárnapig is not recognized as the end of an interval
+        first = rng.randrange(5)
+        last = rng.randrange(first + 1, 6)
+        return f'jövő {WEEKDAYS_TOL[first]} jövő {WEEKDAYS_IG[last]}', lambda now: _gold(
+            [(_day(now + timedelta(days=7 - now.weekday() + first))[0],
+              _day(now + timedelta(days=7 - now.weekday() + last))[1])])
+
+    month, day = rng.randint(1, 11), rng.randint(1, 28)
+    end_month = rng.choice([month, month + 1])
+    end_day = rng.randint(day + 1, 28) if end_month == month and day < 28 else rng.randint(1, 28)
+    if end_month == month and end_day <= day:
+        end_month += 1
+    text = f'{_month_name(rng, month)} {_from_day(day)} {_month_name(rng, end_month)} {end_day}-ig'
+    return text, lambda now: _gold([(datetime(now.year, month, day),
+                                     _day(datetime(now.year, end_month, end_day))[1])])
+
+
+def duration(rng: random.Random) -> Template:
+    """Durations, e.g. '3 napra', '2 hétre', 'másfél órára'."""
+    if rng.random() < 0.2:
+        phrase, minutes = rng.choice(list(DURATION_PHRASES.items()))
+        return phrase, lambda now: _gold(duration=minutes)
+    unit, minutes, amounts = rng.choice(DURATION_UNITS)
+    amount = rng.choice(amounts)
+    return f'{amount} {unit}', lambda now: _gold(duration=amount * minutes)
+
+
+def frequency(rng: random.Random) -> Template:
+    """Frequencies, e.g. 'kéthetente', 'minden évben'."""
+    phrase, value = rng.choice(list(FREQUENCIES.items()))
+    return phrase, lambda now: _gold(frequency=value)
+
+
+def negative(rng: random.Random) -> Template:
+    """Text without temporal expressions."""
+    return rng.choice(NEGATIVES), lambda now: _gold()
+
+
+FAMILIES: Dict[str, Callable[[random.Random], Template]] = {
+    'named_month': named_month,
+    'iso_date': iso_date,
+    'relative_day': relative_day,
+    'weekday': weekday,
+    'clock': clock,
+    'interval': interval,
+    'duration': duration,
+    'frequency': frequency,
+    'negative': negative,
+}
+
+
+def generate(n: Optional[int] = None, seed: int = 0, now: Optional[datetime] = None,
+             families: Optional[Sequence[str]] = None, filler_rate: float = 0.5) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily generates synthetic sentences.
+    :param n: number of sentences, None for an endless stream
+    :param seed: seed of the generator, the same seed yields the same sentences
+    :param now: reference time of the gold output, the records have no 'now' and 'gold' fields without it
+    :param families: names of the families (see FAMILIES) to draw from uniformly, all of them by default
+    :param filler_rate: probability of the temporal expression being surrounded by filler text
+    :return: iterator of records with 'text' and 'family' fields, plus 'now' and 'gold' (intervals in the format of
+    text2datetime, duration in minutes, frequency name) when now is given
+    """
+    names = list(families or FAMILIES)
+    unknown = [name for name in names if name not in FAMILIES]
+    if unknown:
+        raise ValueError(f'unknown families {unknown}, expected some of {list(FAMILIES)}')
+
+    rng = random.Random(seed)
+    i = 0
+    while n is None or i < n:
+        i += 1
+        family = rng.choice(names)
+        text, gold = FAMILIES[family](rng)
+        if family != 'negative' and rng.random() < filler_rate:
+            text = ' '.join(part for part in (rng.choice(['', *PREFIXES]), text, rng.choice(['', *SUFFIXES]))
+                            if part)
+
+        record: Dict[str, Any] = {'text': text, 'family': family}
+        if now is not None:
+            expected = gold(now)
+            expected['intervals'] = [{key: value.isoformat() for key, value in interval.items()}
+                                     for interval in expected['intervals']]
+            record.update(now=now.isoformat(), gold=expected)
+        yield record
+
+
+def sentences(n: int, seed: int = 0, families: Optional[Sequence[str]] = None) -> List[str]:
+    """
+    :return: the texts of n generated sentences
+    """
+    return [record['text'] for record in generate(n, seed=seed, families=families)]
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description='Generates synthetic Hungarian sentences as JSONL.')
+    parser.add_argument('n', type=int, help='number of sentences')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the generator')
+    parser.add_argument('--now', type=datetime.fromisoformat,
+                        help='reference time, adds it and the gold output to every line')
+    parser.add_argument('--family', action='append', choices=list(FAMILIES),
+                        help='family to draw from, can be repeated (default: all)')
+    parser.add_argument('--filler-rate', type=float, default=0.5, help='share of sentences with filler text')
+    parser.add_argument('--output', help='output file (default: stdout)')
+    args = parser.parse_args(argv)
+
+    out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    try:
+        for record in generate(args.n, seed=args.seed, now=args.now, families=args.family,
+                               filler_rate=args.filler_rate):
+            out.write(json.dumps(record, ensure_ascii=False) + '\n')
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,403 @@
+"""
+Resolution of a parsed expression against arrays of reference times (now values) with numpy.
+
+The rules are matched once per distinct reference date (once per distinct minute for the rules which use the time
+of day of now, e.g. "most" or "az elmúlt 3 órában"), the date and time classes are then assembled for all reference
+times of the group at once. The results are the same as the ones of text2datetime and text2date.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from hun_date_parser.date_parser.datetime_extractor import DatetimeExtractor, daypart_mapping, type_isin_list
+from hun_date_parser.date_parser.structure_parsers import match_multi_match
+from hun_date_parser.utils import (Year, Month, Week, Day, Daypart, Hour, Minute, StartDay, EndDay,
+                                   OverrideTopWithNow, OverrideBottomWithNow, SearchScopes, get_type_if_exists,
+                                   filter_offset_objects, calendar_index)
+from hun_date_parser.utils.duration_utils import convert_to_dict
+
+# rules which use the time of day of now, not just its date (they don't use its seconds)
+_TIME_SENSITIVE_RULES = {'now', 'n_date_periods_compared_to_now', 'in_past_n_periods'}
+# groups smaller than this are resolved one by one with the scalar implementation
+_MIN_VECTORIZED_GROUP = 8
+
+
+def _numpy() -> Any:
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError('Vectorized resolution requires numpy (pip install numpy).') from e
+    return numpy
+
+
+@dataclass
+class ResolvedIntervals:
+    """
+    Intervals of an expression resolved against n reference times. The arrays have the shape (n, number of sentence
+    parts), start and end are NaT for open or missing ends, valid marks the intervals which the scalar path returns.
+    """
+    start: Any
+    end: Any
+    valid: Any
+
+    def to_list(self, i: int) -> List[Dict[str, Any]]:
+        """
+        Returns the intervals for the i-th reference time in the format of text2datetime.
+        :param i: index of the reference time
+        :return: list of datetime interval dictionaries
+        """
+        np = _numpy()
+        res = []
+        for start, end, valid in zip(self.start[i], self.end[i], self.valid[i]):
+            if valid:
+                res.append({'start_date': None if np.isnat(start) else start.item(),
+                            'end_date': None if np.isnat(end) else end.item()})
+        return res
+
+
+class _Assembled:
+    """Per-row result of assembling the date and time classes of one end of an interval."""
+
+    def __init__(self, np: Any, n: int, unit: str) -> None:
+        self.value = np.full(n, np.datetime64('NaT'), dtype=f'datetime64[{unit}]')
+        self.ok = np.zeros(n, dtype=bool)
+        # rows the vectorized path can't reproduce (years out of the calendar index, overflows)
+        self.fallback = np.zeros(n, dtype=bool)
+
+
+def _now_fields(np: Any, nows: Any) -> Dict[str, Any]:
+    days = nows.astype('datetime64[D]')
+    months = days.astype('datetime64[M]')
+    seconds = (nows - days).astype(np.int64)
+    return {
+        'year': days.astype('datetime64[Y]').astype(np.int64) + 1970,
+        'month': months.astype(np.int64) % 12 + 1,
+        'day': (days - months).astype(np.int64) + 1,
+        'hour': seconds // 3600,
+        'minute': seconds // 60 % 60,
+    }
+
+
+def _split_dates(np: Any, days: Any) -> Tuple[Any, Any, Any]:
+    months = days.astype('datetime64[M]')
+    return (days.astype('datetime64[Y]').astype(np.int64) + 1970, months.astype(np.int64) % 12 + 1,
+            (days - months).astype(np.int64) + 1)
+
+
+def _assemble(dateparts: Any, nows: Any, bottom: bool, output_container: str) -> _Assembled:
+    """
+    Vectorized DatetimeExtractor.assemble_datetime: every step of the scalar implementation is applied to
+    arrays holding one value per reference time.
+    """
+    np = _numpy()
+    np_calendar = _numpy_calendar()
+    n = len(nows)
+    res = _Assembled(np, n, 's' if output_container == 'datetime' else 'D')
+
+    if dateparts == 'OPEN' or not dateparts:
+        return res
+
+    now = _now_fields(np, nows)
+    # rows where the scalar implementation raises a ValueError and returns None
+    invalid = np.zeros(n, dtype=bool)
+
+    def full(value: int) -> Any:
+        return np.full(n, value, dtype=np.int64)
+
+    def check_year(years: Any) -> None:
+        res.fallback |= ~np_calendar.in_range(years)
+
+    def check_date(y: Any, m: Any, d: Any) -> Any:
+        m_ok = (m >= 1) & (m <= 12)
+        return m_ok & (d >= 1) & (d <= np_calendar.month_length(y, m))
+
+    override_bottom, override_top = type_isin_list(OverrideBottomWithNow, dateparts), \
+        type_isin_list(OverrideTopWithNow, dateparts)
+
+    res_dt: List[Any] = []
+    pre_first, has_date, has_time = True, False, False
+    for date_type in [Year, Month, Week, Day, Daypart, Hour, Minute]:
+        dp_match = [pot_dp for pot_dp in dateparts if isinstance(pot_dp, date_type)]
+        value = dp_match[0].value if dp_match else None
+
+        if date_type == Year:
+            if value is not None:
+                has_date, pre_first = True, False
+                res_dt.append(full(value))
+            else:
+                res_dt.append(now['year'])
+
+        if date_type == Month:
+            if value is not None:
+                has_date, pre_first = True, False
+                res_dt.append(full(value))
+            elif pre_first:
+                res_dt.append(now['month'])
+            else:
+                res_dt.append(full(1 if bottom else 12))
+
+        if date_type == Week and not type_isin_list(Day, dateparts):
+            if value is not None:
+                has_date, pre_first = True, False
+                if not 1 <= value <= 53:
+                    res.fallback[:] = True
+                    return res
+                check_year(res_dt[0])
+                week2dt = np_calendar.monday_of_week(res_dt[0], value) + (0 if bottom else 6)
+                res_dt = list(_split_dates(np, week2dt))
+
+        if date_type == Day and len(res_dt) == 2:
+            if value is not None:
+                has_date, pre_first = True, False
+                res_dt.append(full(value))
+            elif type_isin_list(StartDay, dateparts) and bottom:
+                res_dt.append(full(get_type_if_exists(dateparts, StartDay).value))
+            elif type_isin_list(EndDay, dateparts) and not bottom:
+                res_dt.append(full(get_type_if_exists(dateparts, EndDay).value))
+            elif pre_first:
+                res_dt.append(now['day'])
+            elif bottom:
+                res_dt.append(full(1))
+            else:
+                check_year(res_dt[0])
+                invalid |= (res_dt[1] < 1) | (res_dt[1] > 12)
+                res_dt.append(np_calendar.month_length(res_dt[0], res_dt[1]))
+
+        if date_type == Daypart:
+            if value is not None:
+                has_time, pre_first = True, False
+                if value not in range(len(daypart_mapping)):
+                    res.fallback[:] = True
+                    return res
+                if bottom:
+                    res_dt.append(full(daypart_mapping[value][0]))
+                elif value == 5:
+                    if len(res_dt) != 3:
+                        return res
+                    y, m, d = res_dt
+                    check_year(y)
+                    date_ok = check_date(y, m, d)
+                    invalid |= ~date_ok
+                    next_day = np_calendar.to_datetime64(y, np.where(date_ok, m, 1), np.where(date_ok, d, 1)) + 1
+                    res_dt = [*_split_dates(np, next_day), full(daypart_mapping[value][1])]
+                else:
+                    res_dt.append(full(daypart_mapping[value][1]))
+
+        if date_type == Hour and len(res_dt) == 3:
+            if value is not None:
+                has_time, pre_first = True, False
+                res_dt.append(full(value))
+            elif pre_first:
+                res_dt.append(now['hour'])
+            else:
+                res_dt.append(full(0 if bottom else 23))
+
+        if date_type == Minute:
+            if value is not None:
+                has_time, pre_first = True, False
+                res_dt.append(full(value))
+            elif pre_first:
+                res_dt.append(now['minute'])
+            else:
+                res_dt.append(full(0 if bottom else 59))
+
+    res_dt.append(full(0 if bottom else 59))
+
+    # the scalar implementation fails to unpack the components
+    if len(res_dt) != 6:
+        return res
+
+    y, m, d, h, mi, s = res_dt
+    check_year(y)
+
+    def check_datetime(y: Any, m: Any, d: Any, h: Any, mi: Any, s: Any) -> Any:
+        return check_date(y, m, d) & (h >= 0) & (h <= 23) & (mi >= 0) & (mi <= 59) & (s >= 0) & (s <= 59)
+
+    offset_objects: List = filter_offset_objects(dateparts)
+    if offset_objects:
+        offsets = convert_to_dict(offset_objects)
+        if any(abs(v) > 10 ** 6 for v in offsets.values()):
+            res.fallback[:] = True
+            return res
+        dt_ok = check_datetime(y, m, d, h, mi, s)
+        invalid |= ~dt_ok
+
+        total_months = y * 12 + (m - 1) + offsets['years'] * 12 + offsets['months']
+        y, m = total_months // 12, total_months % 12 + 1
+        check_year(y)
+        d = np.where(dt_ok, np.minimum(d, np_calendar.month_length(y, m)), 1)
+        seconds = np.where(dt_ok, h * 3600 + mi * 60 + s, 0) + \
+            (offsets['days'] * 86400 + offsets['hours'] * 3600 + offsets['minutes'] * 60)
+        shifted = np_calendar.to_datetime64(y, m, d).astype('datetime64[s]') + seconds
+        y, m, d = _split_dates(np, shifted.astype('datetime64[D]'))
+        check_year(y)
+        seconds = (shifted - shifted.astype('datetime64[D]')).astype(np.int64)
+        h, mi, s = seconds // 3600, seconds // 60 % 60, seconds % 60
+
+    if output_container == 'datetime':
+        if (bottom and override_bottom) or (not bottom and override_top):
+            res.value[:], res.ok[:] = nows, True
+        elif has_date or has_time:
+            res.ok = check_datetime(y, m, d, h, mi, s)
+        else:
+            return res
+    else:
+        if (bottom and override_bottom) or (not bottom and override_top):
+            res.value[:], res.ok[:] = nows.astype('datetime64[D]'), True
+        elif has_date:
+            res.ok = check_date(y, m, d)
+        else:
+            return res
+
+    res.ok &= ~invalid & ~res.fallback
+    if not ((bottom and override_bottom) or (not bottom and override_top)):
+        days = np_calendar.to_datetime64(np.where(res.ok, y, calendar_index.first_year),
+                                         np.where(res.ok, m, 1), np.where(res.ok, d, 1))
+        if output_container == 'datetime':
+            seconds = np.where(res.ok, h * 3600 + mi * 60 + s, 0)
+            res.value = np.where(res.ok, days.astype('datetime64[s]') + seconds, res.value)
+        else:
+            res.value = np.where(res.ok, days, res.value)
+    else:
+        res.value = np.where(res.ok, res.value, np.datetime64('NaT'))
+
+    return res
+
+
+_np_calendar = None
+
+
+def _numpy_calendar() -> Any:
+    global _np_calendar
+    if _np_calendar is None:
+        _np_calendar = calendar_index.to_numpy()
+    return _np_calendar
+
+
+def _is_time_sensitive(parsed_dates: List[Dict]) -> bool:
+    for interval in parsed_dates:
+        for dateparts in (interval['start_date'], interval['end_date']):
+            if dateparts != 'OPEN' and any(isinstance(dp, (Hour, Minute)) and dp.rule in _TIME_SENSITIVE_RULES
+                                           for dp in dateparts):
+                return True
+    return False
+
+
+def _groups(np: Any, keys: Any) -> List[Any]:
+    """Splits the row indices into groups of equal keys."""
+    _, inverse = np.unique(keys, return_inverse=True)
+    order = np.argsort(inverse, kind='stable')
+    boundaries = np.flatnonzero(np.diff(inverse[order])) + 1
+    return np.split(order, boundaries)
+
+
+def resolve_datetime(sentence: str, nows: Any,
+                     search_scope: SearchScopes = SearchScopes.NOT_RESTRICTED,
+                     realistic_year_required: bool = True,
+                     output_container: str = 'datetime') -> ResolvedIntervals:
+    """
+    Resolves the intervals of the input sentence against every reference time, the vectorized equivalent of calling
+    text2datetime (or text2date) with each of them.
+    :param sentence: Input sentence string.
+    :param nows: Array of reference timestamps (anything convertible to datetime64[s]).
+    :param search_scope: Defines whether the timeframe should be restricted to past or future.
+    :param realistic_year_required: Defines whether to restrict year candidates to be between 1900 and 2100.
+    :param output_container: 'datetime' for datetime64[s] or 'date' for datetime64[D] results
+    :return: ResolvedIntervals with start, end and valid arrays of shape (len(nows), number of sentence parts)
+    """
+    np = _numpy()
+    if output_container not in ('datetime', 'date'):
+        raise ValueError(f"output_container must be 'datetime' or 'date', got {output_container!r}")
+
+    nows = np.asarray(nows, dtype='datetime64[s]')
+    if nows.ndim != 1 or np.isnat(nows).any():
+        raise ValueError('nows must be a one dimensional array without NaT values')
+    if len(nows) and (nows.min() < np.datetime64('0001-01-01') or nows.max() > np.datetime64('9999-12-31T23:59:59')):
+        raise ValueError('nows must be in the range of datetime')
+
+    sentence = sentence.lower()
+    n_parts = len(match_multi_match(sentence))
+    unit = 's' if output_container == 'datetime' else 'D'
+    resolved = ResolvedIntervals(start=np.full((len(nows), n_parts), np.datetime64('NaT'), dtype=f'datetime64[{unit}]'),
+                                 end=np.full((len(nows), n_parts), np.datetime64('NaT'), dtype=f'datetime64[{unit}]'),
+                                 valid=np.zeros((len(nows), n_parts), dtype=bool))
+
+    def extractor(now: datetime) -> DatetimeExtractor:
+        return DatetimeExtractor(now=now, output_container=output_container, search_scope=search_scope,
+                                 realistic_year_required=realistic_year_required)
+
+    def match(rows: Any) -> Optional[List[Dict]]:
+        try:
+            return extractor(nows[rows[0]].item())._match_dateparts(sentence)
+        except Exception:
+            # parse_datetime returns an empty list in this case
+            return None
+
+    for rows in _groups(np, nows.astype('datetime64[D]')):
+        parsed_dates = match(rows)
+        if parsed_dates is not None and _is_time_sensitive(parsed_dates):
+            for sub_rows in _groups(np, nows[rows].astype('datetime64[m]')):
+                _resolve_group(resolved, rows[sub_rows], match(rows[sub_rows]), nows, extractor)
+        else:
+            _resolve_group(resolved, rows, parsed_dates, nows, extractor)
+
+    return resolved
+
+
+def _resolve_group(resolved: ResolvedIntervals, rows: Any, parsed_dates: Optional[List[Dict]], nows: Any,
+                   extractor: Any) -> None:
+    np = _numpy()
+    if not parsed_dates:
+        return
+
+    if len(rows) < _MIN_VECTORIZED_GROUP:
+        for row in rows:
+            _resolve_row(resolved, row, parsed_dates, extractor(nows[row].item()))
+        return
+
+    group_nows = nows[rows]
+    container = 'datetime' if resolved.start.dtype == np.dtype('datetime64[s]') else 'date'
+    fallback = np.zeros(len(rows), dtype=bool)
+    for k, interval in enumerate(parsed_dates):
+        try:
+            start = _assemble(interval['start_date'], group_nows, True, container)
+            end = _assemble(interval['end_date'], group_nows, False, container)
+        except OverflowError:
+            # values beyond int64, left to the scalar implementation
+            fallback[:] = True
+            continue
+        fallback |= start.fallback | end.fallback
+
+        resolved.start[rows, k], resolved.end[rows, k] = start.value, end.value
+        in_order = ~start.ok | ~end.ok | (start.value <= end.value)
+        resolved.valid[rows, k] = (start.ok | end.ok) & in_order
+
+    for i in np.flatnonzero(fallback):
+        row = rows[i]
+        _resolve_row(resolved, row, parsed_dates, extractor(nows[row].item()))
+
+
+def _resolve_row(resolved: ResolvedIntervals, row: int, parsed_dates: List[Dict], extractor: DatetimeExtractor) -> None:
+    """Scalar resolution of a single reference time, for the values the vectorized path can't represent."""
+    np = _numpy()
+    resolved.start[row], resolved.end[row], resolved.valid[row] = np.datetime64('NaT'), np.datetime64('NaT'), False
+    try:
+        intervals = [(extractor.assemble_datetime(extractor.now, interval['start_date'], bottom=True),
+                      extractor.assemble_datetime(extractor.now, interval['end_date'], bottom=False))
+                     for interval in parsed_dates]
+    except Exception:
+        return
+
+    for k, (start, end) in enumerate(intervals):
+        if not (start or end):
+            continue
+        if start is not None and end is not None and start > end:
+            continue
+        try:
+            resolved.start[row, k] = np.datetime64('NaT') if start is None else start
+            resolved.end[row, k] = np.datetime64('NaT') if end is None else end
+        except (OverflowError, ValueError):
+            # out of the range of datetime64[s], marked as invalid
+            continue
+        resolved.valid[row, k] = True
@@ -1,5 +1,4 @@
 import re
-import calendar
 from typing import Dict, List, Any, Union
 from datetime import datetime, timedelta, date
 from dateutil.relativedelta import relativedelta
@@ -12,7 +11,8 @@ from .patterns import (R_ISO_DATE, R_REV_ISO_DATE, R_NAMED_MONTH, R_TODAY, R_TOM
                        R_N_WEEKS, R_N_DAYS, R_TOLIG_IMPLIED_END, R_NAMED_MONTH_SME, R_DAYNUM_SUFFIX, R_DAYNAME)
 from hun_date_parser.utils import (remove_accent, word_to_num, Year, Month, Week, Day, Hour, Minute,
                                    StartDay, EndDay, is_year_realistic,
-                                   OverrideTopWithNow, DayOffset, SearchScopes, return_on_value_error)
+                                   OverrideTopWithNow, DayOffset, SearchScopes, return_on_value_error,
+                                   calendar_index)
 
 
 # TODO: Update typing
@@ -229,18 +229,20 @@ def match_weekday(s: str, now: datetime,
         elif week and ('mult' in remove_accent(week) or 'elozo' in remove_accent(week)):
             n_weeks = -1
 
-        def to_next_week(dt):
-            if dt.date() < now.date():
-                return dt + timedelta(days=7)
-            return dt
+        now_ordinal = now.toordinal()
 
-        def to_last_week(dt):
-            if dt.date() > now.date():
-                return dt - timedelta(days=7)
-            return dt
+        def to_next_week(ordinal):
+            if ordinal < now_ordinal:
+                return ordinal + 7
+            return ordinal
+
+        def to_last_week(ordinal):
+            if ordinal > now_ordinal:
+                return ordinal - 7
+            return ordinal
 
         def get_day_of_week(w, d):
-            return ((now - timedelta(days=now.weekday())) + timedelta(days=w * 7)) + timedelta(days=d)
+            return now_ordinal - calendar_index.weekday(now_ordinal) + w * 7 + d
 
         day_num = -1
         if day and 'hetfo' in remove_accent(day):
@@ -271,6 +273,7 @@ def match_weekday(s: str, now: datetime,
                     target_day = get_day_of_week(n_weeks, day_num)
             else:
                 target_day = get_day_of_week(n_weeks, day_num)
+            target_day = date.fromordinal(target_day)
 
             date_parts['date_parts'] = [Year(target_day.year, 'weekday'),
                                         Month(target_day.month, 'weekday'),
@@ -297,13 +300,13 @@ def match_week(s: str, now: datetime) -> List[Dict[str, Any]]:
         }
 
         if 'ez' in group:
-            y, w = now.isocalendar()[0:2]
+            y, w = calendar_index.iso_year_week(now.toordinal())
             date_parts['date_parts'].extend([Year(y, 'week'), Week(w, 'week')])
         elif 'jovo' in remove_accent(group):
-            y, w = (now + timedelta(days=7)).isocalendar()[0:2]
+            y, w = calendar_index.iso_year_week(now.toordinal() + 7)
             date_parts['date_parts'].extend([Year(y, 'week'), Week(w, 'week')])
         elif 'mult' in remove_accent(group) or 'elozo' in remove_accent(group):
-            y, w = (now - timedelta(days=7)).isocalendar()[0:2]
+            y, w = calendar_index.iso_year_week(now.toordinal() - 7)
             date_parts['date_parts'].extend([Year(y, 'week'), Week(w, 'week')])
 
         res.append(date_parts)
@@ -670,8 +673,7 @@ def match_named_month_start_mid_end(
         return month < now.month
 
     def get_last_day(y, m):
-        _, last_day = calendar.monthrange(y, m)
-        return last_day
+        return calendar_index.month_length(y, m)
 
     matches = re.finditer(R_NAMED_MONTH_SME, s)
     months = ['jan', 'feb', 'mar', 'apr', 'maj', 'jun', 'jul', 'aug', 'szep', 'okt', 'nov', 'dec']
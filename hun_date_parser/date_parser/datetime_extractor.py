@@ -1,13 +1,14 @@
 """This module handles combined date and time parsing."""
 
 from datetime import datetime, timedelta, date, time
-from calendar import monthrange
 from itertools import chain
+from time import perf_counter
 
-from typing import Dict, List, Union
+from typing import Callable, Dict, List, Optional, Tuple, Union, TYPE_CHECKING
 from copy import copy
 
-from hun_date_parser.date_parser.structure_parsers import match_multi_match, match_interval, match_duration_match
+from hun_date_parser.date_parser.structure_parsers import (match_multi_match, match_interval_with_spans,
+                                                           match_duration_match)
 from hun_date_parser.date_parser.date_parsers import (match_named_month, match_iso_date, match_weekday,
                                                       match_relative_day, match_day_of_month,
                                                       match_week, match_named_year, match_n_periods_compared_to_now,
@@ -15,10 +16,19 @@ from hun_date_parser.date_parser.date_parsers import (match_named_month, match_i
                                                       match_date_offset, match_named_month_interval,
                                                       match_named_month_start_mid_end)
 from hun_date_parser.date_parser.time_parsers import match_digi_clock, match_time_words, match_now, match_hwords
+from hun_date_parser.date_parser.prefilter import Prefilter, default_prefilter
+from hun_date_parser.date_parser.phrase_table import PhraseTable
+from hun_date_parser.date_parser.profiling import current_profiler, timed
+from hun_date_parser.date_parser.parse_cache import ParseCache
 from hun_date_parser.utils import (Year, Month, Week, Day, Daypart, Hour, Minute, StartDay, EndDay, get_type_if_exists,
                                    OverrideTopWithNow, SearchScopes, is_smaller_date_or_none,
                                    OverrideBottomWithNow, monday_of_calenderweek, DateTimePartConatiner,
-                                   return_on_value_error, filter_offset_objects, apply_offsets_and_return_components)
+                                   return_on_value_error, filter_offset_objects, apply_offsets_and_return_components,
+                                   calendar_index, lower_keep_positions)
+
+if TYPE_CHECKING:
+    from hun_date_parser.date_parser.profiling import Profiler
+    from hun_date_parser.date_parser.slow_log import SlowLog
 
 datelike = Union[datetime, date, time, None]
 
@@ -35,19 +45,20 @@ daypart_mapping = [
 
 def text2datetime_with_spans(input_sentence: str, now: datetime = datetime.now(),
                              search_scope: SearchScopes = SearchScopes.NOT_RESTRICTED,
-                             realistic_year_required: bool = True) -> List[Dict]:
+                             realistic_year_required: bool = True, include_rules: bool = False) -> List[Dict]:
     """
     Returns datetime intervals with span information found in the input sentence.
     :param input_sentence: Input sentence string.
     :param now: Current timestamp to calculate relative dates.
     :param search_scope: Defines whether the timeframe should be restricted to past or future.
     :param realistic_year_required: Defines whether to restrict year candidates to be between 1900 and 2100.
+    :param include_rules: If True, include the names of the rules which matched the interval under 'rules'.
     :return: list of dictionaries with datetime intervals and span info
     """
     datetime_extractor = DatetimeExtractor(now=now, output_container='datetime',
                                            search_scope=search_scope,
                                            realistic_year_required=realistic_year_required)
-    return datetime_extractor._parse_datetime(input_sentence, include_spans=True)
+    return datetime_extractor._parse_datetime(input_sentence, include_spans=True, include_rules=include_rules)
 
 
 def text2datetime(input_sentence: str, now: datetime = datetime.now(),
@@ -119,54 +130,71 @@ def text2time(input_sentence: str, now: datetime = datetime.now(),
     return datetime_extractor.parse_datetime(sentence=input_sentence)
 
 
+# the rules matched against the sentence parts in order, called with the sentence, now, search scope and
+# realistic_year_required
+_RULES: List[Tuple[str, Callable[[str, datetime, SearchScopes, bool], List[Dict]]]] = [
+    ('match_named_month', lambda sentence, now, search_scope, _: match_named_month(sentence, now, search_scope)),
+    ('match_iso_date', lambda sentence, now, search_scope, realistic: match_iso_date(sentence, realistic)),
+    ('match_relative_day', lambda sentence, now, *_: match_relative_day(sentence, now)),
+    ('match_weekday', lambda sentence, now, search_scope, _: match_weekday(sentence, now, search_scope)),
+    ('match_week', lambda sentence, now, *_: match_week(sentence, now)),
+    ('match_named_year', lambda sentence, now, *_: match_named_year(sentence, now)),
+    ('match_digi_clock', lambda sentence, *_: match_digi_clock(sentence)),
+    ('match_hwords', lambda sentence, *_: match_hwords(sentence)),
+    ('match_time_words', lambda sentence, *_: match_time_words(sentence)),
+    ('match_now', lambda sentence, now, *_: match_now(sentence, now)),
+    ('match_n_periods_compared_to_now', lambda sentence, now, *_: match_n_periods_compared_to_now(sentence, now)),
+    ('match_relative_month', lambda sentence, now, *_: match_relative_month(sentence, now)),
+    ('match_in_past_n_periods', lambda sentence, now, *_: match_in_past_n_periods(sentence, now)),
+    ('match_named_month_interval', lambda sentence, *_: match_named_month_interval(sentence)),
+    ('match_named_month_start_mid_end', lambda sentence, now, *_: match_named_month_start_mid_end(sentence, now)),
+    ('match_day_of_month', lambda sentence, now, *_: match_day_of_month(sentence, now)),
+]
+
+
 def match_rules_with_spans(now: datetime, sentence: str,
                            search_scope: SearchScopes = SearchScopes.NOT_RESTRICTED,
-                           realistic_year_required: bool = True) -> List:
+                           realistic_year_required: bool = True, profiler: Optional['Profiler'] = None) -> List:
     """
     Matches all rules against input text and returns both date parts and span information.
     :param now: Current timestamp to calculate relative dates.
     :param sentence: Input sentence.
     :param search_scope: Defines whether the timeframe should be restricted to past or future.
     :param realistic_year_required: Defines whether to restrict year candidates to be between 1900 and 2100.
+    :param profiler: Profiler recording the call as the match_rules stage and the calls of the rules.
     :return: List of match dictionaries with date_parts and span info.
     """
-    return [*match_named_month(sentence, now, search_scope),
-            *match_iso_date(sentence, realistic_year_required),
-            *match_relative_day(sentence, now),
-            *match_weekday(sentence, now, search_scope),
-            *match_week(sentence, now),
-            *match_named_year(sentence, now),
-            *match_digi_clock(sentence),
-            *match_hwords(sentence),
-            *match_time_words(sentence),
-            *match_now(sentence, now),
-            *match_n_periods_compared_to_now(sentence, now),
-            *match_relative_month(sentence, now),
-            *match_in_past_n_periods(sentence, now),
-            *match_named_month_interval(sentence),
-            *match_named_month_start_mid_end(sentence, now),
-            *match_day_of_month(sentence, now)]
+    if profiler is None:
+        return [match for _, rule in _RULES for match in rule(sentence, now, search_scope, realistic_year_required)]
+    active: 'Profiler' = profiler
+
+    def match_profiled() -> List:
+        return [match for name, rule in _RULES
+                for match in active.call('rule', name, rule, sentence, now, search_scope, realistic_year_required)]
+
+    return active.call('stage', 'match_rules', match_profiled)
 
 
 def match_rules(now: datetime, sentence: str,
                 search_scope: SearchScopes = SearchScopes.NOT_RESTRICTED,
-                realistic_year_required: bool = True) -> List:
+                realistic_year_required: bool = True, profiler: Optional['Profiler'] = None) -> List:
     """
     Matches all rules against input text.
     :param now: Current timestamp to calculate relative dates.
     :param sentence: Input sentence.
     :param search_scope: Defines whether the timeframe should be restricted to past or future.
     :param realistic_year_required: Defines whether to restrict year candidates to be between 1900 and 2100.
+    :param profiler: Profiler recording the call as the match_rules stage and the calls of the rules.
     :return: Parsed date and time classes.
     """
-    matches = match_rules_with_spans(now, sentence, search_scope, realistic_year_required)
+    matches = match_rules_with_spans(now, sentence, search_scope, realistic_year_required, profiler)
     matches = list(chain(*[m['date_parts'] for m in matches]))
     return matches
 
 
 def match_duration_rules(now: datetime, sentence: str,
                          search_scope: SearchScopes = SearchScopes.NOT_RESTRICTED,
-                         realistic_year_required: bool = True) -> List:
+                         realistic_year_required: bool = True, profiler: Optional['Profiler'] = None) -> List:
     """
     Given that it as already been established that a duration is being parsed, matches all
     duration-specific rules against the input text.
@@ -174,11 +202,20 @@ def match_duration_rules(now: datetime, sentence: str,
     :param sentence: Input sentence.
     :param search_scope: Defines whether the timeframe should be restricted to past or future.
     :param realistic_year_required: Defines whether to restrict year candidates to be between 1900 and 2100.
+    :param profiler: Profiler recording the call as the match_duration_rules stage and the calls of the rules.
     :return: Parsed date and time classes.
     """
-    matches = [
-        *match_date_offset(sentence)
-    ]
+    if profiler is None:
+        matches = [
+            *match_date_offset(sentence)
+        ]
+    else:
+        active: 'Profiler' = profiler
+
+        def match_profiled() -> List:
+            return [*active.call('rule', 'match_date_offset', match_date_offset, sentence)]
+
+        matches = active.call('stage', 'match_duration_rules', match_profiled)
 
     matches = list(chain(*[m['date_parts'] for m in matches]))
 
@@ -202,6 +239,65 @@ def extend_start_end(interval: Dict) -> Dict:
     return interval_
 
 
+def filter_intervals(intervals: List[Dict]) -> List[Dict]:
+    """
+    Removes the assembled intervals where both the start and end dates are None or where the end date is smaller
+    than the start.
+    :param intervals: list of assembled interval dictionaries
+    :return: the valid intervals
+    """
+    return [
+        intv for intv in intervals if
+        (intv['start_date'] or intv['end_date']) and
+        is_smaller_date_or_none(intv['start_date'], intv['end_date'])
+    ]
+
+
+def get_rules(interval: Dict) -> List[str]:
+    """
+    Collects the names of the rules which produced the dateparts of an interval.
+    :param interval: Dictionary with start and end dateparts (or 'OPEN').
+    :return: list of distinct rule names in order of appearance
+    """
+    rules: List[str] = []
+    for dateparts in (interval['start_date'], interval['end_date']):
+        if isinstance(dateparts, str):
+            continue
+        for dp in dateparts:
+            if dp.rule not in rules:
+                rules.append(dp.rule)
+
+    return rules
+
+
+# (output_container, search_scope, realistic_year_required) -> phrase table, built on first use
+_PHRASE_TABLES: Dict[Tuple[str, SearchScopes, bool], PhraseTable] = {}
+
+
+def get_phrase_table(output_container: str = 'datetime', search_scope: SearchScopes = SearchScopes.NOT_RESTRICTED,
+                     realistic_year_required: bool = True) -> PhraseTable:
+    """
+    Returns the fast path table of the frequent phrases for an extractor configuration, the phrases are compiled from
+    the results of the rules the first time the table is needed.
+    """
+    key = (output_container, search_scope, realistic_year_required)
+    table = _PHRASE_TABLES.get(key)
+    if table is None:
+        table = _PHRASE_TABLES[key] = PhraseTable(_rules_parser(*key), output_container)
+    return table
+
+
+def _rules_parser(output_container: str, search_scope: SearchScopes, realistic_year_required: bool,
+                  include_spans: bool = True) -> Callable[[datetime, str], List[Dict]]:
+    """Parser of a sentence against a reference time with the rule names, by the rules only."""
+    def parse(now: datetime, sentence: str) -> List[Dict]:
+        extractor = DatetimeExtractor(now=now, output_container=output_container, search_scope=search_scope,
+                                      realistic_year_required=realistic_year_required, fast_path=False)
+        return extractor._parse_datetime(sentence, include_spans=include_spans, include_rules=True)
+
+    return parse
+
+
 def type_isin_list(date_type: type, lst: Union[List, str]) -> bool:
     if isinstance(lst, str):
         return False
@@ -218,20 +314,37 @@ class DatetimeExtractor:
 
     def __init__(self, now: datetime = datetime.now(), output_container: str = 'datetime',
                  search_scope: SearchScopes = SearchScopes.NOT_RESTRICTED,
-                 realistic_year_required: bool = True) -> None:
+                 realistic_year_required: bool = True, profiler: Optional['Profiler'] = None,
+                 slow_log: Optional['SlowLog'] = None, prefilter: Union[bool, Prefilter] = False,
+                 fast_path: bool = True, cache: Optional[ParseCache] = None) -> None:
         """
         :param now: Current timestamp to calculate relative dates.
         :param output_container: datetime object to populate with datetime parts
         :param search_scope: Defines whether the timeframe should be restricted to past or future.
         :param realistic_year_required: Defines whether to restrict year candidates to be between 1900 and 2100.
+        :param profiler: Profiler which records the time spent in the pipeline stages and rules of each parse.
+        :param slow_log: SlowLog which keeps the slowest inputs parsed by the extractor.
+        :param prefilter: True (or a Prefilter, which counts the rejected inputs) to return no intervals right away for
+        the inputs without temporal expressions, see has_temporal_expression. True uses default_prefilter.
+        :param fast_path: If True, the sentences which are exactly one of the frequent phrases (FAST_PATH_PHRASES) are
+        resolved from a table compiled from the rules instead of matching every rule. Skipped while profiling.
+        :param cache: ParseCache which stores the compiled parses of the sentences on disk. Only used with the
+        NOT_RESTRICTED search scope (the restricted scopes switch between candidates at the reference times which
+        the probes can't cover) and skipped while profiling.
         """
         self.now = now
         self.output_container = output_container
         self.search_scope = search_scope
         self.realistic_year_required = realistic_year_required
-
-    def _get_implicit_intervall(self, sentence_part: str):
-        matches = match_rules(self.now, sentence_part, self.search_scope, self.realistic_year_required)
+        self.profiler = profiler
+        self.slow_log = slow_log
+        self.prefilter: Optional[Prefilter] = prefilter if isinstance(prefilter, Prefilter) else \
+            (default_prefilter if prefilter else None)
+        self.fast_path = fast_path
+        self.cache = cache
+
+    def _get_implicit_intervall(self, sentence_part: str, profiler: Optional['Profiler'] = None):
+        matches = match_rules(self.now, sentence_part, self.search_scope, self.realistic_year_required, profiler)
         return [{'start_date': matches, 'end_date': matches}]
 
     @return_on_value_error(None)
@@ -312,8 +425,7 @@ class DatetimeExtractor:
                 elif bottom:
                     res_dt.append(1)
                 else:
-                    mr = monthrange(res_dt[0], res_dt[1])
-                    res_dt.append(mr[1])
+                    res_dt.append(calendar_index.month_length(res_dt[0], res_dt[1]))
 
             if date_type == Daypart:
                 if _dp_match and _dp_match.value is not None:
@@ -404,16 +516,72 @@ class DatetimeExtractor:
         except:
             return []
 
-    def _parse_datetime(self, sentence: str, include_spans: bool = False) -> List[Dict[str, datelike]]:
+    def _match_dateparts(self, sentence: str, profiler: Optional['Profiler'] = None) -> List[Dict]:
         """
-        Extracts list of datetime intervals from input sentence.
-        :param sentence: Input sentence string.
-        :param include_spans: If True, include span information in the results.
-        :return: list of datetime interval dictionaries
+        Matches the rules against the parts of the input sentence, one interval is returned for each part.
+        :param sentence: Lowercased input sentence.
+        :param profiler: Profiler recording the stages and rules of the parse.
+        :return: list of dictionaries with the start and end date and time classes (or 'OPEN')
         """
-        original_sentence = sentence  # Keep original case for span extraction
-        sentence = sentence.lower()
-        sentence_parts = match_multi_match(sentence)
+        parsed_dates = []
+
+        for sentence_part in timed(profiler, 'stage', 'match_multi_match', match_multi_match, sentence):
+            # Try to determine whether an explicit date interval has been provided
+            # Something like holnap**tol** jovo kedd**ig**
+            interval = timed(profiler, 'stage', 'match_interval', match_interval_with_spans, sentence_part)
+
+            duration_parts = timed(profiler, 'stage', 'match_duration_match', match_duration_match, sentence_part)
+
+            # If explicit interval is detected, parse the start and end dates using that information...
+            # For instance:
+            #   holnap**tol** jovo kedd**ig**:
+            #       start_date: parse_date(holnap)
+            #       end_date: parse_date(jovo kedd)
+            if interval and not duration_parts:
+                interval['start_date'] = 'OPEN' if interval['start_date'] == 'OPEN' else match_rules(
+                    self.now, interval['start_date'], self.search_scope, self.realistic_year_required, profiler)
+                interval['end_date'] = 'OPEN' if interval['end_date'] == 'OPEN' else match_rules(
+                    self.now, interval['end_date'], self.search_scope, self.realistic_year_required, profiler)
+
+                parsed_dates.append(interval)
+
+            # ... another way of explicitly expressing time intervals is with a start date and a duration
+            # For instance:
+            #   holnaptol 5 napig:
+            #       start_date: parse_date(holnap)
+            #       end_date: parse_date(holnap) + offset_with(5 days)
+            elif duration_parts:
+                from_part, duration_part = duration_parts
+
+                interval['start_date'] = match_rules(self.now, from_part, self.search_scope,
+                                                     self.realistic_year_required, profiler)
+                interval['end_date'] = match_rules(self.now, from_part,
+                                                   self.search_scope,
+                                                   self.realistic_year_required, profiler) + match_duration_rules(
+                    self.now, duration_part, self.search_scope, self.realistic_year_required, profiler)
+                parsed_dates.append(interval)
+
+            # ... else try to determine a time interval implicitly.
+            # For instance:
+            #   holnap:
+            #       start_date: parse_date(holnap, bottom=True) --> earliest datetime tomorrow
+            #       end_date: parse_date(holnap, bottom=False)  --> latest datetime tomorrow
+            else:
+                parsed_dates += self._get_implicit_intervall(sentence_part, profiler)
+
+        return [timed(profiler, 'stage', 'extend_start_end', extend_start_end, intv) for intv in parsed_dates]
+
+    def _match_dateparts_with_spans(self, sentence: str, original_sentence: str,
+                                    profiler: Optional['Profiler'] = None) -> List[Dict]:
+        """
+        Same as _match_dateparts, but the intervals also carry the span of their match in the original sentence.
+        Parts without a valid match are left out.
+        :param sentence: Lowercased input sentence.
+        :param original_sentence: Input sentence with its original casing.
+        :param profiler: Profiler recording the stages and rules of the parse.
+        :return: list of dictionaries with the start and end date and time classes and span information
+        """
+        sentence_parts = timed(profiler, 'stage', 'match_multi_match', match_multi_match, sentence)
         parsed_dates = []
 
         for sentence_part in sentence_parts:
@@ -422,9 +590,9 @@ class DatetimeExtractor:
 
             # Try to determine whether an explicit date interval has been provided
             # Something like holnap**tol** jovo kedd**ig**
-            interval = match_interval(sentence_part)
+            interval = timed(profiler, 'stage', 'match_interval', match_interval_with_spans, sentence_part)
 
-            duration_parts = match_duration_match(sentence_part)
+            duration_parts = timed(profiler, 'stage', 'match_duration_match', match_duration_match, sentence_part)
 
             # If explicit interval is detected, parse the start and end dates using that information...
             # For instance:
@@ -432,91 +600,74 @@ class DatetimeExtractor:
             #       start_date: parse_date(holnap)
             #       end_date: parse_date(jovo kedd)
             if interval and not duration_parts:
-                if include_spans:
-                    # Use match_rules_with_spans and extract span information
-                    if interval['start_date'] == 'OPEN':
-                        interval['start_date'] = 'OPEN'
-                        interval['start_spans'] = []
-                    else:
-                        start_matches = match_rules_with_spans(
-                            self.now, interval['start_date'], self.search_scope, self.realistic_year_required)
-                        interval['start_date'] = list(chain(*[m['date_parts'] for m in start_matches]))
-                        interval['start_spans'] = start_matches
-
-                    if interval['end_date'] == 'OPEN':
-                        interval['end_date'] = 'OPEN'
-                        interval['end_spans'] = []
-                    else:
-                        end_matches = match_rules_with_spans(
-                            self.now, interval['end_date'], self.search_scope, self.realistic_year_required)
-                        interval['end_date'] = list(chain(*[m['date_parts'] for m in end_matches]))
-                        interval['end_spans'] = end_matches
-
-                    # Calculate overall span for the interval
-                    if interval['start_spans'] and interval['end_spans']:
-                        # Find positions of start and end parts in the original sentence
-                        start_part = interval.get('start_date_original', '')
-                        end_part = interval.get('end_date_original', '')
-
-                        # If we don't have original parts, reconstruct from match_interval result
-                        if not start_part:
-                            # Find the start and end parts from the original match_interval call
-                            from hun_date_parser.date_parser.structure_parsers import match_interval as parse_interval
-                            orig_interval = parse_interval(sentence_part)
-                            start_part = orig_interval.get('start_date', '')
-                            end_part = orig_interval.get('end_date', '')
-
-                        start_pos = sentence_part.find(start_part) if start_part else 0
-                        end_pos = sentence_part.find(end_part) if end_part else len(sentence_part)
-
-                        # Adjust spans based on position within sentence_part
-                        adjusted_start_spans = []
-                        for span in interval['start_spans']:
-                            adjusted_span = span.copy()
-                            adjusted_span['match_start'] = start_pos + span['match_start']
-                            adjusted_span['match_end'] = start_pos + span['match_end']
-                            adjusted_start_spans.append(adjusted_span)
-
-                        adjusted_end_spans = []
-                        for span in interval['end_spans']:
-                            adjusted_span = span.copy()
-                            adjusted_span['match_start'] = end_pos + span['match_start']
-                            adjusted_span['match_end'] = end_pos + span['match_end']
-                            adjusted_end_spans.append(adjusted_span)
-
-                        # Now calculate the overall span
-                        all_spans = adjusted_start_spans + adjusted_end_spans
-                        min_start = min(s['match_start'] for s in all_spans)
-                        max_end = max(s['match_end'] for s in all_spans)
-
-                        interval['match_text'] = sentence_part[min_start:max_end]
-                        interval['match_start'] = part_offset + min_start
-                        interval['match_end'] = part_offset + max_end
-                    elif interval['start_spans']:
-                        # For open intervals, use the span from the actual date match
-                        valid_start_spans = [
-                            m for m in interval['start_spans']
-                            if m.get('match_text') and m.get('match_start', 0) != m.get('match_end', 0)
-                        ]
-                        if valid_start_spans:
-                            span = valid_start_spans[0]
-                            # Use the span information directly
-                            interval['match_text'] = span['match_text']
-                            interval['match_start'] = part_offset + span['match_start']
-                            interval['match_end'] = part_offset + span['match_end']
-                        else:
-                            interval['match_text'] = sentence_part
-                            interval['match_start'] = part_offset
-                            interval['match_end'] = part_offset + len(sentence_part)
+                # Use match_rules_with_spans and extract span information
+                if interval['start_date'] == 'OPEN':
+                    interval['start_date'] = 'OPEN'
+                    interval['start_spans'] = []
+                else:
+                    start_matches = match_rules_with_spans(
+                        self.now, interval['start_date'], self.search_scope, self.realistic_year_required, profiler)
+                    interval['start_date'] = list(chain(*[m['date_parts'] for m in start_matches]))
+                    interval['start_spans'] = start_matches
+
+                if interval['end_date'] == 'OPEN':
+                    interval['end_date'] = 'OPEN'
+                    interval['end_spans'] = []
+                else:
+                    end_matches = match_rules_with_spans(
+                        self.now, interval['end_date'], self.search_scope, self.realistic_year_required, profiler)
+                    interval['end_date'] = list(chain(*[m['date_parts'] for m in end_matches]))
+                    interval['end_spans'] = end_matches
+
+                # Calculate overall span for the interval
+                if interval['start_spans'] and interval['end_spans']:
+                    # Positions of the start and end parts within sentence_part
+                    start_pos = interval['start_offset']
+                    end_pos = interval['end_offset']
+
+                    # Adjust spans based on position within sentence_part
+                    adjusted_start_spans = []
+                    for span in interval['start_spans']:
+                        adjusted_span = span.copy()
+                        adjusted_span['match_start'] = start_pos + span['match_start']
+                        adjusted_span['match_end'] = start_pos + span['match_end']
+                        adjusted_start_spans.append(adjusted_span)
+
+                    adjusted_end_spans = []
+                    for span in interval['end_spans']:
+                        adjusted_span = span.copy()
+                        adjusted_span['match_start'] = end_pos + span['match_start']
+                        adjusted_span['match_end'] = end_pos + span['match_end']
+                        adjusted_end_spans.append(adjusted_span)
+
+                    # Now calculate the overall span
+                    all_spans = adjusted_start_spans + adjusted_end_spans
+                    min_start = min(s['match_start'] for s in all_spans)
+                    max_end = max(s['match_end'] for s in all_spans)
+
+                    interval['match_text'] = sentence_part[min_start:max_end]
+                    interval['match_start'] = part_offset + min_start
+                    interval['match_end'] = part_offset + max_end
+                elif interval['start_spans']:
+                    # For open intervals, use the span from the actual date match
+                    valid_start_spans = [
+                        m for m in interval['start_spans']
+                        if m.get('match_text') and m.get('match_start', 0) != m.get('match_end', 0)
+                    ]
+                    if valid_start_spans:
+                        span = valid_start_spans[0]
+                        # Use the span information directly
+                        interval['match_text'] = span['match_text']
+                        interval['match_start'] = part_offset + span['match_start']
+                        interval['match_end'] = part_offset + span['match_end']
                     else:
                         interval['match_text'] = sentence_part
                         interval['match_start'] = part_offset
                         interval['match_end'] = part_offset + len(sentence_part)
                 else:
-                    interval['start_date'] = 'OPEN' if interval['start_date'] == 'OPEN' else match_rules(
-                        self.now, interval['start_date'], self.search_scope, self.realistic_year_required)
-                    interval['end_date'] = 'OPEN' if interval['end_date'] == 'OPEN' else match_rules(
-                        self.now, interval['end_date'], self.search_scope, self.realistic_year_required)
+                    interval['match_text'] = sentence_part
+                    interval['match_start'] = part_offset
+                    interval['match_end'] = part_offset + len(sentence_part)
 
                 parsed_dates.append(interval)
 
@@ -528,30 +679,22 @@ class DatetimeExtractor:
             elif duration_parts:
                 from_part, duration_part = duration_parts
 
-                if include_spans:
-                    from_matches = match_rules_with_spans(
-                        self.now, from_part, self.search_scope, self.realistic_year_required)
-                    interval['start_date'] = list(chain(*[m['date_parts'] for m in from_matches]))
-                    interval['end_date'] = interval['start_date'] + match_duration_rules(
-                        self.now, duration_part, self.search_scope, self.realistic_year_required)
-                    interval['from_spans'] = from_matches
-
-                    # Calculate span for duration interval
-                    if from_matches:
-                        interval['match_text'] = sentence_part
-                        interval['match_start'] = part_offset
-                        interval['match_end'] = part_offset + len(sentence_part)
-                    else:
-                        interval['match_text'] = sentence_part
-                        interval['match_start'] = part_offset
-                        interval['match_end'] = part_offset + len(sentence_part)
+                from_matches = match_rules_with_spans(
+                    self.now, from_part, self.search_scope, self.realistic_year_required, profiler)
+                interval['start_date'] = list(chain(*[m['date_parts'] for m in from_matches]))
+                interval['end_date'] = interval['start_date'] + match_duration_rules(
+                    self.now, duration_part, self.search_scope, self.realistic_year_required, profiler)
+                interval['from_spans'] = from_matches
+
+                # Calculate span for duration interval
+                if from_matches:
+                    interval['match_text'] = sentence_part
+                    interval['match_start'] = part_offset
+                    interval['match_end'] = part_offset + len(sentence_part)
                 else:
-                    interval['start_date'] = match_rules(self.now, from_part, self.search_scope,
-                                                         self.realistic_year_required)
-                    interval['end_date'] = match_rules(self.now, from_part,
-                                                       self.search_scope,
-                                                       self.realistic_year_required) + match_duration_rules(
-                        self.now, duration_part, self.search_scope, self.realistic_year_required)
+                    interval['match_text'] = sentence_part
+                    interval['match_start'] = part_offset
+                    interval['match_end'] = part_offset + len(sentence_part)
                 parsed_dates.append(interval)
 
             # ... else try to determine a time interval implicitly.
@@ -560,75 +703,129 @@ class DatetimeExtractor:
             #       start_date: parse_date(holnap, bottom=True) --> earliest datetime tomorrow
             #       end_date: parse_date(holnap, bottom=False)  --> latest datetime tomorrow
             else:
-                if include_spans:
-                    matches = match_rules_with_spans(
-                        self.now, sentence_part, self.search_scope, self.realistic_year_required)
-                    # Filter out invalid matches (empty text or invalid spans)
-                    valid_matches = [
-                        m for m in matches
-                        if m.get('match_text') and m.get('match_start', 0) != m.get('match_end', 0)
-                    ]
+                matches = match_rules_with_spans(
+                    self.now, sentence_part, self.search_scope, self.realistic_year_required, profiler)
+                # Filter out invalid matches (empty text or invalid spans)
+                valid_matches = [
+                    m for m in matches
+                    if m.get('match_text') and m.get('match_start', 0) != m.get('match_end', 0)
+                ]
+
+                if valid_matches:
+                    all_date_parts = list(chain(*[m['date_parts'] for m in valid_matches]))
+
+                    if len(valid_matches) == 1:
+                        # Single match - use its exact span
+                        match = valid_matches[0]
+                        implicit_interval = {
+                            'start_date': all_date_parts,
+                            'end_date': all_date_parts,
+                            'match_text': match['match_text'],
+                            'match_start': part_offset + match['match_start'],
+                            'match_end': part_offset + match['match_end'],
+                            'spans': valid_matches
+                        }
+                    else:
+                        # Multiple matches - merge them
+                        min_start = min(m.get('match_start', 0) for m in valid_matches)
+                        max_end = max(m.get('match_end', 0) for m in valid_matches)
+
+                        implicit_interval = {
+                            'start_date': all_date_parts,
+                            'end_date': all_date_parts,
+                            'match_text': original_sentence[part_offset + min_start:part_offset + max_end],
+                            'match_start': part_offset + min_start,
+                            'match_end': part_offset + max_end,
+                            'spans': valid_matches
+                        }
+                    parsed_dates.append(implicit_interval)
+
+        return [timed(profiler, 'stage', 'extend_start_end', extend_start_end, intv) for intv in parsed_dates]
+
+    def _parse_datetime(self, sentence: str, include_spans: bool = False,
+                        include_rules: bool = False, lowered: Optional[str] = None) -> List[Dict[str, datelike]]:
+        """
+        Extracts list of datetime intervals from input sentence.
+        :param sentence: Input sentence string.
+        :param include_spans: If True, include span information in the results.
+        :param include_rules: If True, include the names of the rules which matched the interval under 'rules'.
+        :param lowered: The sentence lowercased by lower_keep_positions, if it is already at hand.
+        :return: list of datetime interval dictionaries
+        """
+        if self.prefilter is not None and not self.prefilter(sentence):
+            return []
+        if self.slow_log is not None and self.slow_log.sample():
+            return self._parse_datetime_logged(sentence, include_spans, include_rules, lowered)
 
-                    if valid_matches:
-                        all_date_parts = list(chain(*[m['date_parts'] for m in valid_matches]))
-
-                        if len(valid_matches) == 1:
-                            # Single match - use its exact span
-                            match = valid_matches[0]
-                            implicit_interval = {
-                                'start_date': all_date_parts,
-                                'end_date': all_date_parts,
-                                'match_text': match['match_text'],
-                                'match_start': part_offset + match['match_start'],
-                                'match_end': part_offset + match['match_end'],
-                                'spans': valid_matches
-                            }
-                        else:
-                            # Multiple matches - merge them
-                            min_start = min(m.get('match_start', 0) for m in valid_matches)
-                            max_end = max(m.get('match_end', 0) for m in valid_matches)
-
-                            implicit_interval = {
-                                'start_date': all_date_parts,
-                                'end_date': all_date_parts,
-                                'match_text': original_sentence[part_offset + min_start:part_offset + max_end],
-                                'match_start': part_offset + min_start,
-                                'match_end': part_offset + max_end,
-                                'spans': valid_matches
-                            }
-                        parsed_dates.append(implicit_interval)
-                else:
-                    parsed_dates += self._get_implicit_intervall(sentence_part)
+        return self._extract_intervals(sentence, include_spans, include_rules, lowered)
 
-        parsed_dates = [extend_start_end(intv) for intv in parsed_dates]
+    def _parse_datetime_logged(self, sentence: str, include_spans: bool, include_rules: bool,
+                               lowered: Optional[str] = None) -> List[Dict[str, datelike]]:
+        """Times the extraction and offers the input to the slow log."""
+        assert self.slow_log is not None
+        start = perf_counter()
+        try:
+            results = self._extract_intervals(sentence, include_spans, include_rules=True, lowered=lowered)
+        except Exception as e:
+            self.slow_log.add(sentence, perf_counter() - start, self.now, [], error=repr(e))
+            raise
+        self.slow_log.add(sentence, perf_counter() - start, self.now, results)
+
+        if not include_rules:
+            for result in results:
+                del result['rules']
+        return results
+
+    def _extract_intervals(self, sentence: str, include_spans: bool, include_rules: bool,
+                           lowered: Optional[str] = None) -> List[Dict[str, datelike]]:
+        # the profiler of the extractor, or the one active in the current context
+        profiler = self.profiler if self.profiler is not None else current_profiler()
+        if self.fast_path and profiler is None:
+            phrase = get_phrase_table(self.output_container, self.search_scope,
+                                      self.realistic_year_required).lookup(sentence, include_spans)
+            if phrase is not None:
+                return phrase.resolve(self.now, include_spans, include_rules)
+        if self.cache is not None and self.search_scope == SearchScopes.NOT_RESTRICTED and profiler is None:
+            compiled = self.cache.compiled(sentence, self.now, self.output_container, self.search_scope,
+                                           self.realistic_year_required, include_spans,
+                                           _rules_parser(self.output_container, self.search_scope,
+                                                         self.realistic_year_required, include_spans))
+            if compiled is not None:
+                return compiled.resolve(self.now, include_spans, include_rules)
+
+        original_sentence = sentence  # Keep original case for span extraction
+        # the lowercase sentence keeps the positions of the original one, the spans are valid in both
+        sentence = lower_keep_positions(sentence) if lowered is None else lowered
+
+        if include_spans:
+            parsed_dates = self._match_dateparts_with_spans(sentence, original_sentence, profiler)
+        else:
+            parsed_dates = self._match_dateparts(sentence, profiler)
+
+        def assemble(dateparts: Union[List, str], bottom: bool) -> datelike:
+            return timed(profiler, 'stage', 'assemble_datetime', self.assemble_datetime, self.now, dateparts, bottom)
 
         if include_spans:
             # Preserve span information in the final results
             final_results = []
             for parsed_date in parsed_dates:
-                result = {
-                    'start_date': self.assemble_datetime(self.now, parsed_date['start_date'], bottom=True),
-                    'end_date': self.assemble_datetime(self.now, parsed_date['end_date'], bottom=False)
+                result: Dict = {
+                    'start_date': assemble(parsed_date['start_date'], bottom=True),
+                    'end_date': assemble(parsed_date['end_date'], bottom=False)
                 }
                 # Add span information if available
                 if 'match_text' in parsed_date:
                     result['match_text'] = parsed_date['match_text']
                     result['match_start'] = parsed_date['match_start']
                     result['match_end'] = parsed_date['match_end']
+                if include_rules:
+                    result['rules'] = get_rules(parsed_date)
                 final_results.append(result)
             parsed_dates = final_results
         else:
-            parsed_dates = [{'start_date': self.assemble_datetime(self.now, parsed_date['start_date'], bottom=True),
-                             'end_date': self.assemble_datetime(self.now, parsed_date['end_date'], bottom=False)}
+            parsed_dates = [{'start_date': assemble(parsed_date['start_date'], bottom=True),
+                             'end_date': assemble(parsed_date['end_date'], bottom=False),
+                             **({'rules': get_rules(parsed_date)} if include_rules else {})}
                             for parsed_date in parsed_dates]
 
-        # remove results where
-        # - both start and end dates are None
-        # - or where the end date is smaller than the start
-        parsed_dates = [
-            intv for intv in parsed_dates if
-            (intv['start_date'] or intv['end_date']) and
-            is_smaller_date_or_none(intv['start_date'], intv['end_date'])
-        ]
-
-        return parsed_dates
+        return timed(profiler, 'stage', 'filter_intervals', filter_intervals, parsed_dates)
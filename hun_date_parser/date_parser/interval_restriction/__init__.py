@@ -1,4 +1,5 @@
 from hun_date_parser.date_parser.interval_restriction.restricted_parsing import extract_datetime_within_interval, \
-    ExtractWithinRangeSuccess
+    extract_datetime_within_intervals, ExtractWithinRangeSuccess, RestrictedQuery
 
-__all__ = ['extract_datetime_within_interval', 'ExtractWithinRangeSuccess']
+__all__ = ['extract_datetime_within_interval', 'extract_datetime_within_intervals', 'ExtractWithinRangeSuccess',
+           'RestrictedQuery']
@@ -3,17 +3,23 @@ This module (still WIP) implements extracting datetime intervals from pre-determ
 If extraction within the set interval is not successful, the extraction falls back to the text2datetime function
 """
 
+from bisect import bisect_left, bisect_right
 from datetime import datetime, date, time, timedelta
 from enum import Enum
-from typing import Dict, List, Union, Tuple
+from typing import Dict, List, Optional, Sequence, Union, Tuple
 from copy import deepcopy
 
-from hun_date_parser import text2datetime
+from hun_date_parser.date_parser.datetime_extractor import DatetimeExtractor
+from hun_date_parser.date_parser.parse_cache import ParseCache
+from hun_date_parser.date_parser.phrase_table import PROBE_NOWS, YEAR_TURN_NOWS, CompiledPhrase, compile_phrase
 from hun_date_parser.utils import remove_accent, SearchScopes
 from hun_date_parser.date_parser.time_parsers import _raw_match_time_words
 
 datelike = Union[datetime, date, time, None]
 
+# reference times the queries are compiled against, see phrase_table
+_PROBES = [*PROBE_NOWS, *YEAR_TURN_NOWS]
+
 
 def get_reversed_am_pm(dt: datetime):
     dt_ = deepcopy(dt)
@@ -50,12 +56,120 @@ def is_relative_datetime(query: str):
     return False
 
 
+def is_am_pm_ambiguous(query: str) -> bool:
+    """
+    Determines whether the query mentions an hour without a daypart, ie.: "három órakor" can be 3:00 or 15:00
+    """
+    parts = _raw_match_time_words(query)
+    if parts:
+        match_obj, daypart, hour_modifier, hour, minute, match_type = parts
+        if not daypart and hour:
+            return True
+
+    return False
+
+
+class RestrictedQuery:
+    """
+    Query text prepared for extraction within intervals. The properties of the text (relative time words, ambiguous
+    hours) are determined once and the query is parsed once per distinct reference time, every further interval or
+    fallback with the same reference time is only a lookup. With a ParseCache the parses are resolved from the cached
+    reference time independent form of the query.
+    """
+
+    def __init__(self, query_text: str, search_scope: SearchScopes = SearchScopes.NOT_RESTRICTED,
+                 cache: Optional[ParseCache] = None) -> None:
+        """
+        :param query_text: Text to extract datetime interval from
+        :param search_scope: Sets the desired time horizont of the search.
+        :param cache: ParseCache which stores the compiled parse of the query
+        """
+        self.query_text = query_text
+        self.search_scope = search_scope
+        self.cache = cache
+        self.relative = is_relative_datetime(query_text)
+        self.possible_am_pm_missmatch = is_am_pm_ambiguous(query_text)
+        self._parses: Dict[datetime, List[Dict[str, datelike]]] = {}
+
+    def parse(self, now: datetime) -> List[Dict[str, datelike]]:
+        """
+        :return: the intervals of the query at the reference time, same as text2datetime
+        """
+        if now not in self._parses:
+            extractor = DatetimeExtractor(now=now, search_scope=self.search_scope, cache=self.cache)
+            self._parses[now] = extractor.parse_datetime(self.query_text)
+        return [dict(r) for r in self._parses[now]]
+
+    def candidates(self, now: datetime) -> List[Dict[str, datelike]]:
+        """
+        :return: the intervals of the query at the reference time followed by their AM/PM reversed alternatives if
+        the hour of the query is ambiguous
+        """
+        return self._with_am_pm(self.parse(now))
+
+    def compile(self, extra_probes: Sequence[datetime] = ()) -> Optional[CompiledPhrase]:
+        """
+        Compiles the query into its reference time independent form (see phrase_table), only with the NOT_RESTRICTED
+        search scope, the restricted scopes switch between candidates at reference times the probes can't cover.
+        :param extra_probes: reference times the form is also checked against
+        :return: the compiled query, None if its results can't be expressed relative to the reference time
+        """
+        if self.search_scope != SearchScopes.NOT_RESTRICTED:
+            return None
+        return compile_phrase(self.query_text, lambda now, _: self.parse(now), 'datetime', [*_PROBES, *extra_probes])
+
+    def _with_am_pm(self, res: List[Dict[str, datelike]]) -> List[Dict[str, datelike]]:
+        if self.possible_am_pm_missmatch:
+            res += [{"start_date": get_reversed_am_pm(match["start_date"]),
+                     "end_date": get_reversed_am_pm(match["end_date"])}
+                    for match in res
+                    if isinstance(match["start_date"], datetime) and isinstance(match["end_date"], datetime)]
+        return res
+
+    def restrict(self, interval_start: datetime, interval_end: datetime,
+                 fallback_now: datetime) -> Tuple[ExtractWithinRangeSuccess, List[Dict[str, datelike]]]:
+        """
+        Extracts the datetime intervals of the query within a bounding interval, see
+        extract_datetime_within_interval.
+        """
+        return self._rank(self.candidates(interval_start), interval_start, interval_end, fallback_now)
+
+    def _rank(self, candidates: List[Dict[str, datelike]], interval_start: datetime, interval_end: datetime,
+              fallback_now: datetime) -> Tuple[ExtractWithinRangeSuccess, List[Dict[str, datelike]]]:
+        """Chooses the best response among the candidate intervals of the query at interval_start."""
+        restricted_date: List[Dict[str, datelike]] = []
+        response_candidates = [(5, ExtractWithinRangeSuccess.NO_MATCH_FALLBACK, restricted_date)]
+        for r in candidates:
+            if not (isinstance(r['start_date'], datetime) and isinstance(r['end_date'], datetime)):
+                response_candidates.append((4, ExtractWithinRangeSuccess.OPEN_RANGE_FALLBACK, []))
+                continue
+
+            if not (interval_start <= r['start_date'] and r['end_date'] <= interval_end):
+                # Extracted datetime is out of expected interval...
+                response_candidates.append((2, ExtractWithinRangeSuccess.OUT_OF_RANGE_FALLBACK, []))
+                continue
+
+            if self.relative:
+                # Datetime ranges relative to the current timestamp doesn't really make sense in this scenario...
+                response_candidates.append((3, ExtractWithinRangeSuccess.RELATIVE_TIME_WORD_FALLBACK, []))
+            else:
+                response_candidates.append((1, ExtractWithinRangeSuccess.VALID_IN_RANGE, [r]))
+
+        _, response_type, restricted_date = min(response_candidates, key=lambda x: x[0])
+        if response_type not in (ExtractWithinRangeSuccess.VALID_IN_RANGE, ExtractWithinRangeSuccess.NO_MATCH_FALLBACK):
+            # the fallbacks return the result of text2datetime with the pseudo-now
+            restricted_date = self.parse(fallback_now)
+
+        return response_type, restricted_date
+
+
 def extract_datetime_within_interval(interval_start: datetime,
                                      interval_end: datetime,
                                      query_text: str,
                                      search_scope: SearchScopes = SearchScopes.NOT_RESTRICTED,
-                                     fallback_now=datetime.now()) -> Tuple[ExtractWithinRangeSuccess,
-                                                                           List[Dict[str, datelike]]]:
+                                     fallback_now=datetime.now(),
+                                     cache: Optional[ParseCache] = None) -> Tuple[ExtractWithinRangeSuccess,
+                                                                                  List[Dict[str, datelike]]]:
     """
     Extracts datetime intervals from pre-determined datetime intervals.
     :param interval_start: Bounding interval start
@@ -64,70 +178,74 @@ def extract_datetime_within_interval(interval_start: datetime,
     :param search_scope: Sets the desired time horizont of the search.
     :param fallback_now: When interval restriction is unsuccessful (RELATIVE_TIME_WORD_FALLBACK, OUT_OF_RANGE_FALLBACK)
     the text2datetime function's result is returned, which can be supplied with a pseudo-now datetime
+    :param cache: ParseCache which stores the compiled parse of the query, the query is then resolved against
+    interval_start and fallback_now without matching the rules
     :return: success flag, restricted time interval
     """
+    return RestrictedQuery(query_text, search_scope, cache).restrict(interval_start, interval_end, fallback_now)
 
-    res = text2datetime(query_text,
-                        search_scope=search_scope,
-                        now=interval_start)
 
-    possible_am_pm_missmatch = False
-    parts = _raw_match_time_words(query_text)
-    if parts:
-        match_obj, daypart, hour_modifier, hour, minute, match_type = parts
-        if not daypart and hour:
-            possible_am_pm_missmatch = True
-
-    extend_res = []
-    if possible_am_pm_missmatch:
-        for match in res:
-            if isinstance(match["start_date"], datetime) and isinstance(match["end_date"], datetime):
-                extend_res.append({
-                        "start_date": get_reversed_am_pm(match["start_date"]),
-                        "end_date": get_reversed_am_pm(match["end_date"])
-                    })
-
-    res += extend_res
-
-    restricted_date: List[Dict[str, datelike]] = []
-    response_candidates = [(5, ExtractWithinRangeSuccess.NO_MATCH_FALLBACK, restricted_date)]
-    for r in res:
-        if not (isinstance(r['start_date'], datetime) and isinstance(r['end_date'], datetime)):
-            response_type = ExtractWithinRangeSuccess.OPEN_RANGE_FALLBACK
-            restricted_date = text2datetime(query_text,
-                                            search_scope=search_scope,
-                                            now=fallback_now)
-
-            response_candidates.append((4, response_type, restricted_date))
-            continue
-
-        assert isinstance(interval_start, datetime) and isinstance(r['start_date'], datetime)
-        assert isinstance(interval_end, datetime) and isinstance(r['end_date'], datetime)
-        if not (interval_start <= r['start_date'] and r['end_date'] <= interval_end):
-            # Extracted datetime is out of expected interval...
-            response_type = ExtractWithinRangeSuccess.OUT_OF_RANGE_FALLBACK
-            restricted_date = text2datetime(query_text,
-                                            search_scope=search_scope,
-                                            now=fallback_now)
-
-            response_candidates.append((2, response_type, restricted_date))
-            continue
-
-        if is_relative_datetime(query_text):
-            # Datetime ranges relative to the current timestamp doesn't really make sense in this scenario...
-            response_type = ExtractWithinRangeSuccess.RELATIVE_TIME_WORD_FALLBACK
-            restricted_date = text2datetime(query_text,
-                                            search_scope=search_scope,
-                                            now=fallback_now)
-
-            response_candidates.append((3, response_type, restricted_date))
-        else:
-            response_type = ExtractWithinRangeSuccess.VALID_IN_RANGE
-            restricted_date = [r]
-
-            response_candidates.append((1, response_type, restricted_date))
-
-    response_candidates_ranked = sorted(response_candidates, key=lambda x: x[0])
-    _, response_type, restricted_date = response_candidates_ranked[0]
-
-    return response_type, restricted_date
+def _containing(intervals: List[Tuple[datetime, datetime]], order: List[int], starts: List[datetime],
+                ends: Optional[List[datetime]], start: datetime, end: datetime) -> List[int]:
+    """
+    Indices of the bounding intervals which contain [start, end].
+    :param order: indices of the intervals sorted by their start
+    :param starts: sorted starts of the intervals
+    :param ends: ends of the intervals in the same order if they are sorted as well, None otherwise
+    """
+    last = bisect_right(starts, start)
+    if ends is None:
+        return [i for i in order[:last] if end <= intervals[i][1]]
+    return order[bisect_left(ends, end, 0, last):last]
+
+
+def extract_datetime_within_intervals(intervals: Sequence[Tuple[datetime, datetime]],
+                                      query_text: str,
+                                      search_scope: SearchScopes = SearchScopes.NOT_RESTRICTED,
+                                      fallback_now=datetime.now(),
+                                      cache: Optional[ParseCache] = None) -> List[Tuple[ExtractWithinRangeSuccess,
+                                                                                        List[Dict[str, datelike]]]]:
+    """
+    Same as calling extract_datetime_within_interval for every bounding interval, but the query is parsed once per
+    distinct interval start. If the query refers to the same datetimes at every probe reference time and at the first
+    and last interval start (absolute dates), it is only parsed at these and the intervals containing its datetimes
+    are found by binary search, so the cost per interval is a lookup.
+    :param intervals: (start, end) pairs of the bounding intervals, preferably sorted by start and end
+    :param query_text: Text to extract datetime interval from
+    :param search_scope: Sets the desired time horizont of the search.
+    :param fallback_now: pseudo-now of the fallback results, see extract_datetime_within_interval
+    :param cache: ParseCache which stores the compiled parse of the query
+    :return: success flag and restricted time interval for each bounding interval, in the order of the intervals
+    """
+    intervals = [(start, end) for start, end in intervals]
+    query = RestrictedQuery(query_text, search_scope, cache)
+    if not intervals:
+        return []
+
+    compiled = None
+    if len({start for start, _ in intervals}) > len(_PROBES):
+        compiled = query.compile([intervals[0][0], intervals[-1][0]])
+
+    # a form relative to the interval start only fits the rules at the probes, the query can resolve differently at
+    # other starts (e.g. 'az elmúlt hét' at the first days of January), so it is parsed at every start
+    if compiled is None or any(form is not None and form[0] != 'fixed'
+                               for start, end, _ in compiled.intervals for form in (start, end)):
+        return [query.restrict(start, end, fallback_now) for start, end in intervals]
+
+    # the candidates are the same for every interval, only the intervals containing one of them are ranked again
+    candidates = query._with_am_pm(compiled.resolve(intervals[0][0], False, False))
+    results = [query._rank(candidates, datetime.max, datetime.min, fallback_now)] * len(intervals)
+
+    order = sorted(range(len(intervals)), key=lambda i: intervals[i])
+    starts = [intervals[i][0] for i in order]
+    sorted_ends = [intervals[i][1] for i in order]
+    ends = sorted_ends if all(a <= b for a, b in zip(sorted_ends, sorted_ends[1:])) else None
+
+    matched = set()
+    for r in candidates:
+        if isinstance(r['start_date'], datetime) and isinstance(r['end_date'], datetime):
+            matched.update(_containing(intervals, order, starts, ends, r['start_date'], r['end_date']))
+    for i in matched:
+        results[i] = query._rank(candidates, *intervals[i], fallback_now)
+
+    return [(response_type, [dict(r) for r in restricted_date]) for response_type, restricted_date in results]
@@ -0,0 +1,230 @@
+"""
+Persistent parse cache shared by processes and runs, stored in an SQLite database (stdlib only).
+
+    cache = ParseCache('parses.sqlite')
+    extractor = DatetimeExtractor(now=now, cache=cache)
+    # or: parse_many(sentences, now=nows, cache=cache, workers=4)
+
+The cache stores the now-independent form of the parse of each text (the relative forms of phrase_table, compiled
+from the results of the rules at the probe reference times, at the first days of several years and at the first
+reference time the text is seen with), so a cached text is resolved against any reference time without matching the
+rules. Texts whose results can't be expressed relative to now at all of these are stored as such and parsed by the
+rules every time. Compiling a text costs a parse per probe, the cache pays off for texts seen again (in later runs or
+with other reference times).
+
+The database is opened in WAL mode, so any number of processes can read it while one of them writes. It is bounded to
+about max_entries texts (checked when it is opened and after every tenth of max_entries writes), the oldest
+written entries are evicted first. It is versioned by the package version and a hash of
+the rule sources, the entries of other versions are dropped when the cache is opened.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from hun_date_parser.date_parser.phrase_table import PROBE_NOWS, YEAR_TURN_NOWS, CompiledPhrase, compile_phrase
+from hun_date_parser.utils import SearchScopes
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS parses (
+    text TEXT NOT NULL,
+    config TEXT NOT NULL,
+    form TEXT,
+    PRIMARY KEY (text, config)
+);
+"""
+
+# the modules whose source defines the results of the rules
+_RULE_PACKAGES = ('date_parser', 'utils')
+
+CACHE_PROBE_NOWS = PROBE_NOWS + YEAR_TURN_NOWS
+
+
+def rules_fingerprint(probes: Sequence[datetime] = CACHE_PROBE_NOWS) -> str:
+    """
+    :return: hash of the package version, the rule sources and the probe reference times, the cache entries of other
+    fingerprints are invalid
+    """
+    import hun_date_parser
+
+    digest = hashlib.sha256(hun_date_parser.__version__.encode())
+    root = Path(hun_date_parser.__file__).parent
+    for package in _RULE_PACKAGES:
+        for path in sorted((root / package).glob('*.py')):
+            digest.update(path.name.encode())
+            digest.update(path.read_bytes())
+    digest.update(repr([now.isoformat() for now in probes]).encode())
+    return digest.hexdigest()
+
+
+class ParseCache:
+    """SQLite backed cache of compiled parses with a bounded in-memory layer, thread and process safe."""
+
+    def __init__(self, path: str, max_entries: int = 1_000_000, memory_entries: int = 10_000,
+                 probes: Sequence[datetime] = CACHE_PROBE_NOWS, timeout: float = 30.0) -> None:
+        """
+        :param path: path of the SQLite database, created if it doesn't exist
+        :param max_entries: maximum number of entries kept in the database
+        :param memory_entries: maximum number of entries kept in the memory of each process
+        :param probes: reference times the texts are parsed against when they are compiled, a text is only cached
+        if one form reproduces the rules at all of them
+        :param timeout: seconds to wait for the database lock of another process
+        """
+        if max_entries < 1:
+            raise ValueError(f'max_entries must be positive, got {max_entries}')
+
+        self.path = path
+        self.max_entries = max_entries
+        self.memory_entries = memory_entries
+        self.probes = list(probes)
+        self.timeout = timeout
+        self.fingerprint = rules_fingerprint(self.probes)
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self._init()
+
+    def _init(self) -> None:
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._memory: 'OrderedDict[Tuple[str, str], Optional[CompiledPhrase]]' = OrderedDict()
+        self._writes = 0
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # connections and the memory layer stay in their process
+        state = self.__dict__.copy()
+        for key in ('_lock', '_local', '_memory', '_writes'):
+            del state[key]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._init()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Connection of the current thread, opened again after a fork."""
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None and self._local.pid == os.getpid():
+            return connection
+
+        connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=NORMAL')
+        connection.executescript(_SCHEMA)
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            row = connection.execute("SELECT value FROM meta WHERE key = 'fingerprint'").fetchone()
+            if row is None or row[0] != self.fingerprint:
+                connection.execute('DELETE FROM parses')
+                connection.execute("INSERT OR REPLACE INTO meta VALUES ('fingerprint', ?)", (self.fingerprint,))
+            connection.execute('COMMIT')
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+
+        self._local.connection, self._local.pid = connection, os.getpid()
+        self.evict()
+        return connection
+
+    def _remember(self, key: Tuple[str, str], compiled: Optional[CompiledPhrase]) -> None:
+        with self._lock:
+            self._memory[key] = compiled
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def _get(self, key: Tuple[str, str], output_container: str) -> Tuple[bool, Optional[CompiledPhrase]]:
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return True, self._memory[key]
+
+        row = self._connection().execute('SELECT form FROM parses WHERE text = ? AND config = ?', key).fetchone()
+        if row is None:
+            return False, None
+        compiled = None if row[0] is None else CompiledPhrase.from_json(json.loads(row[0]), output_container)
+        self._remember(key, compiled)
+        return True, compiled
+
+    def _put(self, key: Tuple[str, str], compiled: Optional[CompiledPhrase]) -> None:
+        self._remember(key, compiled)
+        form = None if compiled is None else json.dumps(compiled.to_json(), ensure_ascii=False)
+        self._connection().execute('INSERT OR REPLACE INTO parses VALUES (?, ?, ?)', (*key, form))
+
+        with self._lock:
+            self._writes += 1
+            evict = self._writes % max(1, self.max_entries // 10) == 0
+        if evict:
+            self.evict()
+
+    def evict(self) -> None:
+        """Deletes the oldest written entries over max_entries."""
+        connection = self._connection()
+        excess = connection.execute('SELECT COUNT(*) FROM parses').fetchone()[0] - self.max_entries
+        if excess > 0:
+            connection.execute('DELETE FROM parses WHERE rowid IN (SELECT rowid FROM parses ORDER BY rowid LIMIT ?)',
+                               (excess,))
+
+    def compiled(self, text: str, now: datetime, output_container: str, search_scope: SearchScopes,
+                 realistic_year_required: bool, include_spans: bool,
+                 parse: Callable[[datetime, str], List[Dict[str, Any]]]) -> Optional[CompiledPhrase]:
+        """
+        Returns the compiled parse of a text, compiles and stores it if the text is not cached yet.
+        :param text: input sentence
+        :param now: reference time of the current parse, the compiled form is also checked against it
+        :param output_container: output container of the extractor
+        :param search_scope: search scope of the extractor
+        :param realistic_year_required: realistic_year_required setting of the extractor
+        :param include_spans: whether the parse includes the spans (the span and the plain paths of the extractor
+        are cached separately, their dates can differ)
+        :param parse: parses a sentence against a reference time with the rule names (and spans), without the cache
+        :return: the compiled parse, None if the text has to be parsed by the rules
+        """
+        key = (text, f'{output_container}|{search_scope.name}|{realistic_year_required}|{include_spans}')
+        try:
+            found, compiled = self._get(key, output_container)
+        except sqlite3.Error:
+            found, compiled = False, None
+            with self._lock:
+                self.errors += 1
+
+        if found:
+            with self._lock:
+                self.hits += 1
+            return compiled
+
+        with self._lock:
+            self.misses += 1
+        # the rules return naive datetimes for an aware now as well, the forms are fitted in naive time
+        compiled = compile_phrase(text, parse, output_container, [now.replace(tzinfo=None), *self.probes])
+        try:
+            self._put(key, compiled)
+        except sqlite3.Error:
+            with self._lock:
+                self.errors += 1
+        return compiled
+
+    def __len__(self) -> int:
+        return self._connection().execute('SELECT COUNT(*) FROM parses').fetchone()[0]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+        self._connection().execute('DELETE FROM parses')
+
+    def close(self) -> None:
+        """Closes the connection of the current thread."""
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'hits': self.hits, 'misses': self.misses, 'errors': self.errors}
@@ -13,6 +13,12 @@ R_TOLIG_YM = r"((?:\b\d{4}(?!\d)) ?(?:\bjan(?:\b|\.|u[aá]r){1}|\bfeb(?:\b|r\.|\
 R_TOLIG_M = r"((?:\bjan(?:\b|\.|u[aá]r){1}|\bfeb(?:\b|r\.|\.|ru[aá]r){1}|\bm[aá]r(?:\b|c\b|c\.|\.|cius){1}|\b[aá]pr(?:\b|\.|ilis){1}\b|m[aá]j(?:\b|\.|us){1}|\bj[uú]n(?:\b|\.|ius){1}|\bj[uú]l(?:\b|\.|ius){1}|\baug(?:\b|\.|usztus){1}|\bszept(?:\b|\.|ember){1}|\bokt(?:\b|\.|[oó]ber){1}|\bnov(?:\b|\.|ember){1}|\bdec(?:\b|\.|ember))) ?-( ?(?:\bjan(?:\b|\.|u[aá]r)|\bfeb(?:\b|r\.|\.|ru[aá]r)|\bm[aá]r(?:\b|c\b|c\.|\.|cius)|\b[aá]pr(?:\b|\.|ilis)|\bm[aá]j(?:\b|\.|us)|\bj[uú]n(?:\b|\.|ius)|\bj[uú]l(?:\b|\.|ius)|\baug(?:\b|\.|usztus)|\bszep(?:t\b|t\.|\b|\.|tember)|\bokt(?:\b|\.|[oó]ber)|\bnov(?:\b|\.|ember)|\bdec(?:\b|\.|ember)))"
 R_TOLIG_Y = r"(\b\d{4}(?!\d)) ?- ?(\b\d{4}(?!\d))"
 
+# interval markers collected in a single scan by match_interval_with_spans
+R_INTERVAL_MARKERS = r"(?=[t \-:igkKI])(?:(?P<tol>t[oóöő]l\b)|(?P<ota> [oó]ta\b)|(?P<ig>ig\b)|(?P<sep>-)|(?P<colon>:)|(?P<kezd>[kK]ezd|[iI]ndul))"
+R_INTERVAL_WORD_BREAK = r"[^:\w ]"
+R_TOL_DAYNUM = r"[1-9][0-9]?-(?:[aáeé]|j[eé])t[oóöő]l\b"
+R_IG_DAYNUM = r"[1-9][0-9]?-(?:[aáeé]|j[eé])ig\b"
+
 # hyper day level patterns
 R_ISO_DATE = r'(\b\d{4}(?!\d))(?:[-\\/\. ] ?(1[0-2]|0?[1-9]))?(?:[-\\/\. ] ?(1[0-9]|2[0-9]|3[01]|0?[1-9]))?'
 R_REV_ISO_DATE = r'\b(1[0-9]|2[0-9]|3[01]|0?[1-9])[-\\/\. ] ?(1[0-2]|0?[1-9])[-\\/\. ] ?(\b\d{4}(?!\d))'
@@ -58,6 +64,32 @@ R_HWORDS_ = r'([1-2]?[0-9])?h\b'
 R_HOUR_MIN = r'(?:(.*hajnal[i]?|.*reggel|.*d[eé]lel[oőö]tt|.*d[eé]lut[aá]n|.*este|.*[eé]jjel))? ?(?:(.*negyed|.*f[eé]l|.*h[aá]romnegyed))? ?(?:(?:\b([0-9]{1,2}|nulla|egy|kett[oöő]|h[aá]rom|n[eé]gy|[öo]t|hat|h[eé]t|nyolc|kilenc|t[ií]z|tizenegy|tizenkett[oő]|tizenh[aá]rom|tizenn[eé]gy|tizen[oö]t|tizenhat|tizenh[eé]t|tizennyolc|tizenkilenc|h[uú]sz|huszonegy|huszonkett[oöő]|huszonh[aá]rom)(?! [eé]v|perc)-?(?:kor|ra|\b)(?: [oó]ra)?)?((?:el[oő]tt|ut[aá]n)?.*perc)?)?'
 R_HOUR_MIN_REV = r'(?:(.*)(?:perc.{0,4}))?? (?:(hajnal[i]?|reggel|d[eé]lel[oőö]tt|d[eé]lut[aá]n|este|[eé]jjel))? ?(negyed|f[eé]l|h[aá]romnegyed)? ?(?:([0-9]{1,2}|nulla|egy|kett[oöő]|h[aá]rom|n[eé]gy|[öo]t|hat|h[eé]t|nyolc|kilenc|t[ií]z|tizenegy|tizenkett[oő]|tizenh[aá]rom|tizenn[eé]gy|tizen[oö]t|tizenhat|tizenh[eé]t|tizennyolc|tizenkilenc|h[uú]sz|huszonegy|huszonkett[oöő]|huszonh[aá]rom)(?! [eé]v|perc)-?(?:kor|ra|\b)(?: [oó]ra)?)? ?(ut[aá]n|el[oöő]tt)?'
 
+# building blocks of R_HOUR_MIN and R_HOUR_MIN_REV, used by the time expression scanner
+R_DAYPART = r'hajnal[i]?|reggel|d[eé]lel[oőö]tt|d[eé]lut[aá]n|este|[eé]jjel'
+R_HOUR_MODIFIER = r'negyed|f[eé]l|h[aá]romnegyed'
+R_CLOCK_HOUR = r'([0-9]{1,2}|nulla|egy|kett[oöő]|h[aá]rom|n[eé]gy|[öo]t|hat|h[eé]t|nyolc|kilenc|t[ií]z|tizenegy|tizenkett[oő]|tizenh[aá]rom|tizenn[eé]gy|tizen[oö]t|tizenhat|tizenh[eé]t|tizennyolc|tizenkilenc|h[uú]sz|huszonegy|huszonkett[oöő]|huszonh[aá]rom)(?! [eé]v|perc)-?(?:kor|ra|\b)(?: [oó]ra)?'
+R_BEFORE_AFTER = r'ut[aá]n|el[oöő]tt'
+R_TIME_KEYWORDS = r'(?=(?P<hajnal>hajnal)|(?P<reggel>reggel)|(?P<delelott>d[eé]lel[oőö]tt)|(?P<delutan>d[eé]lut[aá]n)|(?P<este>este)|(?P<ejjel>[eé]jjel)|(?P<negyed>negyed)|(?P<fel>f[eé]l)|(?P<perc>perc)|(?P<newline>\n))'  # zero width, keywords can overlap
+R_TEMPORAL_WORDS = r'\b(?:haromnegyed|delelo[to]*|delutan|hajnal[i]?|reggel|este|ejjel|negyed|fel|ora|kor|elott|utan|perc|ma|holnap|tegnap|hetfo|kedd|szerda|csutortok|pentek|szombat|vasarnap|januar|februar|marcius|aprilis|majus|junius|julius|augusztus|szeptember|oktober|november|december|\d+)\b'
+
+# Prefilter vocabulary, searched in the lowercase accent-free text: a superset of what the date, time and duration
+# rules need to match anything. A text may contain a temporal expression if it has a match of R_TEMPORAL_HINTS (e.g. a
+# digit), one of the words (as a substring, as most of the rules match them) or R_TEMPORAL_HINTS_AT_WORD_START at the
+# start of a word.
+R_TEMPORAL_HINTS = r'\d|maj(?:\b|\.|us)'
+TEMPORAL_HINT_WORDS = (
+    'holnap', 'tegnap', 'hetfo', 'kedd', 'szerda', 'csutortok', 'pentek', 'szombat', 'vasarnap',
+    'elozo het', 'mult het', 'multhet', 'ezen a het', 'ezen  het', 'jovo het', 'jovohet', 'honap',
+    'tavaly', 'iden', 'idei', 'ebben az ev', 'ettol az ev', 'erre az ev', 'mult ev', 'jovo ev', 'jovore', 'evvel',
+    'mulva', 'ezelott', 'korabb', 'elmult', 'eloz', 'elseje', 'dika', 'dike',
+    'hajnal', 'reggel', 'delel', 'delut', 'este', 'ejjel', 'negyed', 'ora', 'perc',
+    'fel nulla', 'fel egy', 'fel kett', 'fel harom', 'fel negy', 'fel ot', 'fel hat', 'fel het', 'fel nyolc',
+    'fel kilenc', 'fel tiz', 'fel husz',
+    'egykor', 'kettokor', 'haromkor', 'negykor', 'otkor', 'hatkor', 'hetkor', 'nyolckor', 'kilenckor', 'tizkor',
+    'napra', 'napig', 'napos', 'hetre', 'hetig', 'hetes', 'eves', 'evre', 'ameddig', 'amig', 'max', 'hosszan',
+)
+R_TEMPORAL_HINTS_AT_WORD_START = r'ma(?:i|tol|ra)?\b|most\b|(?:jan|feb|mar|apr|jun|jul|aug|szept|okt|nov|dec)'
+
 # R_MIN = r'(.*)(?:perc)'
 # R_SEC = r'(.*)(?: ?m[áa]sodperc| ?mp)'
 
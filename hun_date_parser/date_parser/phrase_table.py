@@ -0,0 +1,239 @@
+"""
+Fast path for the most frequent temporal phrases ("holnap", "ma este", "jövő héten", ...).
+
+A sentence which is exactly one of FAST_PATH_PHRASES is resolved from a precompiled relative form instead of going
+through every rule. The forms are not written by hand: when a table is built (once per output container, search scope
+and realistic_year_required setting), every phrase is parsed by the rules against a set of probe reference times and
+each end of its intervals is expressed as an anchor derived from now (the day, the week, the month, ...) plus a
+constant offset. A phrase is only put in the table if its form reproduces the rules for every probe, so the fast path
+can't drift from the rules.
+"""
+
+from datetime import date, datetime, time, timedelta
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+FAST_PATH_PHRASES = ('ma', 'holnap', 'holnapután', 'tegnap', 'most', 'jövő héten', 'ma este', 'holnap reggel',
+                     'hétfőn', 'jövő hónapban')
+
+# every weekday, month and year ends, leap days, both halves of several years, times of day with and without seconds
+PROBE_NOWS = [
+    datetime(2021, 3, 10, 14, 25, 37, 123456),
+    datetime(2021, 3, 31, 23, 59, 59),
+    datetime(2024, 2, 29, 0, 0),
+    datetime(2023, 2, 28, 5, 7, 9),
+    datetime(2020, 12, 31, 12, 0, 30),
+    datetime(2021, 1, 1, 0, 0, 1),
+    datetime(2022, 5, 14, 9, 30),
+    datetime(2022, 5, 15, 18, 45, 10),
+    datetime(2022, 5, 16, 21, 3),
+    datetime(2019, 7, 2, 3, 33, 33),
+    datetime(2019, 9, 30, 11, 59, 59, 999999),
+    datetime(2022, 1, 15, 8, 10),
+    datetime(2018, 6, 20, 16, 40, 5),
+]
+
+# the first days of January after every weekday of January 1st: the rules combine the last seven days and the calendar
+# week of a phrase like 'az elmúlt hét' only while both are in the same year, which the probes above can't show, so
+# the forms kept by the parse cache are fitted over these as well
+YEAR_TURN_NOWS = [datetime(year, 1, day, 7, 47, 42) for year in (2015, 2016, 2017, 2018, 2019, 2020, 2022)
+                  for day in range(4, 11)]
+
+SPAN_KEYS = ('match_text', 'match_start', 'match_end')
+
+
+def _add_months(dt: datetime, months: int) -> datetime:
+    """Shifts a datetime on the first day of a month by the given number of months."""
+    years, month = divmod(dt.month - 1 + months, 12)
+    return dt.replace(year=dt.year + years, month=month + 1)
+
+
+def _anchor(now: datetime, kind: str) -> datetime:
+    if kind == 'fixed':
+        return datetime.min
+    # the rules ignore the time zone of now and return naive datetimes
+    now = now.replace(tzinfo=None)
+    day = datetime.combine(now.date(), time())
+    if kind == 'now':
+        return now
+    if kind == 'minute':
+        return now.replace(second=0, microsecond=0)
+    if kind == 'hour':
+        return now.replace(minute=0, second=0, microsecond=0)
+    if kind == 'day':
+        return day
+    if kind == 'week':
+        return day - timedelta(days=now.weekday())
+    if kind == 'month':
+        return day.replace(day=1)
+    return day.replace(month=1, day=1)
+
+
+# tried in this order, the first one which fits every probe is used
+ANCHORS = ('fixed', 'day', 'week', 'month', 'year', 'hour', 'minute', 'now')
+
+# anchor kind, months added to the anchor, offset added after the months
+Form = Tuple[str, int, timedelta]
+
+
+def _resolve(form: Optional[Form], now: datetime) -> Optional[datetime]:
+    if form is None:
+        return None
+    kind, months, offset = form
+    anchor = _anchor(now, kind)
+    return (_add_months(anchor, months) if months else anchor) + offset
+
+
+def _fit(values: Sequence[Optional[datetime]], nows: Sequence[datetime]) -> Tuple[bool, Optional[Form]]:
+    """
+    Finds the relative form of the values of one interval end at the probe reference times.
+    :return: whether a form was found, and the form (None if the end is always None)
+    """
+    if all(value is None for value in values):
+        return True, None
+    if any(value is None for value in values):
+        return False, None
+
+    first, now = values[0], nows[0]
+    assert first is not None
+    for kind in ANCHORS:
+        anchor = _anchor(now, kind)
+        month_candidates = [0]
+        if kind in ('month', 'year'):
+            months = (first.year - anchor.year) * 12 + first.month - anchor.month
+            if kind == 'year':
+                months -= months % 12
+            step = 1 if kind == 'month' else 12
+            month_candidates = [months, months + step]
+        for months in month_candidates:
+            form = (kind, months, first - (_add_months(anchor, months) if months else anchor))
+            if all(_resolve(form, n) == value for n, value in zip(nows, values)):
+                return True, form
+    return False, None
+
+
+def _to_datetime(value: Any, now: datetime) -> Optional[datetime]:
+    if value is None or isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime.combine(value, time())
+    return datetime.combine(now.date(), value)
+
+
+def _from_datetime(value: Optional[datetime], output_container: str) -> Any:
+    if value is None or output_container == 'datetime':
+        return value
+    if output_container == 'date':
+        return value.date()
+    return value.time()
+
+
+class CompiledPhrase:
+    """The intervals of a phrase as relative forms, with the constant span and rule information."""
+
+    def __init__(self, intervals: List[Tuple[Optional[Form], Optional[Form], Dict[str, Any]]],
+                 output_container: str) -> None:
+        self.intervals = intervals
+        self.output_container = output_container
+
+    def resolve(self, now: datetime, include_spans: bool, include_rules: bool) -> List[Dict[str, Any]]:
+        """
+        :return: the intervals of the phrase in the format of DatetimeExtractor._parse_datetime
+        """
+        results = []
+        for start, end, extra in self.intervals:
+            result = {'start_date': _from_datetime(_resolve(start, now), self.output_container),
+                      'end_date': _from_datetime(_resolve(end, now), self.output_container)}
+            for key, value in extra.items():
+                if key == 'rules':
+                    if include_rules:
+                        result[key] = list(value)
+                elif include_spans:
+                    result[key] = value
+            results.append(result)
+        return results
+
+    def to_json(self) -> List[List[Any]]:
+        """
+        :return: JSON serializable form of the intervals, offsets in microseconds
+        """
+        rows = []
+        for start, end, extra in self.intervals:
+            row: List[Any] = [None if form is None else [form[0], form[1], form[2] // timedelta(microseconds=1)]
+                              for form in (start, end)]
+            rows.append(row + [extra])
+        return rows
+
+    @classmethod
+    def from_json(cls, intervals: List[List[Any]], output_container: str) -> 'CompiledPhrase':
+        def form(value: Optional[List[Any]]) -> Optional[Form]:
+            return None if value is None else (value[0], value[1], timedelta(microseconds=value[2]))
+
+        return cls([(form(start), form(end), extra) for start, end, extra in intervals], output_container)
+
+
+def compile_phrase(phrase: str, parse: Callable[[datetime, str], List[Dict[str, Any]]], output_container: str,
+                   probes: Sequence[datetime] = PROBE_NOWS) -> Optional[CompiledPhrase]:
+    """
+    Compiles a phrase from the results of the rules at the probe reference times.
+    :param phrase: lowercase phrase
+    :param parse: parses a sentence against a reference time with spans and rules
+    :param output_container: output container of parse
+    :param probes: reference times the phrase is parsed against
+    :return: the compiled phrase, None if its results can't be expressed relative to now
+    """
+    try:
+        results = [parse(now, phrase) for now in probes]
+    except Exception:
+        return None
+    if len({len(result) for result in results}) != 1:
+        return None
+
+    intervals = []
+    for i in range(len(results[0])):
+        extras = [{key: value for key, value in result[i].items() if key not in ('start_date', 'end_date')}
+                  for result in results]
+        if any(extra != extras[0] for extra in extras):
+            return None
+        forms = []
+        for key in ('start_date', 'end_date'):
+            try:
+                found, form = _fit([_to_datetime(result[i][key], now) for result, now in zip(results, probes)],
+                                   probes)
+            except (TypeError, ValueError, OverflowError):
+                return None
+            if not found:
+                return None
+            forms.append(form)
+        intervals.append((forms[0], forms[1], extras[0]))
+
+    return CompiledPhrase(intervals, output_container)
+
+
+class PhraseTable:
+    """Compiled phrases of one extractor configuration, keyed by the lowercase phrase."""
+
+    def __init__(self, parse: Callable[[datetime, str], List[Dict[str, Any]]], output_container: str,
+                 phrases: Sequence[str] = FAST_PATH_PHRASES, probes: Sequence[datetime] = PROBE_NOWS) -> None:
+        """
+        :param parse: parses a sentence against a reference time with spans and rules, without the fast path
+        :param output_container: output container of parse
+        :param phrases: phrases to compile, the ones which can't be compiled are left out
+        :param probes: reference times the phrases are parsed against
+        """
+        self.phrases: Dict[str, CompiledPhrase] = {}
+        for phrase in phrases:
+            compiled = compile_phrase(phrase, parse, output_container, probes)
+            if compiled is not None:
+                self.phrases[phrase] = compiled
+
+    def lookup(self, sentence: str, include_spans: bool) -> Optional[CompiledPhrase]:
+        """
+        :param sentence: input sentence
+        :param include_spans: the span texts are taken from the lowercase phrase, so with spans only lowercase
+        sentences are looked up
+        :return: the compiled phrase of the sentence, None if it is not in the table
+        """
+        phrase = sentence.lower()
+        if include_spans and phrase != sentence:
+            return None
+        return self.phrases.get(phrase)
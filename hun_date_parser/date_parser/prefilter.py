@@ -0,0 +1,99 @@
+"""
+Cheap check of whether a text can contain a temporal expression at all, to skip the full parse of the inputs which
+can't (most of the messages of a typical production stream).
+
+    extractor = DatetimeExtractor(now=now, prefilter=True)
+    ...
+    default_prefilter.reject_rate
+
+The check never rejects a text the parser would extract anything (datetime, duration or frequency) from: it searches
+the lowercase accent-free text for a digit or one of the keywords the rules are built on (the prefilter vocabulary of
+patterns.py and the frequency patterns).
+"""
+
+import re
+import threading
+from typing import Any, Dict, Iterable, Optional
+
+from hun_date_parser.date_parser.patterns import (R_TEMPORAL_HINTS, TEMPORAL_HINT_WORDS,
+                                                  R_TEMPORAL_HINTS_AT_WORD_START)
+from hun_date_parser.frequency_parser.frequency_parsers import FREQUENCY_PATTERNS
+from hun_date_parser.utils import lower_keep_positions, remove_accent
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """
+    Regular expression matching any of the words, factored by their common prefixes, so that the regex engine tries
+    only a few alternatives at each position of the text.
+    """
+    trie: Dict[str, Any] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def pattern(node: Dict[str, Any]) -> str:
+        if '' in node:  # a shorter word ends here, its continuations don't matter
+            return ''
+        alternatives = [re.escape(char) + pattern(child) for char, child in sorted(node.items())]
+        return alternatives[0] if len(alternatives) == 1 else '(?:' + '|'.join(alternatives) + ')'
+
+    return pattern(trie)
+
+
+# the frequency patterns all start at a word boundary, they share a single one
+_AT_WORD_START = [R_TEMPORAL_HINTS_AT_WORD_START, *(p[len(r'\b'):] for p in FREQUENCY_PATTERNS)]
+assert all(p.startswith(r'\b') for p in FREQUENCY_PATTERNS)
+
+# searched one after the other, which is faster than a single alternation of the three
+_HINTS = [re.compile(R_TEMPORAL_HINTS), re.compile(_trie_pattern(TEMPORAL_HINT_WORDS)),
+          re.compile(r'\b(?:' + '|'.join(_AT_WORD_START) + ')')]
+
+
+def has_temporal_expression(text: str, folded: Optional[str] = None) -> bool:
+    """
+    :param text: input text
+    :param folded: the text lowercased by lower_keep_positions and accent folded, if it is already at hand
+    :return: False if the text surely contains no temporal expression, True if it may contain one
+    """
+    if folded is None:
+        folded = remove_accent(lower_keep_positions(text))
+    return any(hints.search(folded) is not None for hints in _HINTS)
+
+
+class Prefilter:
+    """has_temporal_expression which counts the checked and the rejected texts, thread-safe."""
+
+    def __init__(self) -> None:
+        self.checked = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, text: str) -> bool:
+        """
+        :return: True if the text has to be parsed
+        """
+        passed = has_temporal_expression(text)
+        with self._lock:
+            self.checked += 1
+            if not passed:
+                self.rejected += 1
+        return passed
+
+    @property
+    def reject_rate(self) -> float:
+        """Fraction of the checked texts which were rejected."""
+        return self.rejected / self.checked if self.checked else 0.0
+
+    def reset(self) -> None:
+        with self._lock:
+            self.checked = 0
+            self.rejected = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'checked': self.checked, 'rejected': self.rejected, 'reject_rate': self.reject_rate}
+
+
+# used by the prefilter=True mode of the extractors and the batch functions
+default_prefilter = Prefilter()
@@ -0,0 +1,123 @@
+"""
+Per stage and per rule profiling of DatetimeExtractor.
+
+    profiler = Profiler()
+    with profiler:
+        text2datetime('holnap reggel 8-kor')
+    # or: DatetimeExtractor(now, profiler=profiler).parse_datetime('holnap reggel 8-kor')
+    print(profiler.report())
+
+The extractor calls its pipeline stages and its rules through timed() with the profiler of the parse: the one passed
+to it, or else the one active in the current context (threads and asyncio tasks without an active profiler are not
+profiled). Without a profiler the stages and rules are called directly.
+"""
+
+import threading
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, asdict
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional
+
+STAGES = (
+    'match_multi_match', 'match_interval', 'match_duration_match', 'match_rules', 'match_duration_rules',
+    'extend_start_end', 'assemble_datetime', 'filter_intervals',
+)
+RULES = (
+    'match_named_month', 'match_iso_date', 'match_relative_day', 'match_weekday', 'match_week', 'match_named_year',
+    'match_digi_clock', 'match_hwords', 'match_time_words', 'match_now', 'match_n_periods_compared_to_now',
+    'match_relative_month', 'match_in_past_n_periods', 'match_named_month_interval',
+    'match_named_month_start_mid_end', 'match_day_of_month', 'match_date_offset',
+)
+
+_active: ContextVar[Optional['Profiler']] = ContextVar('hun_date_parser_profiler', default=None)
+
+
+@dataclass
+class StageStats:
+    """Timings of one stage or rule, a call is a hit if it returned a non-empty result."""
+    calls: int = 0
+    hits: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+    def add(self, elapsed: float, hit: bool) -> None:
+        self.calls += 1
+        self.hits += hit
+        self.total += elapsed
+        if elapsed > self.max:
+            self.max = elapsed
+
+
+class Profiler:
+    """Collects call counts, hit counts, total and maximum time (in seconds) per pipeline stage and per rule."""
+
+    def __init__(self) -> None:
+        self.stages: Dict[str, StageStats] = {}
+        self.rules: Dict[str, StageStats] = {}
+        self._lock = threading.Lock()
+        self._tokens: List[Token] = []
+
+    def record(self, kind: str, name: str, elapsed: float, hit: bool) -> None:
+        table = self.stages if kind == 'stage' else self.rules
+        with self._lock:
+            if name not in table:
+                table[name] = StageStats()
+            table[name].add(elapsed, hit)
+
+    def call(self, kind: str, name: str, func: Callable, *args: Any) -> Any:
+        """Calls func with args and records the call as the stage or rule name."""
+        result = None
+        start = perf_counter()
+        try:
+            result = func(*args)
+            return result
+        finally:
+            self.record(kind, name, perf_counter() - start, bool(result))
+
+    def reset(self) -> None:
+        with self._lock:
+            self.stages.clear()
+            self.rules.clear()
+
+    def is_active(self) -> bool:
+        """True if this profiler records the calls of the current context."""
+        return _active.get() is self
+
+    def __enter__(self) -> 'Profiler':
+        self._tokens.append(_active.set(self))
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        _active.reset(self._tokens.pop())
+
+    def to_dict(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        :return: dictionary with the 'stages' and 'rules' statistics by name, times are in seconds
+        """
+        with self._lock:
+            return {'stages': {name: asdict(stats) for name, stats in self.stages.items()},
+                    'rules': {name: asdict(stats) for name, stats in self.rules.items()}}
+
+    def report(self) -> str:
+        """
+        :return: flat text table of the statistics, the stages and rules ordered by their total time
+        """
+        lines = [f'{"kind":<6}{"name":<34}{"calls":>8}{"hits":>8}{"total ms":>11}{"mean us":>10}{"max us":>10}']
+        for kind, table in self.to_dict().items():
+            for name, stats in sorted(table.items(), key=lambda item: -item[1]['total']):
+                mean = stats['total'] / stats['calls'] if stats['calls'] else 0.0
+                lines.append(f'{kind[:-1]:<6}{name:<34}{stats["calls"]:>8}{stats["hits"]:>8}'
+                             f'{stats["total"] * 1e3:>11.3f}{mean * 1e6:>10.1f}{stats["max"] * 1e6:>10.1f}')
+        return '\n'.join(lines)
+
+
+def current_profiler() -> Optional[Profiler]:
+    """The profiler which records the calls of the current context, None if there is none."""
+    return _active.get()
+
+
+def timed(profiler: Optional[Profiler], kind: str, name: str, func: Callable, *args: Any) -> Any:
+    """Calls func with args, recorded as the stage or rule name if there is a profiler."""
+    if profiler is None:
+        return func(*args)
+    return profiler.call(kind, name, func, *args)
@@ -0,0 +1,141 @@
+"""
+Opt-in log of the slowest inputs, for finding the texts which hit pathological paths of the rules.
+
+    slow_log = SlowLog(size=50, threshold=0.005, sample_rate=0.1)
+    extractor = DatetimeExtractor(now=now, slow_log=slow_log)
+    ...
+    slow_log.dump('slow_inputs.json')
+
+Only the sampled parses are timed, an entry is kept if the parse took at least threshold seconds and it is among the
+size slowest ones seen so far (each text is kept once, with its slowest parse).
+"""
+
+import heapq
+import json
+import random
+import threading
+from datetime import date, datetime, time
+from typing import Any, Dict, IO, List, Optional, Tuple, Union
+
+
+def _json_value(value: Any) -> Any:
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    return value
+
+
+class SlowLog:
+    """Thread-safe bounded collection of the slowest parsed inputs."""
+
+    def __init__(self, size: int = 100, threshold: float = 0.0, sample_rate: float = 1.0,
+                 seed: Optional[int] = None) -> None:
+        """
+        :param size: maximum number of entries kept
+        :param threshold: minimum parse time in seconds for an input to be kept
+        :param sample_rate: fraction of the parses which are timed, between 0 and 1
+        :param seed: seed of the sampling
+        """
+        if size < 1:
+            raise ValueError(f'size must be positive, got {size}')
+        if not 0 <= sample_rate <= 1:
+            raise ValueError(f'sample_rate must be between 0 and 1, got {sample_rate}')
+
+        self.size = size
+        self.threshold = threshold
+        self.sample_rate = sample_rate
+        self.seen = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        # min-heap of (elapsed, sequence number, text), the entries by text
+        self._heap: List[Tuple[float, int, str]] = []
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._counter = 0
+
+    def sample(self) -> bool:
+        """Decides whether the next parse is timed."""
+        if self.sample_rate >= 1:
+            return True
+        with self._lock:
+            return self._random.random() < self.sample_rate
+
+    def add(self, text: str, elapsed: float, now: Optional[datetime], intervals: List[Dict[str, Any]],
+            error: Optional[str] = None) -> bool:
+        """
+        Offers a timed parse to the log.
+        :param text: the input text
+        :param elapsed: parse time in seconds
+        :param now: reference time of the parse
+        :param intervals: the extracted intervals, with the names of the rules which fired under 'rules'
+        :param error: representation of the exception raised by the parse, if any
+        :return: True if the input was kept
+        """
+        with self._lock:
+            self.seen += 1
+            if elapsed < self.threshold:
+                return False
+            if len(self._heap) >= self.size and elapsed <= self._heap[0][0] and text not in self._entries:
+                return False
+
+            previous = self._entries.get(text)
+            if previous is not None and previous['elapsed'] >= elapsed:
+                return False
+
+            rules: List[str] = []
+            for interval in intervals:
+                rules += [rule for rule in interval.get('rules', []) if rule not in rules]
+            entry = {
+                'text': text,
+                'elapsed': elapsed,
+                'now': _json_value(now),
+                'rules': rules,
+                'intervals': [{key: _json_value(value) for key, value in interval.items() if key != 'rules'}
+                              for interval in intervals],
+                'error': error,
+                'logged_at': datetime.now().isoformat(timespec='seconds'),
+            }
+
+            self._counter += 1
+            if previous is not None:
+                self._heap = [item for item in self._heap if item[2] != text]
+                heapq.heapify(self._heap)
+            elif len(self._heap) >= self.size:
+                _, _, evicted = heapq.heappop(self._heap)
+                del self._entries[evicted]
+            heapq.heappush(self._heap, (elapsed, self._counter, text))
+            self._entries[text] = entry
+            return True
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """
+        :return: the kept entries, slowest first
+        """
+        with self._lock:
+            return [dict(self._entries[text]) for _, _, text in sorted(self._heap, reverse=True)]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._heap.clear()
+            self._entries.clear()
+            self.seen = 0
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        :return: JSON serializable dictionary with the settings, the number of timed parses and the entries
+        """
+        entries = self.entries()
+        return {'size': self.size, 'threshold': self.threshold, 'sample_rate': self.sample_rate, 'seen': self.seen,
+                'entries': entries}
+
+    def dump(self, fp: Union[str, IO[str]]) -> None:
+        """
+        Writes the log as JSON.
+        :param fp: file path or text file object
+        """
+        if isinstance(fp, str):
+            with open(fp, 'w', encoding='utf-8') as f:
+                json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+        else:
+            json.dump(self.to_dict(), fp, ensure_ascii=False, indent=2)
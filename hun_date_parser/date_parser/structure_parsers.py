@@ -1,9 +1,10 @@
 import re
 
-from typing import Dict, List
+from typing import Any, Dict, List, Match, Optional, Pattern, Tuple
 
-from .patterns import (R_MULTI, R_TOLIG, R_TOL, R_IG, R_NAPRA_TOL, R_TOL_NAPRA, R_TOLIG_IMPLIED_END,
-                       R_START_STATED_END_IMPLIED, R_TOLIG_Y, R_TOLIG_YMD, R_TOLIG_MD, R_TOLIG_YM, R_TOLIG_M)
+from .patterns import (R_MULTI, R_NAPRA_TOL, R_TOL_NAPRA, R_TOLIG_IMPLIED_END, R_START_STATED_END_IMPLIED,
+                       R_TOLIG_Y, R_TOLIG_YMD, R_TOLIG_MD, R_TOLIG_YM, R_TOLIG_M, R_INTERVAL_MARKERS,
+                       R_INTERVAL_WORD_BREAK, R_TOL_DAYNUM, R_IG_DAYNUM)
 
 
 def match_multi_match(s: str):
@@ -25,67 +26,150 @@ def match_multi_match(s: str):
     return [s]
 
 
-def match_interval(s: str) -> Dict:
-    # If any of these are matched,
-    # shouldn't count the input as having multiple matches which need to be parsed separately
-    excluding_matches = [
-        re.findall(R_TOLIG_IMPLIED_END, s)
-    ]
+_MARKERS = re.compile(R_INTERVAL_MARKERS)
+_WORD_BREAK = re.compile(R_INTERVAL_WORD_BREAK)
+_TOL_DAYNUM = re.compile(R_TOL_DAYNUM)
+_IG_DAYNUM = re.compile(R_IG_DAYNUM)
+_TOLIG_IMPLIED_END = re.compile(R_TOLIG_IMPLIED_END)
+_START_STATED_END_IMPLIED = re.compile(R_START_STATED_END_IMPLIED)
+# hyphen separated intervals, in the order of precedence, split by what the input has to start with
+_TOLIG_YEAR_FIRST = [re.compile(r) for r in (R_TOLIG_YMD, R_TOLIG_YM, R_TOLIG_Y)]
+_TOLIG_MONTH_FIRST = [re.compile(r) for r in (R_TOLIG_MD, R_TOLIG_M)]
+_MONTH_INITIALS = 'jfmaáosnd'
+
+
+def _stripped_span(s: str, start: int, end: int) -> Tuple[str, int]:
+    """Returns the whitespace-stripped s[start:end] along with its offset in s."""
+    part = s[start:end]
+    stripped = part.strip()
+    return stripped, start + len(part) - len(part.lstrip()) if stripped else start
+
+
+def _interval(s: str, start: Optional[Tuple[int, int]], end: Optional[Tuple[int, int]]) -> Dict:
+    res: Dict[str, Any] = {}
+    for key, span in (('start', start), ('end', end)):
+        if span is None:
+            res[f'{key}_date'], res[f'{key}_offset'] = 'OPEN', None
+        else:
+            res[f'{key}_date'], res[f'{key}_offset'] = _stripped_span(s, *span)
+
+    return res
+
+
+def _match_groups(match: Optional[Match]) -> Optional[List[Tuple[int, int]]]:
+    """Returns the spans of the non-empty groups of a match, the way the regex based cascade filtered them."""
+    if not match:
+        return None
+
+    return [match.span(i + 1) for i, g in enumerate(match.groups()) if g]
+
+
+def match_interval_with_spans(s: str) -> Dict:
+    """
+    Detects explicit intervals (holnap**tól** jövő kedd**ig**, 2020-2022, kezdés: X : Y) in the input.
+    The interval markers are collected in a single scan, the costly month grammars of R_TOLIG_* are only
+    attempted when the scan found a hyphen separator and the input starts like a date. The precedence is
+    the same as the one of the R_TOLIG_IMPLIED_END, R_START_STATED_END_IMPLIED, R_TOLIG, R_TOLIG_YMD,
+    R_TOLIG_YM, R_TOLIG_MD, R_TOLIG_Y, R_TOLIG_M, R_TOL, R_IG cascade.
+    :param s: textual input
+    :return: dictionary with the start and end substrings (or 'OPEN') and their offsets in the input,
+    empty dictionary if no interval is found
+    """
+    line_end = s.find('\n')
+    line_end = len(s) if line_end == -1 else line_end
+
+    tol: List[Tuple[int, int]] = []
+    ota: List[Tuple[int, int]] = []
+    ig: List[Tuple[int, int]] = []
+    has_sep, n_colons, kezd_first = False, 0, False
+    for marker in _MARKERS.finditer(s):
+        kind = marker.lastgroup
+        if kind == 'tol':
+            tol.append(marker.span())
+        elif kind == 'ota':
+            ota.append(marker.span())
+        elif kind == 'ig':
+            ig.append(marker.span())
+        elif kind == 'sep':
+            has_sep = has_sep or marker.start() < line_end
+        elif kind == 'colon':
+            n_colons += 1
+        elif marker.start() == 0:
+            kezd_first = True
+
+    # március 20-tól 22-ig: handled by a dedicated date rule
+    if '-ig' in s and any(f'-t{vowel}l' in s for vowel in 'oóöő') and _TOLIG_IMPLIED_END.search(s):
+        return {}
 
-    if any(excluding_matches):
+    if kezd_first and n_colons >= 2:
+        groups = _match_groups(_START_STATED_END_IMPLIED.match(s))
+        if groups and len(groups) == 2:
+            return _interval(s, groups[0], groups[1])
+
+    # R_TOLIG: the last -tól (or óta) of the first line which is followed by an -ig, up until the last -ig
+    ig_in_line = [span for span in ig if span[1] <= line_end]
+    if ig_in_line:
+        last_ig_start, last_ig_end = ig_in_line[-1]
+        for markers in (tol, ota):
+            starts = [end for _, end in markers if end <= last_ig_start]
+            if starts:
+                return _interval(s, (0, starts[-1]), (starts[-1], last_ig_end))
+
+    if has_sep:
+        candidates: List[Pattern] = []
+        if s[:1].isdigit():
+            candidates = _TOLIG_YEAR_FIRST
+        elif s[:1] in _MONTH_INITIALS:
+            candidates = _TOLIG_MONTH_FIRST
+
+        for regex in candidates:
+            groups = _match_groups(regex.match(s))
+            if groups and len(groups) == 2:
+                return _interval(s, groups[0], groups[1])
+
+    if not (tol or ota or ig or has_sep):
         return {}
 
-    match = re.match(R_START_STATED_END_IMPLIED, s)
-    if match:
-        groups = match.groups()
-        groups = [m.lstrip().rstrip() for m in groups if m]
-
-        if len(groups) == 2:
-            return {
-                'start_date': groups[0],
-                'end_date': groups[1]
-            }
-
-    for regex in [R_TOLIG,
-                  R_TOLIG_YMD,
-                  R_TOLIG_YM,
-                  R_TOLIG_MD,
-                  R_TOLIG_Y,
-                  R_TOLIG_M]:
-        match = re.match(regex, s)
-        if match:
-            groups = match.groups()
-            groups = [m.lstrip().rstrip() for m in groups if m]
-
-            if len(groups) == 2:
-                return {
-                    'start_date': groups[0],
-                    'end_date': groups[1]
-                }
-
-    match = re.match(R_TOL, s)
-    if match:
-        groups = match.groups()
-        groups = [m.lstrip().rstrip() for m in groups if m]
+    # R_TOL and R_IG: a word-only prefix ending with the last -tól/-ig, or a day number with suffix
+    word_break = _WORD_BREAK.search(s)
+    prefix_end = word_break.start() if word_break else len(s)
+
+    def last_in_prefix(markers: List[Tuple[int, int]]) -> Optional[int]:
+        ends = [end for start, end in markers
+                if start < prefix_end or (start == prefix_end + 1 and s[prefix_end] == '-')]
+        return ends[-1] if ends else None
+
+    end = last_in_prefix(tol)
+    if end is None:
+        ota_in_line = [end for _, end in ota if end <= line_end]
+        end = ota_in_line[-1] if ota_in_line else None
+    if end is None:
+        daynum = _TOL_DAYNUM.match(s)
+        end = daynum.end() if daynum else None
+    if end is not None:
+        return _interval(s, (0, end), None)
+
+    end = last_in_prefix(ig)
+    if end is None:
+        daynum = _IG_DAYNUM.match(s)
+        end = daynum.end() if daynum else None
+    if end is not None:
+        return _interval(s, None, (0, end))
 
-        if len(groups) == 1:
-            return {
-                'start_date': groups[0],
-                'end_date': 'OPEN'
-            }
+    return {}
 
-    match = re.match(R_IG, s)
-    if match:
-        groups = match.groups()
-        groups = [m.lstrip().rstrip() for m in groups if m]
 
-        if len(groups) == 1:
-            return {
-                'start_date': 'OPEN',
-                'end_date': groups[0]
-            }
+def match_interval(s: str) -> Dict:
+    """
+    Detects explicit intervals in the input, see match_interval_with_spans.
+    :param s: textual input
+    :return: dictionary with the start and end substrings (or 'OPEN'), empty dictionary if no interval is found
+    """
+    interval = match_interval_with_spans(s)
+    if not interval:
+        return {}
 
-    return {}
+    return {'start_date': interval['start_date'], 'end_date': interval['end_date']}
 
 
 def match_duration_match(s: str) -> List[str]:
@@ -0,0 +1,206 @@
+"""
+This module implements the scanner behind the clock word rule (match_time_words).
+
+The R_HOUR_MIN and R_HOUR_MIN_REV patterns start with several `.*` groups, so matching them with finditer
+costs quadratic time in the length of the input. Their semantics are simple though: a `.*keyword` group
+extends until the last occurrence of the keyword in the current line. The scanner collects the keyword
+occurrences in a single pass and reproduces the first non-empty match of both patterns from them, only running
+small anchored patterns (clock hours, dayparts) at the few positions where they can start.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from hun_date_parser.date_parser.patterns import (R_DAYPART, R_HOUR_MODIFIER, R_CLOCK_HOUR, R_BEFORE_AFTER,
+                                                  R_TIME_KEYWORDS)
+
+_KEYWORDS = re.compile(R_TIME_KEYWORDS)
+_HOUR_AT_BOUNDARY = re.compile(r'\b' + R_CLOCK_HOUR)
+_HOUR = re.compile(R_CLOCK_HOUR)
+_DAYPART = re.compile(R_DAYPART)
+_HOUR_MODIFIER = re.compile(R_HOUR_MODIFIER)
+_BEFORE_AFTER = re.compile(R_BEFORE_AFTER)
+
+# order of the alternatives within the `.*` groups of R_HOUR_MIN
+_DAYPART_KEYWORDS = ('hajnal', 'reggel', 'delelott', 'delutan', 'este', 'ejjel')
+_MODIFIER_KEYWORDS = ('negyed', 'fel')
+
+
+@dataclass
+class TimeWordsMatch:
+    """
+    Stands in for the finditer results of R_HOUR_MIN (kind 'regular') or R_HOUR_MIN_REV (kind 'reverse'):
+    the position, text and groups of the first match, along with the groups of the first match which has at least
+    one non-empty group. The former can be an empty match, the rule used both of them.
+    """
+    start: int
+    end: int
+    text: str
+    groups: Tuple[Optional[str], ...]
+    values: Tuple[Optional[str], ...]
+    kind: str
+
+
+class _Line:
+    """Keyword occurrences of a single line of the input."""
+
+    def __init__(self, start: int, end: int) -> None:
+        self.start = start
+        self.end = end
+        self.last: Dict[str, Tuple[int, int]] = {}
+        self.percs: List[Tuple[int, int]] = []
+
+
+def _scan_lines(s: str) -> List[_Line]:
+    """Collects the last occurrence of every keyword for each line in a single pass."""
+    lines = [_Line(0, len(s))]
+    for kw in _KEYWORDS.finditer(s):
+        kind = kw.lastgroup
+        assert kind is not None
+        if kind == 'newline':
+            lines[-1].end = kw.start(kind)
+            lines.append(_Line(kw.end(kind), len(s)))
+            continue
+
+        lines[-1].last[kind] = kw.span(kind)
+        if kind == 'perc':
+            lines[-1].percs.append(kw.span(kind))
+
+    return lines
+
+
+def _skip_space(s: str, pos: int) -> int:
+    return pos + 1 if s[pos:pos + 1] == ' ' else pos
+
+
+def _regular_at(s: str, line: _Line, p: int) -> Tuple[int, Tuple[Optional[str], ...]]:
+    """Matches R_HOUR_MIN at position p, returns the end of the match and its groups."""
+    pos = p
+
+    daypart = None
+    for kw in _DAYPART_KEYWORDS:
+        if kw in line.last and line.last[kw][0] >= pos:
+            end = line.last[kw][1]
+            if kw == 'hajnal' and s[end:end + 1] == 'i':
+                end += 1
+            daypart, pos = s[p:end], end
+            break
+    pos = _skip_space(s, pos)
+
+    hour_modifier = None
+    for kw in _MODIFIER_KEYWORDS:
+        if kw in line.last and line.last[kw][0] >= pos:
+            hour_modifier, pos = s[pos:line.last[kw][1]], line.last[kw][1]
+            break
+    pos = _skip_space(s, pos)
+
+    hour = None
+    hour_match = _HOUR_AT_BOUNDARY.match(s, pos)
+    if hour_match:
+        hour, pos = hour_match.group(1), hour_match.end()
+
+    minute = None
+    if 'perc' in line.last and line.last['perc'][0] >= pos:
+        minute, pos = s[pos:line.last['perc'][1]], line.last['perc'][1]
+
+    return pos, (daypart, hour_modifier, hour, minute)
+
+
+def _first_regular(s: str, lines: List[_Line]) -> Optional[TimeWordsMatch]:
+    """Matches R_HOUR_MIN, returns None if none of its matches has a non-empty group."""
+    # R_HOUR_MIN can match the empty string, so its first match is always at the start of the input
+    first_end, first_groups = _regular_at(s, lines[0], 0)
+
+    for line in lines:
+        if line.last:
+            p = line.start
+        else:
+            hour_match = _HOUR_AT_BOUNDARY.search(s, line.start)
+            if not hour_match or hour_match.start() >= line.end:
+                continue
+
+            # finditer steps through runs of spaces two at a time, as R_HOUR_MIN consumes at most two of them
+            # before the hour
+            p = hour_match.start()
+            n_spaces = 0
+            while p - n_spaces > line.start and s[p - n_spaces - 1] == ' ':
+                n_spaces += 1
+            if n_spaces:
+                p -= 1 if n_spaces % 2 else 2
+
+        _, groups = _regular_at(s, line, p)
+        if ''.join(g for g in groups if g):
+            return TimeWordsMatch(0, first_end, s[:first_end], first_groups, groups, 'regular')
+
+    return None
+
+
+def _reverse_perc_prefix(s: str, line: _Line) -> Optional[Tuple[int, int]]:
+    """
+    The `(.*)(?:perc.{0,4}) ` prefix of R_HOUR_MIN_REV: returns the start of the last 'perc' of the line which is
+    followed by a space within four characters, along with the position of that space.
+    """
+    for perc_start, perc_end in reversed(line.percs):
+        for k in range(4, -1, -1):
+            if perc_end + k < line.end and s[perc_end + k] == ' ':
+                return perc_start, perc_end + k
+
+    return None
+
+
+def _reverse_at(s: str, pos: int, minute: Optional[str]) -> Tuple[int, Tuple[Optional[str], ...]]:
+    """Matches the anchored part of R_HOUR_MIN_REV which follows the mandatory space."""
+    groups: List[Optional[str]] = [minute]
+    for i, pattern in enumerate((_DAYPART, _HOUR_MODIFIER, _HOUR, _BEFORE_AFTER)):
+        if i:
+            pos = _skip_space(s, pos)
+
+        part = pattern.match(s, pos)
+        if part:
+            groups.append(part.group(1) if pattern is _HOUR else part.group(0))
+            pos = part.end()
+        else:
+            groups.append(None)
+
+    return pos, tuple(groups)
+
+
+def _first_reverse(s: str, lines: List[_Line]) -> Optional[TimeWordsMatch]:
+    """Matches R_HOUR_MIN_REV, returns None if none of its matches has a non-empty group."""
+    first: Optional[Tuple[int, int, Tuple[Optional[str], ...]]] = None
+    for line in lines:
+        prefix = _reverse_perc_prefix(s, line)
+        p = line.start
+        while p < line.end:
+            if s[p] == ' ':
+                end, groups = _reverse_at(s, p + 1, None)
+            elif prefix and prefix[0] >= p:
+                end, groups = _reverse_at(s, prefix[1] + 1, s[p:prefix[0]])
+            else:
+                # no match can start before the next space
+                p = s.find(' ', p, line.end)
+                if p == -1:
+                    break
+                continue
+
+            if first is None:
+                first = p, end, groups
+            if ''.join(g for g in groups if g):
+                first_start, first_end, first_groups = first
+                return TimeWordsMatch(first_start, first_end, s[first_start:first_end], first_groups, groups,
+                                      'reverse')
+            p = end
+
+    return None
+
+
+def scan_time_words(s: str) -> Tuple[Optional[TimeWordsMatch], Optional[TimeWordsMatch]]:
+    """
+    Finds the first non-empty match of the R_HOUR_MIN and the R_HOUR_MIN_REV patterns in the input.
+    :param s: textual input
+    :return: tuple of the regular and the reverse match, both of them can be None
+    """
+    lines = _scan_lines(s)
+
+    return _first_regular(s, lines), _first_reverse(s, lines)
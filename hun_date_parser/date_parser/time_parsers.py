@@ -3,51 +3,44 @@ import re
 from typing import Dict, List, Any, Tuple, Optional
 from datetime import datetime
 
-from hun_date_parser.date_parser.patterns import R_DIGI, R_HOUR_MIN, R_HOUR_MIN_REV, R_HWORDS_
+from hun_date_parser.date_parser.patterns import R_DIGI, R_HWORDS_, R_TEMPORAL_WORDS
+from hun_date_parser.date_parser.time_expressions import scan_time_words
 from hun_date_parser.utils import remove_accent, word_to_num, Year, Month, Day, Hour, Minute, Daypart
 from hun_date_parser.date_parser.date_parsers import match_weekday
 
 NAN = -1
 
+_TEMPORAL_WORDS = re.compile(R_TEMPORAL_WORDS)
+# accent-free words which confirm that a lone number is meant as an hour
+_HOUR_INDICATORS = re.compile('|'.join([
+    "ora",
+    "-kor",
+    "egykor",
+    "kettokor",
+    "haromkor",
+    "negykor",
+    "otkor",
+    "hatkor",
+    "hetkor",
+    "nyolckor",
+    "kilenckor",
+    "tizkor",
+    "tizenegykor",
+    "tizenkettokor"
+]))
+
 
 def _trim_to_temporal_content(text: str, match_start: int, match_end: int, match_text: str) -> Tuple[int, int, str]:
     """Trim match to start and end at relevant temporal words."""
     if not match_text or match_start == match_end:
         return match_start, match_end, match_text
 
-    # Temporal word patterns (accent-free, longer words first)
-    temporal_patterns = [
-        r'\bharomnegyed\b', r'\bdelelo[to]*\b', r'\bdelutan\b', r'\bhajnal[i]?\b',
-        r'\breggel\b', r'\beste\b', r'\bejjel\b',
-        r'\bnegyed\b', r'\bfel\b', r'\bora\b', r'\bkor\b', r'\belott\b', r'\butan\b',
-        r'\bperc\b', r'\bma\b', r'\bholnap\b', r'\btegnap\b',
-        r'\bhetfo\b', r'\bkedd\b', r'\bszerda\b', r'\bcsutortok\b', r'\bpentek\b', r'\bszombat\b', r'\bvasarnap\b',
-        r'\bjanuar\b', r'\bfebruar\b', r'\bmarcius\b', r'\baprilis\b', r'\bmajus\b', r'\bjunius\b',
-        r'\bjulius\b', r'\baugusztus\b', r'\bszeptember\b', r'\boktober\b', r'\bnovember\b', r'\bdecember\b',
-        r'\b\d+\b'  # Any digit sequence
-    ]
-
-    first_temporal_start = None
-    last_temporal_end = None
-
-    match_text_lower = remove_accent(match_text.lower())
-
-    for pattern in temporal_patterns:
-        for match in re.finditer(pattern, match_text_lower):
-            start_pos = match.start()
-            end_pos = match.end()
-
-            if first_temporal_start is None or start_pos < first_temporal_start:
-                first_temporal_start = start_pos
-
-            if last_temporal_end is None or end_pos > last_temporal_end:
-                last_temporal_end = end_pos
-
-    if first_temporal_start is None:
+    temporal_words = list(_TEMPORAL_WORDS.finditer(remove_accent(match_text.lower())))
+    if not temporal_words:
         return match_start, match_end, match_text
 
-    new_start = match_start + (first_temporal_start or 0)
-    new_end = match_start + (last_temporal_end or 0)
+    new_start = match_start + temporal_words[0].start()
+    new_end = match_start + temporal_words[-1].end()
     new_match_text = text[new_start:new_end]
 
     return new_start, new_end, new_match_text
@@ -107,30 +100,7 @@ def match_hwords(s: str) -> List[Dict[str, Any]]:
 
 
 def is_indeed_hour(s: str):
-    s_uac = remove_accent(s)
-
-    words_indicating_hour = [
-        "ora",
-        "-kor",
-        "egykor",
-        "kettokor",
-        "haromkor",
-        "negykor",
-        "otkor",
-        "hatkor",
-        "hetkor",
-        "nyolckor",
-        "kilenckor",
-        "tizkor",
-        "tizenegykor",
-        "tizenkettokor"
-    ]
-
-    for w in words_indicating_hour:
-        if w in s_uac:
-            return True
-
-    return False
+    return _HOUR_INDICATORS.search(remove_accent(s)) is not None
 
 
 def _raw_match_time_words(s: str) -> Optional[Tuple[Any, Any, Any, Any, Any, Any]]:
@@ -139,47 +109,37 @@ def _raw_match_time_words(s: str) -> Optional[Tuple[Any, Any, Any, Any, Any, Any
     :param s: input text
     :return: (match_obj, daypart, hour_modifier, hour, minute, match_type) or None
     """
-    match_obj = None
-    match_type = None
+    return _select_time_words(s, remove_accent(s))
 
-    # Try regular pattern first
-    matches = list(re.finditer(R_HOUR_MIN, s))
-    group = [m.groups() for m in matches if ''.join([g for g in m.groups() if g])]
 
-    # Try reverse pattern
-    matches_rev = list(re.finditer(R_HOUR_MIN_REV, s))
-    group_rev = [m.groups() for m in matches_rev if ''.join([g for g in m.groups() if g])]
+def _select_time_words(s: str, s_uac: str) -> Optional[Tuple[Any, Any, Any, Any, Any, Any]]:
+    """
+    Chooses between the matches of the regular and the reverse pattern, see _raw_match_time_words.
+    :param s: input text
+    :param s_uac: accent-free version of the input text
+    :return: (match_obj, daypart, hour_modifier, hour, minute, match_type) or None
+    """
+    match, match_rev = scan_time_words(s)
 
-    if not (group or group_rev):
+    if not (match or match_rev):
         return None
-    elif group and not group_rev:
-        daypart, hour_modifier, hour, minute = group[0]
-        match_obj = matches[0]
-        match_type = 'regular'
-    elif not group and group_rev:
-        minute, daypart, hour_modifier, hour, is_before = group_rev[0]
-        if minute or is_before:
-            minute = (minute or '') + (' ' + (is_before or ''))
-        match_obj = matches_rev[0]
-        match_type = 'reverse'
-    elif group_rev[0].count(None) < group[0].count(None):
-        minute, daypart, hour_modifier, hour, is_before = group_rev[0]
+    elif match and (not match_rev or match_rev.values.count(None) >= match.values.count(None)):
+        daypart, hour_modifier, hour, minute = match.values
+        match_obj = match
+    else:
+        assert match_rev is not None
+        minute, daypart, hour_modifier, hour, is_before = match_rev.values
         if minute or is_before:
             minute = (minute or '') + (' ' + (is_before or ''))
-        match_obj = matches_rev[0]
-        match_type = 'reverse'
-    else:
-        daypart, hour_modifier, hour, minute = group[0]
-        match_obj = matches[0]
-        match_type = 'regular'
+        match_obj = match_rev
 
     # when a single number is matched, the pattern currently interprets it as an hour value
     # i.e.: "1" --> 1 hour or "egy" --> 1 hour
     # this check is designed to address this issue (R_HOUR_MIN pattern needs to be rewritten for a proper solution)
-    if not (daypart or minute or hour_modifier) and hour and not is_indeed_hour(s):
+    if not (daypart or minute or hour_modifier) and hour and not _HOUR_INDICATORS.search(s_uac):
         return [('', '', '', '')], '', '', '', '', None
 
-    return match_obj, daypart, hour_modifier, hour, minute, match_type
+    return match_obj, daypart, hour_modifier, hour, minute, match_obj.kind
 
 
 def match_time_words(s: str) -> List[Dict[str, Any]]:
@@ -187,7 +147,8 @@ def match_time_words(s: str) -> List[Dict[str, Any]]:
     :param s: textual input
     :return: tuple of date parts
     """
-    parts = _raw_match_time_words(s)
+    s_uac = remove_accent(s)
+    parts = _select_time_words(s, s_uac)
     if not parts:
         return []
     else:
@@ -209,7 +170,7 @@ def match_time_words(s: str) -> List[Dict[str, Any]]:
 
         # Fix false time match for input 'jövő hét'
         if remove_accent(hour) == 'het':
-            hour_indeces = [m.start() for m in re.finditer('het(?!fo)', remove_accent(s))]
+            hour_indeces = [m.start() for m in re.finditer('het(?!fo)', s_uac)]
             if hour_indeces:
                 before_hour = s[:hour_indeces[-1]].split()
                 if before_hour:
@@ -237,7 +198,7 @@ def match_time_words(s: str) -> List[Dict[str, Any]]:
             if f' {nh}' in remove_accent(hour) or remove_accent(hour).startswith(nh):
                 return []
 
-        if 'mulva' in remove_accent(s):
+        if 'mulva' in s_uac:
             return []
 
         hour_num = word_to_num(hour)
@@ -300,16 +261,16 @@ def match_time_words(s: str) -> List[Dict[str, Any]]:
         else:
             date_parts.append(Hour(hour_num, 'time_words'))
 
-        original_start = match_obj.start() if match_obj else 0
-        original_end = match_obj.end() if match_obj else 0
-        original_text = match_obj.group(0) if match_obj else ''
+        original_start = match_obj.start if match_obj else 0
+        original_end = match_obj.end if match_obj else 0
+        original_text = match_obj.text if match_obj else ''
 
         trimmed_start, trimmed_end, trimmed_text = _trim_to_temporal_content(
             s, original_start, original_end, original_text
         )
 
         res.append({
-            'match': match_obj.groups() if match_obj else [],
+            'match': match_obj.groups if match_obj else [],
             'match_text': trimmed_text,
             'match_start': trimmed_start,
             'match_end': trimmed_end,
@@ -317,16 +278,16 @@ def match_time_words(s: str) -> List[Dict[str, Any]]:
         })
 
     elif daypart:
-        original_start = match_obj.start() if match_obj else 0
-        original_end = match_obj.end() if match_obj else 0
-        original_text = match_obj.group(0) if match_obj else ''
+        original_start = match_obj.start if match_obj else 0
+        original_end = match_obj.end if match_obj else 0
+        original_text = match_obj.text if match_obj else ''
 
         trimmed_start, trimmed_end, trimmed_text = _trim_to_temporal_content(
             s, original_start, original_end, original_text
         )
 
         daypart_match = {
-            'match': match_obj.groups() if match_obj else [],
+            'match': match_obj.groups if match_obj else [],
             'match_text': trimmed_text,
             'match_start': trimmed_start,
             'match_end': trimmed_end,
@@ -1,6 +1,6 @@
-from typing import TypedDict, Optional, Sequence, Union, List, Tuple
+from typing import Callable, Dict, Match, NamedTuple, Pattern, TypedDict, Optional, Sequence, Union, List, Tuple
 import re
-from hun_date_parser.utils import (DateTimePartConatiner, remove_accent, word_to_num,
+from hun_date_parser.utils import (DateTimePartConatiner, lower_keep_positions, remove_accent, word_to_num,
                                    Minute, Hour, Day, Week, Month, Year)
 from hun_date_parser.date_parser.patterns import (R_HOUR_MIN_D, R_HOUR_HOUR_D,
                                                   R_HOUR_D, R_SPECIAL_HOUR_D)
@@ -32,14 +32,6 @@ class DateParts(TypedDict):
     match_end: Optional[int]
 
 
-def _find_span_in_original(pattern: str, original_s: str) -> Tuple[int, int]:
-    """Helper function to find span positions in original string."""
-    match = re.search(pattern, original_s, re.IGNORECASE)
-    if match:
-        return match.start(), match.end()
-    return 0, 0
-
-
 def convert_hour_to_minutes(hour_str: Optional[str]) -> int:
     """Converts an hour string to minutes, handling special cases."""
     if hour_str is None:
@@ -71,208 +63,243 @@ def convert_quarter_hour(hour_str: Optional[str]) -> int:
     return 0
 
 
-def duration_parser(s: str, return_preferred_unit: bool = False, with_spans: bool = False) -> DateParts:
-    s_clean = s.strip().lower()
-    s_no_accent = remove_accent(s_clean)
-    original_s = s.strip()
-
-    preferred_unit: Optional[DurationUnit] = None
-    res_date_parts: List[DateTimePartConatiner] = []
-    match_start = None
-    match_end = None
-
-    # Define all patterns
-    year_pattern = (r'\b(\d+|egy|kett[oöő]|két|h[aá]rom|n[eé]gy|[öo]t|hat|h[eé]t|nyolc|kilenc|'
-                    r't[ií]z|teljes)?\s*[eé]v(ese?[eé]?t?|re)\b')
-
-    # Max frequency patterns
-    max_patterns = [
-        r'\b(ameddig|am[ií]g)\s+(csak\s+)?lehet(s[eé]ges)?\b',
-        r'\b(maximum|max)\s+id[oő]re\b',
-        r'\b(lehet[oő]leg\s+)?hossz[aá]n\b',
-        r'\bmaxim[aá]lis\s+(ideig|id[oő]re)\b'
-    ]
-    week_pattern = (r'\b(\d+|egy|kett[oöő]|k[eé]t|k[eé]thetes|h[aá]rom|n[eé]gy|[öo]t|hat|h[eé]t|'
-                    r'nyolc|kilenc|t[ií]z)\s*h[eé]t(ese?[eé]?t?|re)\b')
-    day_pattern = (r'\b(\d+|egy|kett[oöő]|két|h[aá]rom|n[eé]gy|[öo]t|hat|h[eé]t|nyolc|kilenc|'
-                   r't[ií]z|harminc|\d{2,3})\s*nap(osa?[aá]?t?|ra)\b')
-    hour_pattern = (r'\b(\d+|egy|kett[oöő]|két|h[aá]rom|n[eé]gy|[öo]t|hat|h[eé]t|nyolc|kilenc|'
-                    r't[ií]z|\d{2})\s*[oó]r[aá](sa?[aá]?t?|ra)\b')
-    minute_pattern = (r'\b(\d+|egy|kett[oöő]|két|h[aá]rom|n[eé]gy|[öo]t|hat|h[eé]t|nyolc|kilenc|'
-                      r't[ií]z|húsz|harminc|negyven|ötven|\d{2,3})\s*perc[a-z]*\b')
-
-    # Check for max duration patterns first
-    for pattern in max_patterns:
-        if re.search(pattern, s_no_accent):
-            if with_spans:
-                match_start, match_end = _find_span_in_original(pattern, original_s)
-
-            # Return MaxDuration result
-            res_date_parts = [MaxDuration("max_duration")]
-            preferred_unit = DurationUnit.MAX
-
-            result: DateParts = {
-                "match": s,
-                "date_parts": res_date_parts,
-                "preferred_unit": preferred_unit if return_preferred_unit else None,
-                "match_start": match_start if with_spans else None,
-                "match_end": match_end if with_spans else None
-            }
-            return result
-
-    # Year patterns
-    year_search = re.search(year_pattern, s_no_accent)
-    if year_search:
-        if with_spans:
-            match_start, match_end = _find_span_in_original(year_pattern, original_s)
-
-        year_match_pattern = (r'(\d+|egy|kett[oöő]|két|h[aá]rom|n[eé]gy|[öo]t|hat|h[eé]t|nyolc|'
-                              r'kilenc|t[ií]z|teljes)\s*[eé]v(ese?[eé]?t?|re)')
-        num_match = re.search(year_match_pattern, s_no_accent)
-        if num_match:
-            num_str = num_match.group(1)
-            if num_str == 'teljes':
-                num_years = 1
-            else:
-                num_years = word_to_num(num_str) if num_str.isalpha() else int(num_str)
-        else:
-            num_years = 1
-
-        if return_preferred_unit:
-            res_date_parts = [Year(num_years, "duration_parser")]
-            preferred_unit = DurationUnit.YEARS
-        else:
-            res_date_parts = [Minute(num_years * 365 * 24 * 60, "duration_parser")]
-
-    # Week patterns
-    elif re.search(week_pattern, s_no_accent):
-        if with_spans:
-            match_start, match_end = _find_span_in_original(week_pattern, original_s)
-        week_match_pattern = (r'(\d+|egy|kett[oöő]|k[eé]t|k[eé]thetes|h[aá]rom|n[eé]gy|[öo]t|hat|'
-                              r'h[eé]t|nyolc|kilenc|t[ií]z)\s*h[eé]t(ese?[eé]?t?|re)')
-        num_match = re.search(week_match_pattern, s_no_accent)
-        if num_match:
-            num_str = num_match.group(1)
-            num_weeks = word_to_num(num_str) if num_str.isalpha() else int(num_str)
-        else:
-            num_weeks = 1
-
-        if return_preferred_unit:
-            res_date_parts = [Week(num_weeks, "duration_parser")]
-            preferred_unit = DurationUnit.WEEKS
-        else:
-            res_date_parts = [Minute(num_weeks * 7 * 24 * 60, "duration_parser")]
-
-    # Day patterns
-    elif re.search(day_pattern, s_no_accent):
-        if with_spans:
-            match_start, match_end = _find_span_in_original(day_pattern, original_s)
-        day_match_pattern = (r'(\d+|egy|kett[oöő]|két|h[aá]rom|n[eé]gy|[öo]t|hat|h[eé]t|nyolc|'
-                             r'kilenc|t[ií]z|harminc|\d{2,3})\s*nap(osa?[aá]?t?|ra)')
-        num_match = re.search(day_match_pattern, s_no_accent)
-        if num_match:
-            num_str = num_match.group(1)
-            num_days = word_to_num(num_str) if num_str.isalpha() else int(num_str)
-            if return_preferred_unit:
-                res_date_parts = [Day(num_days, "duration_parser")]
-                preferred_unit = DurationUnit.DAYS
-            else:
-                res_date_parts = [Minute(num_days * 24 * 60, "duration_parser")]
-
-    # Hour patterns
-    elif re.search(hour_pattern, s_no_accent):
-        if with_spans:
-            match_start, match_end = _find_span_in_original(hour_pattern, original_s)
-        hour_match_pattern = (r'(\d+|egy|kett[oöő]|két|h[aá]rom|n[eé]gy|[öo]t|hat|h[eé]t|nyolc|'
-                              r'kilenc|t[ií]z|\d{2})\s*[oó]r[aá](sa?[aá]?t?|ra)')
-        num_match = re.search(hour_match_pattern, s_no_accent)
-        if num_match:
-            num_str = num_match.group(1)
-            num_hours = word_to_num(num_str) if num_str.isalpha() else int(num_str)
-            # Reject unrealistic hour values (like 100)
-            if num_hours > 50:
-                res_date_parts = []
-            elif return_preferred_unit:
-                res_date_parts = [Hour(num_hours, "duration_parser")]
-                preferred_unit = DurationUnit.HOURS
-            else:
-                res_date_parts = [Minute(num_hours * 60, "duration_parser")]
-
-    # Fallback to original logic for existing patterns
+# Patterns of the duration expressions, matched on the lowercase, accent folded text (the hour and minute fallbacks on
+# the text as it is, see _LEVELS). When several of them match, the first one in this order gives the duration of
+# parse_duration (see _primary).
+_MAX_PATTERN = '|'.join([
+    r'\b(?:ameddig|am[ií]g)\s+(?:csak\s+)?lehet(?:s[eé]ges)?\b',
+    r'\b(?:maximum|max)\s+id[oő]re\b',
+    r'\b(?:lehet[oő]leg\s+)?hossz[aá]n\b',
+    r'\bmaxim[aá]lis\s+(?:ideig|id[oő]re)\b'
+])
+_YEAR_PATTERN = (r'\b(\d+|egy|kett[oöő]|két|h[aá]rom|n[eé]gy|[öo]t|hat|h[eé]t|nyolc|kilenc|'
+                 r't[ií]z|teljes)?\s*[eé]v(?:ese?[eé]?t?|re)\b')
+_WEEK_PATTERN = (r'\b(\d+|egy|kett[oöő]|k[eé]t|k[eé]thetes|h[aá]rom|n[eé]gy|[öo]t|hat|h[eé]t|'
+                 r'nyolc|kilenc|t[ií]z)\s*h[eé]t(?:ese?[eé]?t?|re)\b')
+_DAY_PATTERN = (r'\b(\d+|egy|kett[oöő]|két|h[aá]rom|n[eé]gy|[öo]t|hat|h[eé]t|nyolc|kilenc|'
+                r't[ií]z|harminc|\d{2,3})\s*nap(?:osa?[aá]?t?|ra)\b')
+_HOUR_PATTERN = (r'\b(\d+|egy|kett[oöő]|két|h[aá]rom|n[eé]gy|[öo]t|hat|h[eé]t|nyolc|kilenc|'
+                 r't[ií]z|\d{2})\s*[oó]r[aá](?:sa?[aá]?t?|ra)\b')
+_MINUTE_PATTERN = (r'\b(\d+|egy|kett[oöő]|két|h[aá]rom|n[eé]gy|[öo]t|hat|h[eé]t|nyolc|kilenc|'
+                   r't[ií]z|húsz|harminc|negyven|ötven|\d{2,3})\s*perc[a-z]*\b')
+
+
+def _number(num_str: str) -> int:
+    return word_to_num(num_str) if num_str.isalpha() else int(num_str)
+
+
+# name, pattern, unit of the duration, amount of the unit from the groups of the pattern. The fallback levels (from
+# three_quarter to special_hour) are matched on the original text, they are case and accent sensitive.
+_LEVELS: List[Tuple[str, str, DurationUnit, Callable[..., int]]] = [
+    ('max', _MAX_PATTERN, DurationUnit.MAX, lambda: 0),
+    ('year', _YEAR_PATTERN, DurationUnit.YEARS,
+     lambda num_str: 1 if num_str is None or num_str == 'teljes' else _number(num_str)),
+    ('week', _WEEK_PATTERN, DurationUnit.WEEKS, _number),
+    ('day', _DAY_PATTERN, DurationUnit.DAYS, _number),
+    ('hour', _HOUR_PATTERN, DurationUnit.HOURS, _number),
+    ('three_quarter', r'3\s+negyed(?:[oó]ra?)?', DurationUnit.MINUTES, lambda: 45),
+    ('three_quarter_word', r'h[aá]romnegyed\s*[oó]r[aá][a-z]*', DurationUnit.MINUTES, lambda: 45),
+    ('hour_minute', R_HOUR_MIN_D, DurationUnit.MINUTES,
+     lambda hour_w, min_w: convert_hour_to_minutes(hour_w) + word_to_num(min_w)),
+    ('hour_word', R_HOUR_D, DurationUnit.MINUTES, convert_hour_to_minutes),
+    ('hour_fraction', R_HOUR_HOUR_D, DurationUnit.MINUTES,
+     lambda hour_w, hour_w_2: convert_hour_to_minutes(hour_w) + convert_quarter_hour(hour_w_2)),
+    ('special_hour', R_SPECIAL_HOUR_D, DurationUnit.MINUTES, convert_quarter_hour),
+    ('minute', _MINUTE_PATTERN, DurationUnit.MINUTES, _number),
+]
+_HOUR_LEVEL = 4
+_FALLBACK_LEVEL = 5
+_MINUTE_LEVEL = len(_LEVELS) - 1
+
+_UNIT_MINUTES = {DurationUnit.MINUTES: 1, DurationUnit.HOURS: 60, DurationUnit.DAYS: 24 * 60,
+                 DurationUnit.WEEKS: 7 * 24 * 60, DurationUnit.YEARS: 365 * 24 * 60}
+_UNIT_PARTS = {DurationUnit.MINUTES: Minute, DurationUnit.HOURS: Hour, DurationUnit.DAYS: Day,
+               DurationUnit.WEEKS: Week, DurationUnit.YEARS: Year}
+
+
+def _combined_pattern(levels: Sequence[int]) -> Tuple[Pattern, Dict[int, Tuple[int, int, int]]]:
+    """
+    Joins the levels into the alternatives of one pattern, at a position the first level which matches wins.
+    :return: the pattern, and for the group of each level: the level, its first and its last own group
+    """
+    alternatives, groups, index = [], {}, 1
+    for level in levels:
+        pattern = _LEVELS[level][1]
+        alternatives.append(f'({pattern})')
+        n_groups = re.compile(pattern).groups
+        groups[index] = (level, index + 1, index + n_groups)
+        index += 1 + n_groups
+    return re.compile('|'.join(alternatives)), groups
+
+
+# the levels matched on the folded text, and the fallback levels matched on the original text
+_DURATION_RE, _DURATION_GROUPS = _combined_pattern([*range(_FALLBACK_LEVEL), _MINUTE_LEVEL])
+_FALLBACK_RE, _FALLBACK_GROUPS = _combined_pattern(range(_FALLBACK_LEVEL, _MINUTE_LEVEL))
+
+
+class DurationMention(NamedTuple):
+    """A duration expression of the text: its level in _LEVELS, its position and the amount of its unit."""
+    level: int
+    start: int
+    end: int
+    amount: int
+
+    @property
+    def unit(self) -> DurationUnit:
+        return _LEVELS[self.level][2]
+
+    @property
+    def valid(self) -> bool:
+        """Unrealistic or unknown amounts aren't durations, but they still hide the later levels (see _primary)."""
+        if self.level == _HOUR_LEVEL:
+            return self.amount <= 50
+        if self.level >= _FALLBACK_LEVEL:
+            return self.amount > 0
+        return True
+
+    def date_part(self, return_preferred_unit: bool) -> DateTimePartConatiner:
+        if self.unit == DurationUnit.MAX:
+            return MaxDuration("max_duration")
+        if not return_preferred_unit:
+            return Minute(self.amount * _UNIT_MINUTES[self.unit], "duration_parser")
+        if self.preferred_unit == DurationUnit.HOURS and self.unit == DurationUnit.MINUTES:
+            return Hour(self.amount // 60, "duration_parser")
+        return _UNIT_PARTS[self.unit](self.amount, "duration_parser")
+
+    @property
+    def preferred_unit(self) -> DurationUnit:
+        if self.unit == DurationUnit.MINUTES and self.amount >= 60 and self.amount % 60 == 0:
+            # Prefer hours for whole hour durations
+            return DurationUnit.HOURS
+        return self.unit
+
+
+# positions inside a match where an expression can start: the beginning of words and the 3 of "3 negyedóra"
+_INNER_STARTS = re.compile(r'\b\w|3')
+
+
+def _to_mention(match: Match, groups: Dict[int, Tuple[int, int, int]]) -> DurationMention:
+    level, first, last = groups[match.lastindex]  # type: ignore
+    return DurationMention(level, match.start(), match.end(), _LEVELS[level][3](*match.groups()[first - 1:last]))
+
+
+def _scan(pattern: Pattern, groups: Dict[int, Tuple[int, int, int]], text: str) -> List[DurationMention]:
+    mentions = []
+    for match in pattern.finditer(text):
+        mention = _to_mention(match, groups)
+        # an expression of an earlier level can start inside the match (the minutes in "19 háromnegyed óra"),
+        # it takes the place of the match
+        for start in _INNER_STARTS.finditer(text, match.start() + 1, match.end()):
+            inner = pattern.match(text, start.start())
+            if inner is not None and groups[inner.lastindex][0] < mention.level:  # type: ignore
+                mention = _to_mention(inner, groups)
+        mentions.append(mention)
+    return mentions
+
+
+def _all_mentions(s: str, folded: Optional[str] = None) -> List[DurationMention]:
+    """The mentions of the folded and of the fallback levels in the order of the text, they may overlap."""
+    if folded is None:
+        folded = remove_accent(lower_keep_positions(s))
+    return sorted(_scan(_DURATION_RE, _DURATION_GROUPS, folded) + _scan(_FALLBACK_RE, _FALLBACK_GROUPS, s),
+                  key=lambda mention: (mention.start, mention.level))
+
+
+def scan_durations(s: str, folded: Optional[str] = None) -> List[DurationMention]:
+    """
+    Finds every duration expression of the text, with one pass over the lowercase, accent folded text and one over
+    the text itself for the hour and minute fallbacks. Of overlapping expressions the one of the earlier level is kept.
+    :param s: Input string
+    :param folded: s lowercased by lower_keep_positions and accent folded, if it is already at hand
+    :return: the mentions in the order of the text, with positions in s, including the invalid ones
+    """
+    mentions: List[DurationMention] = []
+    for mention in _all_mentions(s, folded):
+        if mentions and mention.start < mentions[-1].end:
+            if mention.level < mentions[-1].level:
+                mentions[-1] = mention
+            continue
+        mentions.append(mention)
+    return mentions
+
+
+def _primary(mentions: List[DurationMention]) -> Optional[DurationMention]:
+    """
+    The duration of the text is the first mention of the first level in _LEVELS the text has. Of the fallback levels
+    (the hour and minute expressions without an -s/-ra suffix) only the minutes are tried further, and only if the
+    mention gives no duration.
+    :return: the mention of the duration, None if the text has no valid duration
+    """
+    if not mentions:
+        return None
+    level = min(mention.level for mention in mentions)
+    mention: Optional[DurationMention] = next(mention for mention in mentions if mention.level == level)
+    if _FALLBACK_LEVEL <= level < _MINUTE_LEVEL and mention.amount == 0:  # type: ignore
+        mention = next((mention for mention in mentions if mention.level == _MINUTE_LEVEL), None)
+    return mention if mention is not None and mention.valid else None
+
+
+def _to_dict(mention: DurationMention, s: str, return_preferred_unit: bool, with_spans: bool) -> dict:
+    result_dict: dict = {}
+    if with_spans:
+        # Extract the matched text and strip leading/trailing whitespace
+        raw_match_text = s[mention.start:mention.end]
+        stripped_match_text = raw_match_text.strip()
+        leading_spaces = len(raw_match_text) - len(raw_match_text.lstrip())
+        result_dict.update({
+            'match_text': stripped_match_text,
+            'match_start': mention.start + leading_spaces,
+            'match_end': mention.start + leading_spaces + len(stripped_match_text)
+        })
+
+    date_part = mention.date_part(return_preferred_unit)
+    if not return_preferred_unit:
+        # Return minutes for backward compatibility
+        result_dict["minutes"] = _convert_to_minutes(date_part)
+    elif isinstance(date_part, MaxDuration):
+        result_dict.update({
+            "value": "max",
+            "unit": "max",
+            "preferred_unit": DurationUnit.MAX.value,
+            "minutes": "max"
+        })
     else:
-        res_mins = 0
-        # First handle '3 negyedóra' pattern
-        if re.search(r'3\s+negyed', s):
-            if with_spans:
-                match_start, match_end = _find_span_in_original(r'3\s+negyed[oó]ra?', original_s)
-            res_mins = 45
-        # Handle all háromnegyed forms
-        elif re.search(r'h[aá]romnegyed\s*[oó]r[aá][a-z]*', s):
-            if with_spans:
-                match_start, match_end = _find_span_in_original(r'h[aá]romnegyed\s*[oó]r[aá][a-z]*', original_s)
-            res_mins = 45
-        else:
-            match = re.search(R_HOUR_MIN_D, s)
-            if match:
-                if with_spans:
-                    match_start, match_end = _find_span_in_original(R_HOUR_MIN_D, original_s)
-                hour_w, min_w = match.groups()
-                mins_1 = convert_hour_to_minutes(hour_w)
-                mins_2 = word_to_num(min_w)
-                res_mins = mins_1 + mins_2
-            else:
-                match = re.search(R_HOUR_D, s)
-                if match:
-                    if with_spans:
-                        match_start, match_end = _find_span_in_original(R_HOUR_D, original_s)
-                    hour_w = match.groups()[0]
-                    res_mins = convert_hour_to_minutes(hour_w)
-                else:
-                    match = re.search(R_HOUR_HOUR_D, s)
-                    if match:
-                        if with_spans:
-                            match_start, match_end = _find_span_in_original(R_HOUR_HOUR_D, original_s)
-                        hour_w, hour_w_2 = match.groups()
-                        mins_1 = convert_hour_to_minutes(hour_w)
-                        mins_2 = convert_quarter_hour(hour_w_2)
-                        res_mins = mins_1 + mins_2
-                    else:
-                        match = re.search(R_SPECIAL_HOUR_D, s)
-                        if match:
-                            if with_spans:
-                                match_start, match_end = _find_span_in_original(R_SPECIAL_HOUR_D, original_s)
-                            special_hour = match.groups()[0]
-                            res_mins = convert_quarter_hour(special_hour)
-
-        # Handle simple minutes like "45 percre", "30 perc" as fallback
-        if res_mins == 0:
-            minute_match = re.search(minute_pattern, s_no_accent)
-            if minute_match:
-                if with_spans:
-                    match_start, match_end = _find_span_in_original(minute_pattern, original_s)
-                num_str = minute_match.group(1)
-                res_mins = word_to_num(num_str) if num_str.isalpha() else int(num_str)
-
-        if res_mins > 0:
-            if return_preferred_unit and res_mins >= 60 and res_mins % 60 == 0:
-                # Prefer hours for whole hour durations
-                res_date_parts = [Hour(res_mins // 60, "duration_parser")]
-                preferred_unit = DurationUnit.HOURS
-            else:
-                res_date_parts = [Minute(res_mins, "duration_parser")]
-                preferred_unit = DurationUnit.MINUTES
+        result_dict.update({
+            "value": date_part.value,
+            "unit": type(date_part).__name__.lower(),
+            "preferred_unit": mention.preferred_unit.value,
+            "minutes": _convert_to_minutes(date_part)
+        })
+    return result_dict
+
+
+def duration_parser(s: str, return_preferred_unit: bool = False, with_spans: bool = False) -> DateParts:
+    mention = _primary(_all_mentions(s))
 
     final_result: DateParts = {
         "match": s,
-        "date_parts": res_date_parts,
-        "preferred_unit": preferred_unit if return_preferred_unit else None,
-        "match_start": match_start if with_spans else None,
-        "match_end": match_end if with_spans else None
+        "date_parts": [mention.date_part(return_preferred_unit)] if mention else [],
+        "preferred_unit": mention.preferred_unit if mention and return_preferred_unit else None,
+        "match_start": mention.start if mention and with_spans else None,
+        "match_end": mention.end if mention and with_spans else None
     }
 
     return final_result
 
 
+def parse_durations_with_spans(s: str, return_preferred_unit: bool = False,
+                               folded: Optional[str] = None) -> List[dict]:
+    """
+    Returns every duration found in the input string with span information.
+    :param s: Input string containing the duration information.
+    :param return_preferred_unit: If True, includes preferred unit information.
+    :param folded: s lowercased by lower_keep_positions and accent folded, if it is already at hand.
+    :return: List of dicts in the format of parse_duration_with_spans, in the order of the text.
+    """
+    return [_to_dict(mention, s, return_preferred_unit, with_spans=True)
+            for mention in scan_durations(s, folded) if mention.valid]
+
+
 def parse_duration_with_spans(s: str, return_preferred_unit: bool = False) -> Union[Optional[dict], None]:
     """
     Returns the duration found in the input string with span information.
@@ -280,54 +307,11 @@ def parse_duration_with_spans(s: str, return_preferred_unit: bool = False) -> Un
     :param return_preferred_unit: If True, includes preferred unit information.
     :return: Dict with match_text, match_start, match_end, and duration info, or None if no match.
     """
-    results = duration_parser(s, return_preferred_unit=return_preferred_unit, with_spans=True)
-
-    if not results["date_parts"]:
+    mention = _primary(_all_mentions(s))
+    if mention is None:
         return None
 
-    if results["match_start"] is None or results["match_end"] is None:
-        return None
-
-    # Extract the matched text and strip leading/trailing whitespace
-    raw_match_text = s[results['match_start']:results['match_end']]
-    stripped_match_text = raw_match_text.strip()
-
-    # Calculate the adjusted span positions after stripping
-    leading_spaces = len(raw_match_text) - len(raw_match_text.lstrip())
-    trailing_spaces = len(raw_match_text) - len(raw_match_text.rstrip())
-
-    adjusted_start = results['match_start'] + leading_spaces
-    adjusted_end = results['match_end'] - trailing_spaces
-
-    result_dict = {
-        'match_text': stripped_match_text,
-        'match_start': adjusted_start,
-        'match_end': adjusted_end
-    }
-
-    if return_preferred_unit:
-        date_part = results["date_parts"][0]
-        preferred_unit = results.get("preferred_unit", DurationUnit.MINUTES)
-
-        if isinstance(date_part, MaxDuration):
-            result_dict.update({
-                "value": "max",
-                "unit": "max",
-                "preferred_unit": DurationUnit.MAX.value,
-                "minutes": "max"
-            })
-        else:
-            result_dict.update({
-                "value": date_part.value,
-                "unit": type(date_part).__name__.lower(),
-                "preferred_unit": preferred_unit.value if preferred_unit else DurationUnit.MINUTES.value,
-                "minutes": _convert_to_minutes(date_part)
-            })
-    else:
-        # Return minutes for backward compatibility
-        result_dict["minutes"] = _convert_to_minutes(results["date_parts"][0])
-
-    return result_dict
+    return _to_dict(mention, s, return_preferred_unit, with_spans=True)
 
 
 def parse_duration(s: str, return_preferred_unit: bool = False) -> Union[Optional[int], Optional[str], Optional[dict]]:
@@ -339,32 +323,12 @@ def parse_duration(s: str, return_preferred_unit: bool = False) -> Union[Optiona
     :return: The duration in minutes as an integer (default), or a dict with duration info
              if return_preferred_unit=True. Returns None if no valid duration is found.
     """
-    results = duration_parser(s, return_preferred_unit=return_preferred_unit)
-
-    if not results["date_parts"]:
+    mention = _primary(_all_mentions(s))
+    if mention is None:
         return None
 
-    if return_preferred_unit:
-        date_part = results["date_parts"][0]
-        preferred_unit = results.get("preferred_unit", DurationUnit.MINUTES)
-
-        if isinstance(date_part, MaxDuration):
-            return {
-                "value": "max",
-                "unit": "max",
-                "preferred_unit": DurationUnit.MAX.value,
-                "minutes": "max"
-            }
-        else:
-            return {
-                "value": date_part.value,
-                "unit": type(date_part).__name__.lower(),
-                "preferred_unit": preferred_unit.value if preferred_unit else DurationUnit.MINUTES.value,
-                "minutes": _convert_to_minutes(date_part)
-            }
-    else:
-        # Return minutes for backward compatibility
-        return _convert_to_minutes(results["date_parts"][0])
+    result_dict = _to_dict(mention, s, return_preferred_unit, with_spans=False)
+    return result_dict if return_preferred_unit else result_dict["minutes"]
 
 
 def _convert_to_minutes(date_part: DateTimePartConatiner) -> Union[int, str]:
@@ -1,3 +1,4 @@
 from hun_date_parser.frequency_parser.frequency_parsers import parse_frequency, Frequency
+from hun_date_parser.frequency_parser.recurrence import parse_recurrence, Recurrence
 
-__all__ = ["parse_frequency", "Frequency"]
+__all__ = ["parse_frequency", "Frequency", "parse_recurrence", "Recurrence"]
@@ -1,7 +1,7 @@
 from enum import Enum
 import re
-from typing import Optional
-from hun_date_parser.utils import remove_accent
+from typing import Dict, Iterable, List, Optional, Pattern, Tuple
+from hun_date_parser.utils import lower_keep_positions, remove_accent
 
 
 class Frequency(str, Enum):
@@ -15,6 +15,27 @@ class Frequency(str, Enum):
     YEARLY = "YEARLY"
 
 
+# accent-free patterns, tried in order
+FREQUENCY_PATTERNS = {
+    r'\bnap(onta|i|it|onkent)\b': Frequency.DAILY,
+    r'\bminden nap\b': Frequency.DAILY,
+    r'\bhet(ente|i|it|enkent)\b': Frequency.WEEKLY,
+    r'\bminden het(en|eben)\b': Frequency.WEEKLY,
+    r'\bheti rendszeresseg(gel)?\b': Frequency.WEEKLY,
+    r'\bkethet(ente|i|it|enkent)\b': Frequency.FORTNIGHTLY,
+    r'\bhav(onta|i|it|onkent)\b': Frequency.MONTHLY,
+    r'\bhavi rendszeresseg(gel)?\b': Frequency.MONTHLY,
+    r'\bnegyed(ev|eve)nte\b': Frequency.QUARTERLY,
+    r'\bharomhav(onta|i)\b': Frequency.QUARTERLY,
+    r'\bminden negyed(ev|eve)ben\b': Frequency.QUARTERLY,
+    r'\bfel(ev|eve)nte\b': Frequency.EVERY_HALF_YEAR,
+    r'\bminden fel(ev|eve)ben\b': Frequency.EVERY_HALF_YEAR,
+    r'\b(ev|eve)nte\b': Frequency.YEARLY,
+    r'\bminden (ev|eve)ben\b': Frequency.YEARLY,
+    r'\b(ev|eve)(i|it|s)\b': Frequency.YEARLY,
+}
+
+
 def parse_frequency(s: str) -> Optional[dict]:
     """
     Returns the frequency value found in the input string along with match start and end indices.
@@ -25,26 +46,7 @@ def parse_frequency(s: str) -> Optional[dict]:
     s = s.lower().strip()
     s_no_accent = remove_accent(s)
 
-    frequency_map = {
-        r'\bnap(onta|i|it|onkent)\b': Frequency.DAILY,
-        r'\bminden nap\b': Frequency.DAILY,
-        r'\bhet(ente|i|it|enkent)\b': Frequency.WEEKLY,
-        r'\bminden het(en|eben)\b': Frequency.WEEKLY,
-        r'\bheti rendszeresseg(gel)?\b': Frequency.WEEKLY,
-        r'\bkethet(ente|i|it|enkent)\b': Frequency.FORTNIGHTLY,
-        r'\bhav(onta|i|it|onkent)\b': Frequency.MONTHLY,
-        r'\bhavi rendszeresseg(gel)?\b': Frequency.MONTHLY,
-        r'\bnegyed(ev|eve)nte\b': Frequency.QUARTERLY,
-        r'\bharomhav(onta|i)\b': Frequency.QUARTERLY,
-        r'\bminden negyed(ev|eve)ben\b': Frequency.QUARTERLY,
-        r'\bfel(ev|eve)nte\b': Frequency.EVERY_HALF_YEAR,
-        r'\bminden fel(ev|eve)ben\b': Frequency.EVERY_HALF_YEAR,
-        r'\b(ev|eve)nte\b': Frequency.YEARLY,
-        r'\bminden (ev|eve)ben\b': Frequency.YEARLY,
-        r'\b(ev|eve)(i|it|s)\b': Frequency.YEARLY,
-    }
-
-    for pattern, freq_value in frequency_map.items():
+    for pattern, freq_value in FREQUENCY_PATTERNS.items():
         match = re.search(pattern, s_no_accent)
         if match:
             return {
@@ -54,3 +56,38 @@ def parse_frequency(s: str) -> Optional[dict]:
             }
 
     return None
+
+
+def _join_alternatives(patterns: Iterable[Tuple[str, Frequency]]) -> Tuple[Pattern, Dict[int, Frequency]]:
+    """
+    Joins patterns into the alternatives of one pattern, the group of the alternative which matched is lastindex.
+    :param patterns: (pattern, frequency) pairs, at a position the first pattern which matches wins
+    :return: the pattern, and the frequency of the group of each alternative
+    """
+    alternatives, groups, index = [], {}, 1
+    for pattern, frequency in patterns:
+        alternatives.append(f'({pattern})')
+        groups[index] = frequency
+        index += 1 + re.compile(pattern).groups
+    return re.compile('|'.join(alternatives)), groups
+
+
+_FREQUENCY_RE, _FREQUENCY_GROUPS = _join_alternatives(FREQUENCY_PATTERNS.items())
+
+
+def scan_frequencies(s: str, folded: Optional[str] = None) -> List[dict]:
+    """
+    Returns every frequency expression of the input string in a single pass.
+    :param s: Input string containing the frequency information in Hungarian.
+    :param folded: s lowercased by lower_keep_positions and accent folded, if it is already at hand.
+    :return: List of dicts with the frequency value and the span in s, in the order of the text.
+    """
+    if folded is None:
+        folded = remove_accent(lower_keep_positions(s))
+
+    return [{
+        "frequency": _FREQUENCY_GROUPS[match.lastindex],  # type: ignore
+        "match_text": s[match.start():match.end()],
+        "match_start": match.start(),
+        "match_end": match.end()
+    } for match in _FREQUENCY_RE.finditer(folded)]
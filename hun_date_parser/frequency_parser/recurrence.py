@@ -0,0 +1,327 @@
+"""
+Recurrence extraction: the frequency of a text combined with its weekdays, time of day, day of month and bounds.
+
+    recurrence = parse_recurrence('kéthetente pénteken délután', now=datetime(2024, 5, 8))
+    recurrence.occurrences_between(datetime(2024, 6, 1), datetime(2024, 7, 1))
+    recurrence.to_rrule()  # dateutil.rrule.rrule with the same occurrences
+
+The text is lowercased and scanned once for the frequency triggers (the FREQUENCY_PATTERNS of parse_frequency, and
+"minden hétfőn", "keddenként", "minden este" which imply a daily or weekly frequency), and once by the date and time
+rules of the datetime extractor. The matches of the rules are the parts of the recurrence: weekdays, the time of day,
+the day of month (and month) of the monthly and yearly recurrences. Ordinals before the weekdays of a monthly or
+yearly recurrence ("havonta az első hétfőn", "az első és a harmadik kedden") select the weekdays of the month by
+position, a text with any other ordinal has no recurrence, as it can't be expressed with the parts. The rest of the
+dates are the bounds, a date followed by -tól/óta starts the recurrence, one followed by -ig ends it, any other date
+is the window of the recurrence.
+
+The occurrences follow the semantics of dateutil's rrule: the periods (days, weeks, months or years) are counted from
+the week (or month, year) of the start, every period yields its days which match the parts of the recurrence, and
+only the occurrences between the start and the end are kept.
+"""
+
+import re
+from calendar import monthrange
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from dateutil import rrule
+
+from hun_date_parser.frequency_parser.frequency_parsers import FREQUENCY_PATTERNS, Frequency, _join_alternatives
+from hun_date_parser.utils import SearchScopes, lower_keep_positions, remove_accent
+
+_WEEKDAY_STEMS = r'(hetfo|kedd|szerda|csutortok|pentek|szombat|vasarnap)'
+_DAYPARTS = r'(hajnal|reggel|delelott|delutan|este|ejjel|ejszaka)'
+
+_ORDINALS = {'elso': 1, 'masodik': 2, 'harmadik': 3, 'negyedik': 4, 'otodik': 5, 'utolso': -1}
+_ORDINAL_RE = re.compile(rf'\b({"|".join(_ORDINALS)})\b')
+# ordinals right before a weekday: "az első és a harmadik "
+_ORDINAL_RUN_RE = re.compile(rf'(?:\b(?:{"|".join(_ORDINALS)})\b(?:\s*,\s*|\s+(?:es|meg|vagy)\s+)?(?:az?\s+)?\s*)+$')
+
+# accent-free trigger patterns, the FREQUENCY_PATTERNS first, in order
+_TRIGGERS: List[Tuple[str, Frequency]] = list(FREQUENCY_PATTERNS.items()) + [
+    (rf'\bminden {_WEEKDAY_STEMS}\w*', Frequency.WEEKLY),
+    (rf'\b{_WEEKDAY_STEMS}\w*nkent\b', Frequency.WEEKLY),
+    (rf'\bminden {_DAYPARTS}\w*', Frequency.DAILY),
+]
+_TRIGGER_RE, _TRIGGER_GROUPS = _join_alternatives(_TRIGGERS)
+# groups of the triggers whose words are parts of the recurrence (the weekday of "minden hétfőn")
+_PART_TRIGGERS = set(list(_TRIGGER_GROUPS)[len(FREQUENCY_PATTERNS):])
+
+# rrule frequency and interval of each frequency
+_RRULE_FREQUENCIES = {
+    Frequency.DAILY: (rrule.DAILY, 1),
+    Frequency.WEEKLY: (rrule.WEEKLY, 1),
+    Frequency.FORTNIGHTLY: (rrule.WEEKLY, 2),
+    Frequency.MONTHLY: (rrule.MONTHLY, 1),
+    Frequency.QUARTERLY: (rrule.MONTHLY, 3),
+    Frequency.EVERY_HALF_YEAR: (rrule.MONTHLY, 6),
+    Frequency.YEARLY: (rrule.YEARLY, 1),
+}
+
+_TIME_RULES = ('time_words', 'digi_clock', 'hwords')
+
+# periods without any occurrence after which the occurrences are considered exhausted (february 30 every year)
+_MAX_EMPTY_PERIODS = 400
+
+
+@dataclass(frozen=True)
+class Recurrence:
+    """
+    A recurring event: the frequency and the parts which select the days and the time of its occurrences.
+    :param frequency: frequency of the periods
+    :param start: first possible occurrence, the start bound of the text or the reference time
+    :param until: last possible occurrence, None if the recurrence is not bounded
+    :param weekdays: weekdays of the occurrences (0 is monday), the weekday of start if empty for weekly recurrences
+    :param weekday_positions: positions of the weekdays in the month of the monthly and yearly occurrences (1 is the
+    first, -1 the last one), every matching day of the month if empty
+    :param time_of_day: time of the occurrences, midnight if None
+    :param month_day: day of month of the monthly and yearly occurrences, the day of start if None and no weekday
+    is given
+    :param month: month of the yearly occurrences, the month of start if None
+    :param match_start: start of the recurrence in the input text
+    :param match_end: end of the recurrence in the input text
+    """
+    frequency: Frequency
+    start: datetime
+    until: Optional[datetime] = None
+    weekdays: Tuple[int, ...] = ()
+    weekday_positions: Tuple[int, ...] = ()
+    time_of_day: Optional[time] = None
+    month_day: Optional[int] = None
+    month: Optional[int] = None
+    match_start: Optional[int] = None
+    match_end: Optional[int] = None
+
+    @property
+    def interval(self) -> int:
+        """Number of base periods (days, weeks or months) between two periods of the recurrence."""
+        return _RRULE_FREQUENCIES[self.frequency][1]
+
+    def _period_days(self, k: int) -> List[date]:
+        """Days of the k-th period counted from the period of start, in order."""
+        freq, interval = _RRULE_FREQUENCIES[self.frequency]
+        start = self.start.date()
+        if freq == rrule.DAILY:
+            day = start + timedelta(days=k * interval)
+            return [day] if not self.weekdays or day.weekday() in self.weekdays else []
+        if freq == rrule.WEEKLY:
+            monday = start - timedelta(days=start.weekday()) + timedelta(weeks=k * interval)
+            return [monday + timedelta(days=weekday) for weekday in sorted(self.weekdays or (start.weekday(),))]
+
+        if freq == rrule.YEARLY:
+            year, month = start.year + k, self.month or start.month
+        else:
+            year, month = divmod(start.year * 12 + start.month - 1 + k * interval, 12)
+            month += 1
+        n_days = monthrange(year, month)[1]
+        if self.weekdays:
+            days = [date(year, month, day) for day in range(1, n_days + 1)
+                    if date(year, month, day).weekday() in self.weekdays]
+            if self.weekday_positions:
+                selected = set()
+                for weekday in self.weekdays:
+                    same = [day for day in days if day.weekday() == weekday]
+                    for position in self.weekday_positions:
+                        index = position - 1 if position > 0 else position
+                        if -len(same) <= index < len(same):
+                            selected.add(same[index])
+                days = sorted(selected)
+            return [day for day in days if self.month_day in (None, day.day)]
+        month_day = self.month_day or start.day
+        return [date(year, month, month_day)] if month_day <= n_days else []
+
+    def _period_of(self, dt: datetime) -> int:
+        """Index of the period which contains dt (or the first one if dt is before start)."""
+        freq, interval = _RRULE_FREQUENCIES[self.frequency]
+        start = self.start.date()
+        if freq == rrule.DAILY:
+            k = (dt.date() - start).days // interval
+        elif freq == rrule.WEEKLY:
+            k = (dt.date() - (start - timedelta(days=start.weekday()))).days // (7 * interval)
+        elif freq == rrule.YEARLY:
+            k = dt.year - start.year
+        else:
+            k = ((dt.year - start.year) * 12 + dt.month - start.month) // interval
+        return max(0, k)
+
+    def occurrences(self, after: Optional[datetime] = None) -> Iterator[datetime]:
+        """
+        Lazily generates the occurrences of the recurrence, infinitely if it has no end.
+        :param after: the first occurrence generated is the first one at or after this time, the periods before it are
+        skipped without being generated
+        :return: iterator of the occurrences in order
+        """
+        lower = self.start if after is None or after < self.start else after
+        occurrence_time = self.time_of_day or time()
+        k, empty = self._period_of(lower), 0
+        while empty < _MAX_EMPTY_PERIODS:
+            days = self._period_days(k)
+            empty = 0 if days else empty + 1
+            for day in days:
+                occurrence = datetime.combine(day, occurrence_time)
+                if self.until is not None and occurrence > self.until:
+                    return
+                if occurrence >= lower:
+                    yield occurrence
+            k += 1
+
+    def occurrences_between(self, a: datetime, b: datetime) -> List[datetime]:
+        """
+        The occurrences in [a, b], the generation starts at the period of a.
+        :return: list of the occurrences in order
+        """
+        res = []
+        for occurrence in self.occurrences(after=a):
+            if occurrence > b:
+                break
+            res.append(occurrence)
+        return res
+
+    def to_rrule(self) -> rrule.rrule:
+        """
+        :return: dateutil rrule with the same occurrences
+        """
+        freq, interval = _RRULE_FREQUENCIES[self.frequency]
+        occurrence_time = self.time_of_day or time()
+        kwargs: Dict[str, Any] = {'byhour': occurrence_time.hour, 'byminute': occurrence_time.minute,
+                                  'bysecond': occurrence_time.second}
+        if self.weekdays:
+            kwargs['byweekday'] = sorted(self.weekdays) if not self.weekday_positions else \
+                [rrule.weekdays[weekday](position) for weekday in sorted(self.weekdays)
+                 for position in self.weekday_positions]
+        if freq in (rrule.MONTHLY, rrule.YEARLY) and (self.month_day or not self.weekdays):
+            kwargs['bymonthday'] = self.month_day or self.start.day
+        if freq == rrule.YEARLY:
+            kwargs['bymonth'] = self.month or self.start.month
+        return rrule.rrule(freq, dtstart=self.start, interval=interval, until=self.until, **kwargs)
+
+
+def _weekday(match: Dict[str, Any]) -> int:
+    year, month, day = (part.value for part in match['date_parts'][:3])
+    return date(year, month, day).weekday()
+
+
+def _time_of_day(matches: List[Dict[str, Any]]) -> Optional[time]:
+    """The most specific time of the matches: hour and minute before hour, hour before daypart."""
+    from hun_date_parser.date_parser.datetime_extractor import daypart_mapping
+
+    best: Optional[Tuple[int, time]] = None
+    for match in matches:
+        parts = {type(part).__name__: part.value for part in match['date_parts']}
+        if 'Hour' in parts:
+            candidate = (2 if 'Minute' in parts else 1, time(parts['Hour'] % 24, parts.get('Minute', 0)))
+        elif 'Daypart' in parts:
+            candidate = (0, time(daypart_mapping[parts['Daypart']][0]))
+        else:
+            continue
+        if best is None or candidate[0] > best[0]:
+            best = candidate
+    return best[1] if best else None
+
+
+def _without_overlaps(matches: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Leaves out the matches inside a longer match (the day of month of "március 15-én")."""
+    kept: List[Dict[str, Any]] = []
+    for match in sorted(matches, key=lambda m: (m['match_start'], -m['match_end'])):
+        if not kept or match['match_start'] >= kept[-1]['match_end']:
+            kept.append(match)
+    return kept
+
+
+def parse_recurrence(s: str, now: datetime = datetime.now(),
+                     search_scope: SearchScopes = SearchScopes.NOT_RESTRICTED) -> Optional[Recurrence]:
+    """
+    Extracts the recurrence of a Hungarian text ("minden hétfőn 9-kor", "kéthetente pénteken délután",
+    "havonta 15-én", "március 1-től május 31-ig hetente kedden").
+    :param s: Input string containing the recurrence.
+    :param now: Current timestamp to calculate relative dates, the start of the recurrence if it has no start bound.
+    :param search_scope: Search scope of the relative bounds.
+    :return: the recurrence, None if the text has no frequency
+    """
+    from hun_date_parser.date_parser.datetime_extractor import DatetimeExtractor, match_rules_with_spans
+
+    lowered = lower_keep_positions(s)
+    folded = remove_accent(lowered)
+
+    triggers = list(_TRIGGER_RE.finditer(folded))
+    if not triggers:
+        return None
+    trigger = min(triggers, key=lambda m: m.lastindex)  # type: ignore
+    frequency = _TRIGGER_GROUPS[trigger.lastindex]  # type: ignore
+
+    # the relative words inside a frequency trigger (minden héten) are not dates
+    within_trigger = trigger.lastindex not in _PART_TRIGGERS
+    matches = [m for m in match_rules_with_spans(now, lowered, search_scope)
+               if m['date_parts'] and not (within_trigger and trigger.start() <= m['match_start']
+                                           and m['match_end'] <= trigger.end() and m['match_end'] > m['match_start'])]
+
+    def rules(match: Dict[str, Any]) -> set:
+        return {part.rule for part in match['date_parts']}
+
+    weekday_matches = [m for m in matches if rules(m) == {'weekday'}]
+    time_matches = [m for m in matches if rules(m) <= set(_TIME_RULES)]
+    dates = _without_overlaps([m for m in matches if m not in weekday_matches and m not in time_matches])
+
+    # positions of the weekdays ("az első és a harmadik hétfőn"), the same ones for every weekday
+    positions: Set[int] = set()
+    ordinals_used: Set[int] = set()
+    ordinal_spans: List[Tuple[int, int]] = []
+    for match in weekday_matches:
+        run = _ORDINAL_RUN_RE.search(folded[:match['match_start']])
+        found = [] if run is None else list(_ORDINAL_RE.finditer(folded, run.start(), run.end()))
+        if positions and {_ORDINALS[o.group()] for o in found} != positions:
+            return None
+        positions = {_ORDINALS[o.group()] for o in found}
+        ordinals_used.update(o.start() for o in found)
+        if found:
+            ordinal_spans.append((found[0].start(), match['match_start']))
+    monthly = frequency not in (Frequency.DAILY, Frequency.WEEKLY, Frequency.FORTNIGHTLY)
+    if any(o.start() not in ordinals_used for o in _ORDINAL_RE.finditer(folded)) or (positions and not monthly):
+        # an ordinal of something else than a weekday (az első napon), or of a weekday of a week
+        return None
+
+    month_day, month = None, None
+    if monthly:
+        for match in dates:
+            parts = {type(part).__name__: part.value for part in match['date_parts']}
+            if set(parts) == {'Day'} or (frequency == Frequency.YEARLY and set(parts) == {'Month', 'Day'}):
+                month_day, month = parts['Day'], parts.get('Month')
+                dates.remove(match)
+                break
+            if frequency == Frequency.YEARLY and positions and set(parts) == {'Month'}:
+                # the month of "évente március első vasárnapján"
+                month = parts['Month']
+                dates.remove(match)
+                break
+
+    # the rest of the dates are the bounds, grouped until a -tól/óta or an -ig suffix
+    extractor = DatetimeExtractor(now=now, search_scope=search_scope)
+    start, until = None, None
+    group: List[Any] = []
+    for i, match in enumerate(dates):
+        group += match['date_parts']
+        suffix = re.match(r'\S*', folded[match['match_end']:]).group()  # type: ignore
+        if suffix.endswith(('tol', 'ota')):
+            start, group = extractor.assemble_datetime(now, group, bottom=True), []
+        elif suffix.endswith('ig'):
+            until, group = extractor.assemble_datetime(now, group, bottom=False), []
+        elif i == len(dates) - 1 or dates[i + 1]['match_start'] - match['match_end'] > 1:
+            if start is None:
+                start = extractor.assemble_datetime(now, group, bottom=True)
+            if until is None:
+                until = extractor.assemble_datetime(now, group, bottom=False)
+            group = []
+
+    spans = [trigger.span()] + ordinal_spans + [(m['match_start'], m['match_end']) for m in matches
+                                                if m['match_end'] > m['match_start']]
+    return Recurrence(frequency=frequency,
+                      start=(start or now).replace(microsecond=0),
+                      until=until,
+                      weekdays=tuple(sorted({_weekday(m) for m in weekday_matches})),
+                      weekday_positions=tuple(sorted(positions, key=lambda position: (position < 0, position))),
+                      time_of_day=_time_of_day(time_matches),
+                      month_day=month_day,
+                      month=month,
+                      match_start=min(span[0] for span in spans),
+                      match_end=max(span[1] for span in spans))
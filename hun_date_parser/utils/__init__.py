@@ -2,7 +2,8 @@ from hun_date_parser.utils.general_utils import (
     Year, Month, Week, Day, Daypart, Hour, Minute, OverrideTopWithNow, OverrideBottomWithNow, DateTimePartConatiner,
     MinuteOffset, HourOffset, DayOffset, MonthOffset, YearOffset, StartDay, EndDay, get_type_if_exists,
     SearchScopes, monday_of_calenderweek, return_on_value_error, num_to_word, word_to_num, remove_accent,
-    is_smaller_date_or_none, is_year_realistic)
+    lower_keep_positions, is_smaller_date_or_none, is_year_realistic)
+from hun_date_parser.utils.calendar_index import CalendarIndex, calendar_index
 from hun_date_parser.utils.duration_utils import (apply_offsets_and_return_components, filter_offset_objects)
 
 
@@ -10,7 +11,8 @@ __all__ = [
     "Year", "Month", "Week", "Day", "Daypart", "Hour", "Minute", "OverrideTopWithNow",
     "SearchScopes", "OverrideBottomWithNow", "monday_of_calenderweek",
     "DateTimePartConatiner", "return_on_value_error", "num_to_word", "word_to_num", "remove_accent",
-    "MinuteOffset", "HourOffset", "DayOffset", "MonthOffset", "YearOffset",
+    "lower_keep_positions", "MinuteOffset", "HourOffset", "DayOffset", "MonthOffset", "YearOffset",
     "apply_offsets_and_return_components", "filter_offset_objects",
-    "StartDay", "EndDay", "get_type_if_exists", "is_smaller_date_or_none", "is_year_realistic"
+    "StartDay", "EndDay", "get_type_if_exists", "is_smaller_date_or_none", "is_year_realistic",
+    "CalendarIndex", "calendar_index"
 ]
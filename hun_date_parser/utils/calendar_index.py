@@ -0,0 +1,174 @@
+"""
+Calendar arithmetic precomputed for the supported year range (see is_year_realistic).
+
+The index stores per year and per month values in flat arrays, so ISO weeks, month lengths, day-of-year and weekday
+lookups need no date object construction. Years outside the range are computed with the datetime and calendar
+modules, raising the same errors as before.
+"""
+
+import calendar
+from array import array
+from datetime import date, timedelta
+from typing import Any, Optional, Tuple
+
+FIRST_YEAR = 1900
+LAST_YEAR = 2100
+
+# datetime64[D] counts days from 1970-01-01
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+class CalendarIndex:
+    """Array backed calendar lookups for the years first_year..last_year (inclusive)."""
+
+    def __init__(self, first_year: int = FIRST_YEAR, last_year: int = LAST_YEAR) -> None:
+        self.first_year = first_year
+        self.last_year = last_year
+
+        # ordinal of the first day of each year, one year beyond the range on both sides for the ISO week lookups
+        self.year_start = array('l', [date(y, 1, 1).toordinal() for y in range(first_year - 1, last_year + 3)])
+        # ordinal of the Monday of ISO week 1 of each year, same layout as year_start
+        self.week_one_monday = array('l', [date.fromisocalendar(y, 1, 1).toordinal()
+                                           for y in range(first_year - 1, last_year + 3)])
+        # month lengths and the day-of-year of the first day of each month, indexed by 12 * year offset + month - 1
+        self.month_length_table = array('B')
+        self.month_start_doy = array('H')
+        for y in range(first_year, last_year + 1):
+            doy = 1
+            for m in range(1, 13):
+                length = calendar.monthrange(y, m)[1]
+                self.month_length_table.append(length)
+                self.month_start_doy.append(doy)
+                doy += length
+
+    def contains(self, year: int) -> bool:
+        return self.first_year <= year <= self.last_year
+
+    def _month_index(self, year: int, month: int) -> int:
+        if not 1 <= month <= 12:
+            raise calendar.IllegalMonthError(month)
+        return 12 * (year - self.first_year) + month - 1
+
+    def month_length(self, year: int, month: int) -> int:
+        """Number of days in the month, same as calendar.monthrange(year, month)[1]."""
+        if not self.contains(year):
+            return calendar.monthrange(year, month)[1]
+        return self.month_length_table[self._month_index(year, month)]
+
+    def day_of_year(self, year: int, month: int, day: int) -> int:
+        """1-based day of the year, raises ValueError for invalid dates."""
+        if not self.contains(year) or not 1 <= day <= self.month_length(year, month):
+            return date(year, month, day).timetuple().tm_yday
+        return self.month_start_doy[self._month_index(year, month)] + day - 1
+
+    def ordinal(self, year: int, month: int, day: int) -> int:
+        """Proleptic Gregorian ordinal of the date, same as date(year, month, day).toordinal()."""
+        if not self.contains(year):
+            return date(year, month, day).toordinal()
+        return self.year_start[year - self.first_year + 1] + self.day_of_year(year, month, day) - 1
+
+    @staticmethod
+    def weekday(ordinal: int) -> int:
+        """Weekday of an ordinal, Monday is 0."""
+        return (ordinal - 1) % 7
+
+    def monday_of_week(self, year: int, week: int) -> date:
+        """Monday of the ISO calendar week, weeks outside 1..53 are counted from week 1 of the year."""
+        if not self.contains(year):
+            first = date(year, 1, 1)
+            base = 1 if first.isocalendar()[1] == 1 else 8
+            return first + timedelta(days=base - first.isocalendar()[2] + 7 * (week - 1))
+        return date.fromordinal(self.week_one_monday[year - self.first_year + 1]) + timedelta(days=7 * (week - 1))
+
+    def iso_year_week(self, ordinal: int) -> Tuple[int, int]:
+        """ISO year and week number of an ordinal, same as date.fromordinal(ordinal).isocalendar()[0:2]."""
+        i = self._year_offset(ordinal)
+        if i is None:
+            iso = date.fromordinal(ordinal).isocalendar()
+            return iso[0], iso[1]
+
+        if ordinal < self.week_one_monday[i]:
+            i -= 1
+        elif ordinal >= self.week_one_monday[i + 1]:
+            i += 1
+
+        return self.first_year + i - 1, (ordinal - self.week_one_monday[i]) // 7 + 1
+
+    def _year_offset(self, ordinal: int) -> Optional[int]:
+        """Index of the year of the ordinal in year_start, None outside of the range."""
+        if not self.year_start[1] <= ordinal < self.year_start[-2]:
+            return None
+
+        # the Gregorian year is at most one off from the estimate
+        i = int((ordinal - self.year_start[1]) / 365.2425) + 1
+        if ordinal < self.year_start[i]:
+            i -= 1
+        elif ordinal >= self.year_start[i + 1]:
+            i += 1
+        return i
+
+    def to_numpy(self) -> 'NumpyCalendarIndex':
+        return NumpyCalendarIndex(self)
+
+
+class NumpyCalendarIndex:
+    """
+    Vectorized variant of CalendarIndex for batch resolution, all methods take and return numpy arrays.
+    Values outside of the year range are clipped, use in_range to mask them.
+    """
+
+    def __init__(self, index: CalendarIndex) -> None:
+        try:
+            import numpy as np
+        except ImportError as e:
+            raise ImportError('The vectorized calendar index requires numpy (pip install numpy).') from e
+
+        self.np = np
+        self.first_year = index.first_year
+        self.last_year = index.last_year
+        self.year_start = np.asarray(index.year_start, dtype=np.int64) - _EPOCH_ORDINAL
+        self.week_one_monday = np.asarray(index.week_one_monday, dtype=np.int64) - _EPOCH_ORDINAL
+        self.month_length_table = np.asarray(index.month_length_table, dtype=np.int64).reshape(-1, 12)
+        self.month_start_doy = np.asarray(index.month_start_doy, dtype=np.int64).reshape(-1, 12)
+
+    def in_range(self, years: Any) -> Any:
+        years = self.np.asarray(years)
+        return (years >= self.first_year) & (years <= self.last_year)
+
+    def _year_index(self, years: Any) -> Any:
+        return self.np.clip(self.np.asarray(years) - self.first_year, 0, self.last_year - self.first_year)
+
+    def month_length(self, years: Any, months: Any) -> Any:
+        months = self.np.clip(self.np.asarray(months), 1, 12)
+        return self.month_length_table[self._year_index(years), months - 1]
+
+    def day_of_year(self, years: Any, months: Any, days: Any) -> Any:
+        months = self.np.clip(self.np.asarray(months), 1, 12)
+        return self.month_start_doy[self._year_index(years), months - 1] + self.np.asarray(days) - 1
+
+    def to_datetime64(self, years: Any, months: Any, days: Any) -> Any:
+        """datetime64[D] array of the dates, days beyond the end of the month roll over."""
+        year_start = self.year_start[self._year_index(years) + 1]
+        return (year_start + self.day_of_year(years, months, days) - 1).astype('datetime64[D]')
+
+    def weekday(self, days: Any) -> Any:
+        """Weekday of a datetime64[D] array, Monday is 0 (1970-01-01 was a Thursday)."""
+        return (self.np.asarray(days, dtype='datetime64[D]').astype(self.np.int64) + 3) % 7
+
+    def monday_of_week(self, years: Any, weeks: Any) -> Any:
+        monday = self.week_one_monday[self._year_index(years) + 1] + 7 * (self.np.asarray(weeks) - 1)
+        return monday.astype('datetime64[D]')
+
+    def iso_year_week(self, days: Any) -> Tuple[Any, Any]:
+        """ISO years and week numbers of a datetime64[D] array."""
+        np = self.np
+        days = np.asarray(days, dtype='datetime64[D]')
+        day_num = days.astype(np.int64)
+        i = (days.astype('datetime64[Y]').astype(np.int64) + 1970 - self.first_year + 1)
+        i = np.clip(i, 1, len(self.year_start) - 3)
+
+        i = i - (day_num < self.week_one_monday[i]) + (day_num >= self.week_one_monday[i + 1])
+        return self.first_year + i - 1, (day_num - self.week_one_monday[i]) // 7 + 1
+
+
+calendar_index = CalendarIndex()
@@ -1,9 +1,11 @@
 from copy import copy
-from datetime import date, timedelta, datetime
+from datetime import datetime
 from enum import Enum
 from dataclasses import dataclass
 from typing import Optional
 
+from hun_date_parser.utils.calendar_index import calendar_index
+
 
 @dataclass
 class DateTimePartConatiner:
@@ -110,23 +112,24 @@ def is_year_realistic(year: int) -> bool:
     return 1900 < year < 2100
 
 
+_ACCENTS = (('á', 'a'), ('é', 'e'), ('í', 'i'), ('ó', 'o'), ('ú', 'u'), ('ö', 'o'), ('ü', 'u'), ('ő', 'o'), ('ű', 'u'))
+
+
 def remove_accent(s: str):
-    mapping = {'á': 'a',
-               'é': 'e',
-               'í': 'i',
-               'ó': 'o',
-               'ú': 'u',
-               'ö': 'o',
-               'ü': 'u',
-               'ő': 'o',
-               'ű': 'u'}
-
-    for a, b in mapping.items():
+    for a, b in _ACCENTS:
         s = s.replace(a, b)
 
     return s
 
 
+def lower_keep_positions(s: str) -> str:
+    """Lowercase text with the character positions of s (the few characters which lowercase to several are kept)."""
+    lowered = s.lower()
+    if len(lowered) != len(s):
+        lowered = ''.join(c.lower() if len(c.lower()) == 1 else c for c in s)
+    return lowered
+
+
 def word_to_num(s: str):
 
     for w in s.split():
@@ -226,9 +229,7 @@ def num_to_word(num: int):
 
 
 def monday_of_calenderweek(year, week):
-    first = date(year, 1, 1)
-    base = 1 if first.isocalendar()[1] == 1 else 8
-    return first + timedelta(days=base - first.isocalendar()[2] + 7 * (week - 1))
+    return calendar_index.monday_of_week(year, week)
 
 
 def return_on_value_error(value):
@@ -26,7 +26,9 @@ setuptools.setup(
     long_description_content_type="text/markdown",
     url="https://github.com/szegedai/hun-date-parser",
     install_requires=install_requires,
+    extras_require={'numpy': ['numpy'], 'arrow': ['numpy', 'pyarrow'], 'pandas': ['numpy', 'pandas']},
     packages=setuptools.find_packages(),
+    entry_points={'console_scripts': ['hun-date-parser=hun_date_parser.batch.cli:main']},
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: MIT License",
@@ -0,0 +1,48 @@
+import pytest
+from datetime import datetime
+
+from hun_date_parser import analyze, text2datetime_with_spans, parse_durations_with_spans, parse_frequency
+from hun_date_parser.frequency_parser import Frequency
+from hun_date_parser.frequency_parser.frequency_parsers import scan_frequencies
+from hun_date_parser.batch.synthetic import sentences as synthetic_sentences
+
+from benchmarks.corpus import all_sentences
+
+now = datetime(2024, 5, 8, 10, 30)
+
+
+def _without_text(results):
+    return [{k: v for k, v in result.items() if k != 'match_text'} for result in results]
+
+
+@pytest.mark.parametrize("text", all_sentences()[:300] + synthetic_sentences(300, seed=5))
+def test_same_as_parsers(text):
+    analysis = analyze(text, now)
+    assert _without_text(analysis.dates) == _without_text(text2datetime_with_spans(text, now))
+    assert analysis.durations == parse_durations_with_spans(text)
+    if text == text.strip():
+        assert bool(analysis.frequencies) == (parse_frequency(text) is not None)
+
+
+tf_spans = [
+    ("Jövő héttől hetente kétszer edzek 45 percet", [(0, 8, 'date'), (12, 19, 'frequency'), (34, 43, 'duration')]),
+    ("Holnaptól 5 napig minden nap 2 órát", [(0, 35, 'date'), (18, 28, 'frequency'), (29, 35, 'duration')]),
+    ("  HAVONTA 30 percet", [(2, 9, 'frequency'), (10, 19, 'duration')]),
+    ("Szia, mi újság?", []),
+    ("", []),
+]
+
+
+@pytest.mark.parametrize("text,spans", tf_spans)
+def test_spans(text, spans):
+    analysis = analyze(text, now)
+    assert analysis.spans() == spans
+    for result in analysis.dates + analysis.durations + analysis.frequencies:
+        assert result['match_text'] == text[result['match_start']:result['match_end']]
+
+
+def test_scan_frequencies():
+    assert scan_frequencies("Hetente kétszer, évente egyszer") == [
+        {'frequency': Frequency.WEEKLY, 'match_text': 'Hetente', 'match_start': 0, 'match_end': 7},
+        {'frequency': Frequency.YEARLY, 'match_text': 'évente', 'match_start': 17, 'match_end': 23}]
+    assert scan_frequencies("holnap") == []
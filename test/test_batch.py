@@ -0,0 +1,137 @@
+import pytest
+from datetime import datetime
+
+from hun_date_parser import text2datetime, text2date, text2datetime_with_spans
+from hun_date_parser.utils import SearchScopes
+
+from hun_date_parser.batch import resolve_datetime, parse_many
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+requires_numpy = pytest.mark.skipif(np is None, reason='numpy is not installed')
+
+if np is not None:
+    nows = np.concatenate([
+        np.datetime64('2020-12-27T10:15:30') + np.arange(0, 3 * 86400, 3 * 3600 + 17).astype('timedelta64[s]'),
+        np.array(['2020-02-29T23:59:59', '2021-12-31T00:00:00', '2023-01-01T12:00:00'], dtype='datetime64[s]'),
+    ])
+
+resolution_scenarios = [
+    'holnap reggel',
+    'jövő kedden 8-kor',
+    'múlt héten',
+    'jövő hét',
+    'most',
+    'az elmúlt 3 órában',
+    'tegnap éjjel',
+    'február végén',
+    'január 5-től február 3-ig',
+    'holnaptól 5 napig',
+    'jövő hónap',
+    '2021 januárig',
+    '10 perccel 8 előtt',
+    'este fél 9-kor',
+    'ma 8-tól 10-ig és holnap',
+    'nincs benne dátum',
+]
+
+
+@requires_numpy
+@pytest.mark.parametrize("sentence", resolution_scenarios)
+@pytest.mark.parametrize("search_scope", list(SearchScopes))
+def test_resolve_datetime(sentence, search_scope):
+    resolved = resolve_datetime(sentence, nows, search_scope=search_scope)
+    for i, now in enumerate(nows):
+        assert resolved.to_list(i) == text2datetime(sentence, now=now.item(), search_scope=search_scope)
+
+
+@requires_numpy
+@pytest.mark.parametrize("sentence", resolution_scenarios)
+def test_resolve_date(sentence):
+    resolved = resolve_datetime(sentence, nows, output_container='date')
+    for i, now in enumerate(nows):
+        assert resolved.to_list(i) == text2date(sentence, now=now.item())
+
+
+@requires_numpy
+def test_resolve_datetime_arrays():
+    resolved = resolve_datetime('holnap reggel vagy jövő héten', ['2020-12-27T10:00', datetime(2021, 3, 1, 18, 30)])
+    assert resolved.start.shape == resolved.end.shape == resolved.valid.shape == (2, 2)
+    assert resolved.start.dtype == np.dtype('datetime64[s]')
+    assert resolved.start[1, 0] == np.datetime64('2021-03-02T06:00:00')
+    assert resolved.end[1, 0] == np.datetime64('2021-03-02T10:59:59')
+
+
+@requires_numpy
+@pytest.mark.parametrize("nows_, output_container", [
+    (['2020-01-01', 'NaT'], 'datetime'),
+    ([['2020-01-01']], 'datetime'),
+    (['2020-01-01'], 'time'),
+])
+def test_resolve_datetime_invalid_input(nows_, output_container):
+    with pytest.raises(ValueError):
+        resolve_datetime('holnap', np.array(nows_, dtype='datetime64[s]'), output_container=output_container)
+
+
+many_now = datetime(2021, 3, 1, 18, 30)
+
+
+def test_parse_many_records():
+    sentences = resolution_scenarios + resolution_scenarios[:3]
+    assert parse_many(sentences, now=many_now) == [text2datetime_with_spans(s, now=many_now) for s in sentences]
+
+
+def test_parse_many_nows():
+    sentences = ['holnap', 'holnap', 'kedden']
+    sentence_nows = [datetime(2020, 1, 1), datetime(2021, 1, 1), datetime(2021, 1, 1)]
+    assert parse_many(sentences, now=sentence_nows) == [text2datetime_with_spans(s, now=now)
+                                                        for s, now in zip(sentences, sentence_nows)]
+
+
+@requires_numpy
+def test_parse_many_numpy():
+    sentences = ['holnap délután 3-kor és jövő héten', 'nincs benne dátum', 'kedd óta', 'holnaptól']
+    columns = parse_many(sentences, now=many_now, output='numpy')
+
+    assert list(columns.offsets) == [0, 2, 2, 3, 4]
+    assert list(columns.input_index) == [0, 0, 2, 3]
+    assert columns.start[0] == np.datetime64('2021-03-02T15:00:00')
+    assert columns.end[1] == np.datetime64('2021-03-14T23:59:59')
+    assert np.isnat(columns.end[2]) and np.isnat(columns.end[3])
+    assert list(columns.match_start) == [0, 24, 0, 0]
+    assert list(columns.match_end) == [20, 32, 4, 6]
+    assert list(columns.rule) == ['relative_day,time_words', 'week', 'weekday', 'relative_day']
+
+
+@requires_numpy
+def test_parse_many_arrow():
+    pa = pytest.importorskip('pyarrow')
+    sentences = ['kedd óta', 'nincs benne dátum', 'ma 8-tól 10-ig és holnap']
+
+    table = parse_many(sentences, now=many_now, output='arrow', output_container='date')
+    assert table.column_names == ['input_index', 'start', 'end', 'match_start', 'match_end', 'rule']
+    assert table.schema.field('start').type == pa.date32()
+    assert table.column('input_index').to_pylist() == [0, 2, 2]
+    assert table.column('end').null_count == 1
+
+    nested = parse_many(sentences, now=many_now, output='numpy').to_arrow(nested=True)
+    assert nested.num_rows == 3
+    assert [len(intervals) for intervals in nested.column('intervals').to_pylist()] == [1, 0, 2]
+
+
+@pytest.mark.parametrize("kwargs", [
+    {'output': 'json'},
+    {'output_container': 'time'},
+    {'now': [many_now]},
+])
+def test_parse_many_invalid_input(kwargs):
+    with pytest.raises(ValueError):
+        parse_many(['holnap', 'ma'], **kwargs)
+
+
+def test_parse_many_workers():
+    sentences = [f'{i} nap múlva' for i in range(300)] + resolution_scenarios
+    assert parse_many(sentences, now=many_now, workers=2) == parse_many(sentences, now=many_now)
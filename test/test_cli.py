@@ -0,0 +1,77 @@
+import io
+import json
+import pytest
+
+from hun_date_parser.batch.cli import main
+from hun_date_parser.batch.metrics import percentile, SizeHistogram
+
+texts = ['holnap reggel 8-kor', 'Szia, mi újság?', 'hetente kétszer 30 percet', '', 'jövő kedden 3-kor']
+
+
+def _run(capsys, argv, stdin=None, monkeypatch=None):
+    if stdin is not None:
+        monkeypatch.setattr('sys.stdin', io.StringIO(stdin))
+    assert main(argv) == 0
+    captured = capsys.readouterr()
+    return [json.loads(line) for line in captured.out.splitlines()], json.loads(captured.err)['stats']
+
+
+def test_text_input(tmp_path, capsys):
+    path = tmp_path / 'in.txt'
+    path.write_text('\n'.join(texts) + '\n', encoding='utf-8')
+    lines, stats = _run(capsys, [str(path), '--now', '2024-05-08T10:00:00'])
+
+    assert [line['record'] for line in lines] == [1, 2, 3, 4, 5]
+    assert [line['text'] for line in lines] == texts
+    assert lines[0]['results'] == [{'start_date': '2024-05-09T08:00:00', 'end_date': '2024-05-09T08:59:59',
+                                    'match_text': 'holnap reggel 8-kor', 'match_start': 0, 'match_end': 19}]
+    assert stats['items'] == 5 and stats['errors'] == 0
+    assert set(stats['latency_ms']) == {'p50', 'p90', 'p99', 'max'}
+
+
+def test_jsonl_stdin(capsys, monkeypatch):
+    stdin = '\n'.join([json.dumps({'text': 'holnap', 'now': '2024-01-01T00:00:00'}), json.dumps({'text': 'ma'}),
+                       'not json', json.dumps({'text': 'ma', 'now': 'yesterday'})]) + '\n'
+    lines, stats = _run(capsys, ['--format', 'jsonl', '--mode', 'date', '--now', '2024-05-08T10:00:00'],
+                        stdin, monkeypatch)
+
+    assert lines[0]['results'][0]['start_date'] == '2024-01-02'
+    assert lines[1]['results'][0]['start_date'] == '2024-05-08'
+    assert 'error' in lines[2] and 'error' in lines[3]
+    assert stats['errors'] == 2
+
+
+def test_csv_modes(tmp_path, capsys):
+    path = tmp_path / 'in.csv'
+    path.write_text('id,body\n1,"hetente, 30 percet"\n', encoding='utf-8')
+
+    lines, _ = _run(capsys, [str(path), '--text-field', 'body', '--mode', 'duration'])
+    assert lines[0]['results'][0]['minutes'] == 30
+    lines, _ = _run(capsys, [str(path), '--text-field', 'body', '--mode', 'frequency'])
+    assert lines[0]['results'] == [{'frequency': 'WEEKLY', 'match_text': 'hetente', 'match_start': 0, 'match_end': 7}]
+    lines, _ = _run(capsys, [str(path), '--text-field', 'body', '--mode', 'analyze'])
+    assert set(lines[0]['results']) == {'dates', 'durations', 'frequencies'}
+
+
+def test_workers(tmp_path, capsys):
+    path = tmp_path / 'in.txt'
+    path.write_text('\n'.join(texts * 4) + '\n', encoding='utf-8')
+    argv = [str(path), '--now', '2024-05-08T10:00:00', '--mode', 'analyze', '--chunk-size', '3']
+
+    single, _ = _run(capsys, argv)
+    parallel, stats = _run(capsys, argv + ['--workers', '2'])
+    assert parallel == single and stats['items'] == len(texts) * 4
+
+
+@pytest.mark.parametrize("values,q,expected", [
+    ([], 50, 0.0), ([1.0], 99, 1.0), ([1.0, 2.0, 3.0, 4.0], 50, 2.0), ([float(i) for i in range(1, 101)], 99, 99.0)])
+def test_percentile(values, q, expected):
+    assert percentile(values, q) == expected
+
+
+def test_size_histogram():
+    histogram = SizeHistogram()
+    for size in (1, 2, 3, 4, 5, 64):
+        histogram.add(size)
+    assert histogram.to_dict() == {'count': 6, 'total': 79, 'mean': 13.1667,
+                                   'histogram': {'1': 1, '2': 1, '4': 2, '8': 1, '64': 1}}
@@ -1,7 +1,8 @@
 import pytest
 from datetime import datetime
 
-from hun_date_parser.duration_parser.duration_parsers import duration_parser, parse_duration, parse_duration_with_spans, DurationUnit
+from hun_date_parser.duration_parser.duration_parsers import (duration_parser, parse_duration, parse_duration_with_spans,
+                                                              parse_durations_with_spans, DurationUnit)
 from hun_date_parser.utils import Minute, Hour, Day, Week, Year
 
 
@@ -347,3 +348,51 @@ def test_max_duration_with_spans():
     assert result["match_start"] == 0
     assert result["match_end"] == 13
     assert result["minutes"] == "max"
+
+
+tf_every_duration = [
+    ("foglald le 2 órára, utána 3 napra és 45 percre", [("2 órára", 11, 120), ("3 napra", 26, 4320),
+                                                        ("45 percre", 37, 45)]),
+    ("két hétre, aztán még 10 percre", [("két hétre", 0, 20160), ("10 percre", 21, 10)]),
+    ("egy óra 30 percet vagy másfél órát", [("egy óra 30 percet", 0, 90), ("másfél órát", 23, 90)]),
+    ("   amíg csak lehet   ", [("amíg csak lehet", 3, "max")]),
+    ("3 óra 20 percet, 2 órás", [("3 óra 20 percet", 0, 200), ("2 órás", 17, 120)]),
+    # the hour and minute fallbacks are matched on the text as it is
+    ("MÁSFÉL ÓRA", []),
+    ("19 háromnegyed órát", [("háromnegyed órát", 3, 45)]),
+    # the unrealistic hours are left out, but they still hide the minutes from parse_duration
+    ("100 órára 5 perc", [("5 perc", 10, 5)]),
+    ("jövő kedd", []),
+]
+
+
+@pytest.mark.parametrize("inp, exp", tf_every_duration)
+def test_parse_durations_with_spans(inp, exp):
+    results = parse_durations_with_spans(inp)
+    assert [(r['match_text'], r['match_start'], r['minutes']) for r in results] == exp
+    assert all(inp[r['match_start']:r['match_end']] == r['match_text'] for r in results)
+
+    first = parse_duration_with_spans(inp)
+    assert first is None or first in results
+    assert parse_duration(inp) == (first['minutes'] if first else None)
+
+
+tf_fallback_durations = [
+    ("8 húsz perckor", None),
+    ("este háromnegyed 8 előtt két perccel", None),
+    ("este tíz óra ötven perc", 600),
+    ("reggel hét óra tíz perckor", 420),
+    ("Három óra húsz percet", None),
+    ("három óra húsz percet", 180),
+]
+
+
+@pytest.mark.parametrize("inp, exp", tf_fallback_durations)
+def test_fallback_durations(inp, exp):
+    assert parse_duration(inp) == exp
+
+
+def test_parse_durations_with_spans_preferred_unit():
+    results = parse_durations_with_spans("2 évre vagy 3 órára", return_preferred_unit=True)
+    assert [(r['value'], r['unit']) for r in results] == [(2, 'year'), (3, 'hour')]
+    assert parse_duration_with_spans("2 évre vagy 3 órára", return_preferred_unit=True) == results[0]
@@ -0,0 +1,81 @@
+import pytest
+from datetime import datetime
+
+from hun_date_parser.batch import parse_file, parse_many
+from hun_date_parser.batch.file_parsing import line_ranges
+
+now = datetime(2021, 3, 1, 10)
+lines = [f'{i} nap múlva' for i in range(200)] + [
+    'holnap délután 3-kor és jövő héten', 'nincs benne dátum', '', 'kedd óta', 'holnaptól', 'árvíztűrő tükörfúrógép',
+    'január 5-től február 3-ig',
+] * 10
+
+
+@pytest.fixture(scope='module')
+def dump(tmp_path_factory):
+    path = tmp_path_factory.mktemp('files') / 'dump.txt'
+    path.write_bytes(b''.join(line.encode('utf-8') + (b'\r\n' if i % 3 else b'\n') for i, line in enumerate(lines)))
+    return path
+
+
+@pytest.mark.parametrize("content,chunk_bytes,expected", [
+    (b'', 4, []),
+    (b'abc', 4, [(0, 3)]),
+    (b'ab\ncd\nef\n', 1, [(0, 3), (3, 6), (6, 9)]),
+    (b'ab\ncd\nef\n', 3, [(0, 3), (3, 6), (6, 9)]),
+    (b'ab\ncd\nef\n', 4, [(0, 6), (6, 9)]),
+    (b'ab\ncd\nef', 100, [(0, 8)]),
+    (b'\n\n\n', 1, [(0, 1), (1, 2), (2, 3)]),
+])
+def test_line_ranges(tmp_path, content, chunk_bytes, expected):
+    path = tmp_path / 'lines.txt'
+    path.write_bytes(content)
+    assert line_ranges(path, chunk_bytes) == expected
+
+
+@pytest.mark.parametrize("workers,chunk_bytes", [(1, 1 << 22), (1, 100), (2, 500)])
+def test_records(dump, workers, chunk_bytes):
+    records = list(parse_file(dump, now, workers=workers, chunk_bytes=chunk_bytes))
+    assert [intervals for _, _, intervals in records] == parse_many(lines, now)
+    assert [number for number, _, _ in records] == list(range(1, len(lines) + 1))
+
+    content = dump.read_bytes()
+    for number, offset, _ in records:
+        assert content[offset:].split(b'\n', 1)[0].decode('utf-8').rstrip('\r') == lines[number - 1]
+
+
+@pytest.mark.parametrize("output_container", ['datetime', 'date'])
+def test_numpy(dump, output_container):
+    np = pytest.importorskip('numpy')
+    expected = parse_many(lines, now, output_container=output_container, output='numpy')
+    columns = parse_file(dump, now, output_container=output_container, output='numpy', workers=2, chunk_bytes=700)
+
+    assert columns.num_lines == len(lines) and len(columns) == len(expected)
+    assert list(columns.line_number) == list(expected.input_index + 1)
+    for name in ('match_start', 'match_end', 'rule'):
+        assert list(getattr(columns, name)) == list(getattr(expected, name))
+    for name in ('start', 'end'):
+        assert np.array_equal(getattr(columns, name), getattr(expected, name), equal_nan=True)
+
+
+def test_empty_file_and_errors(dump, tmp_path):
+    empty = tmp_path / 'empty.txt'
+    empty.write_bytes(b'')
+    assert list(parse_file(empty, now)) == []
+
+    with pytest.raises(ValueError):
+        parse_file(dump, now, output='json')
+    with pytest.raises(ValueError):
+        parse_file(dump, now, chunk_bytes=0)
+
+
+def test_arrow(dump, tmp_path):
+    pytest.importorskip('numpy')
+    pytest.importorskip('pyarrow')
+    table = parse_file(dump, now, output='arrow')
+    assert table.column_names == ['line_number', 'byte_offset', 'start', 'end', 'match_start', 'match_end', 'rule']
+    assert table.num_rows == len(parse_file(dump, now, output='numpy'))
+
+    empty = tmp_path / 'empty.txt'
+    empty.write_bytes(b'')
+    assert len(parse_file(empty, now, output='numpy')) == 0
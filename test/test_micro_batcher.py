@@ -0,0 +1,54 @@
+import asyncio
+import pytest
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from hun_date_parser import text2datetime_with_spans, text2date_with_spans
+from hun_date_parser.batch import MicroBatcher
+
+texts = [f'{text} {i}' for i in range(40) for text in ('holnap reggel 8-kor', 'jövő kedden', 'Szia')]
+now = datetime(2024, 5, 8, 10)
+
+
+def _parse_all(batcher, texts):
+    async def run():
+        async with batcher:
+            return await asyncio.gather(*[batcher.parse(text, now) for text in texts])
+
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize("max_batch_size", [1, 7, 1000])
+def test_same_as_text2datetime(max_batch_size):
+    batcher = MicroBatcher(max_batch_size=max_batch_size, max_wait_ms=5, max_concurrent_batches=2)
+    assert _parse_all(batcher, texts) == [text2datetime_with_spans(text, now) for text in texts]
+
+    stats = batcher.to_dict()
+    assert stats['batch_sizes']['total'] == len(texts)
+    assert stats['batch_sizes']['count'] >= len(texts) / max_batch_size
+    assert stats['queue_depth'] == 0 and stats['batches_in_flight'] == 0
+
+
+def test_process_pool_and_options():
+    with ProcessPoolExecutor(2) as executor:
+        batcher = MicroBatcher(max_batch_size=16, executor=executor, max_concurrent_batches=2,
+                               output_container='date')
+        assert _parse_all(batcher, texts[:30]) == [text2date_with_spans(text, now) for text in texts[:30]]
+
+
+def test_coalesces():
+    batcher = MicroBatcher(max_batch_size=64, max_wait_ms=50)
+    _parse_all(batcher, texts[:64])
+    assert batcher.to_dict()['batch_sizes']['histogram'] == {'64': 1}
+
+
+def test_errors():
+    with pytest.raises(ValueError):
+        MicroBatcher(output='numpy')
+
+    batcher = MicroBatcher(output_container='hour')
+    with pytest.raises(ValueError):
+        _parse_all(batcher, ['holnap'])
+
+    with pytest.raises(RuntimeError):
+        _parse_all(batcher, ['holnap'])
@@ -0,0 +1,68 @@
+import pytest
+from datetime import datetime
+
+from hun_date_parser import text2datetime_with_spans, text2date_with_spans, parse_duration_with_spans, parse_frequency
+
+pd = pytest.importorskip('pandas')
+pytest.importorskip('numpy')
+
+import hun_date_parser.batch.pandas_accessor  # noqa: E402,F401
+
+now = datetime(2021, 3, 1, 18, 30)
+
+series = pd.Series([
+    'holnap délután 3-kor és jövő héten',
+    None,
+    'kedd óta',
+    'holnap délután 3-kor és jövő héten',
+    'nincs benne dátum',
+    'hetente 2 órát',
+    'ma 8-tól 10-ig és holnap',
+    'napi fél óra',
+], index=[10, 11, 12, 13, 14, 15, 16, 17], name='msg')
+
+
+def expected_rows(func):
+    return [(label, res) for label, value in series.items() if isinstance(value, str) for res in func(value)]
+
+
+@pytest.mark.parametrize("container, func", [
+    ('datetime', lambda s: text2datetime_with_spans(s, now=now)),
+    ('date', lambda s: text2date_with_spans(s, now=now)),
+])
+def test_parse(container, func):
+    intervals = series.hun_date.parse(now=now, container=container)
+    expected = expected_rows(func)
+
+    assert list(intervals.columns) == ['start', 'end', 'match_text', 'match_start', 'match_end', 'rule']
+    assert list(intervals.index) == [label for label, _ in expected]
+    for (_, row), (_, interval) in zip(intervals.iterrows(), expected):
+        assert (None if pd.isna(row['start']) else row['start'].date() if container == 'date'
+                else row['start'].to_pydatetime()) == interval['start_date']
+        assert (None if pd.isna(row['end']) else row['end'].date() if container == 'date'
+                else row['end'].to_pydatetime()) == interval['end_date']
+        assert row['match_text'] == interval['match_text']
+        assert (row['match_start'], row['match_end']) == (interval['match_start'], interval['match_end'])
+
+
+def test_durations():
+    durations = series.hun_date.durations(return_preferred_unit=True)
+    expected = expected_rows(lambda s: [res for res in [parse_duration_with_spans(s, return_preferred_unit=True)]
+                                        if res is not None])
+
+    assert list(durations.index) == [label for label, _ in expected]
+    assert durations.to_dict('records') == [{key: res[key] for key in durations.columns} for _, res in expected]
+
+
+def test_frequencies():
+    frequencies = series.hun_date.frequencies()
+    expected = expected_rows(lambda s: [res for res in [parse_frequency(s)] if res is not None])
+
+    assert list(frequencies.index) == [label for label, _ in expected]
+    assert list(frequencies['frequency']) == [res['frequency'].value for _, res in expected]
+    assert list(frequencies['match_start']) == [res['start'] for _, res in expected]
+
+
+def test_empty_series():
+    assert series.iloc[:0].hun_date.parse(now=now).empty
+    assert series.iloc[:0].hun_date.durations().empty
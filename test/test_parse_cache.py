@@ -0,0 +1,130 @@
+import pickle
+import random
+import sqlite3
+import pytest
+from datetime import datetime, timedelta, timezone
+
+from hun_date_parser import DatetimeExtractor, ParseCache
+from hun_date_parser.batch import parse_many
+from hun_date_parser.batch.synthetic import sentences as synthetic_sentences
+from hun_date_parser.date_parser.phrase_table import FAST_PATH_PHRASES
+from hun_date_parser.utils import SearchScopes
+
+from benchmarks.corpus import all_sentences
+
+nows = [datetime(2016, 1, 1) + timedelta(days=97 * i, hours=5 * i, minutes=11 * i, seconds=7 * i) for i in range(5)]
+# the frequent phrases take the fast path before the cache
+texts = sorted(set(all_sentences() + synthetic_sentences(60, seed=21)) - set(FAST_PATH_PHRASES))
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return str(tmp_path / 'parses.sqlite')
+
+
+@pytest.mark.parametrize("output_container", ['datetime', 'date', 'time'])
+def test_cached_matches_rules(cache_path, output_container):
+    cache = ParseCache(cache_path)
+    for now in nows:
+        cached = DatetimeExtractor(now=now, output_container=output_container, cache=cache)
+        rules = DatetimeExtractor(now=now, output_container=output_container, fast_path=False)
+        for text in texts:
+            for options in ((False, False), (True, True)):
+                assert cached._parse_datetime(text, *options) == rules._parse_datetime(text, *options), (text, now)
+
+    assert cache.misses == 2 * len(texts)
+    assert cache.hits == 2 * len(texts) * (len(nows) - 1)
+
+
+def test_cached_matches_rules_random_nows(cache_path):
+    rng = random.Random(5)
+    # the first days of January, where the last week of some phrases crosses into the previous year
+    random_nows = [datetime(2000, 1, 1) + timedelta(seconds=rng.randrange(40 * 365 * 86400)) for _ in range(6)] + \
+        [datetime(rng.randrange(2000, 2040), 1, rng.randrange(1, 15), 7, 47, 42) for _ in range(12)] + \
+        [datetime(2020, 1, 7, 7, 47, 42), datetime(2020, 1, 6), datetime(2015, 1, 6), datetime(2026, 1, 6)]
+    rng.shuffle(random_nows)
+    week_texts = ['AZ ELMÚLT HÉT', 'az elmúlt hét', 'elmúlt hét', 'előző hét', 'a múlt hét', 'jövő hét']
+
+    cache = ParseCache(cache_path)
+    for now in random_nows:
+        cached = DatetimeExtractor(now=now, cache=cache)
+        rules = DatetimeExtractor(now=now, fast_path=False)
+        for text in week_texts + rng.sample(texts, 20):
+            for options in ((False, False), (True, True)):
+                assert cached._parse_datetime(text, *options) == rules._parse_datetime(text, *options), (text, now)
+
+
+@pytest.mark.parametrize("text", ['3 óra múlva', 'most éppen', 'holnap 8-kor', 'jövő kedden délután'])
+def test_aware_now(cache_path, text):
+    now = datetime(2024, 5, 8, 10, tzinfo=timezone.utc)
+    cache = ParseCache(cache_path)
+    rules = DatetimeExtractor(now=now, fast_path=False).parse_datetime(text)
+    assert rules
+    assert DatetimeExtractor(now=now, cache=cache).parse_datetime(text) == rules
+    assert DatetimeExtractor(now=now, cache=cache).parse_datetime(text) == rules
+    assert cache.hits == 1
+
+
+def test_persistent(cache_path):
+    first = ParseCache(cache_path)
+    for text in texts:
+        DatetimeExtractor(now=nows[0], cache=first).parse_datetime(text)
+    assert len(first) == len(texts)
+
+    second = ParseCache(cache_path)
+    results = [DatetimeExtractor(now=nows[1], cache=second).parse_datetime(text) for text in texts]
+    assert second.to_dict() == {'hits': len(texts), 'misses': 0, 'errors': 0}
+    assert results == [DatetimeExtractor(now=nows[1]).parse_datetime(text) for text in texts]
+
+
+def test_version_invalidates(cache_path):
+    cache = ParseCache(cache_path)
+    DatetimeExtractor(now=nows[0], cache=cache).parse_datetime('holnaptól 5 napig')
+    assert len(cache) == 1
+
+    with sqlite3.connect(cache_path) as connection:
+        connection.execute("UPDATE meta SET value = 'other version' WHERE key = 'fingerprint'")
+    assert len(ParseCache(cache_path)) == 0
+
+
+def test_bounded(cache_path):
+    cache = ParseCache(cache_path, max_entries=10, memory_entries=5)
+    for day in range(1, 29):
+        DatetimeExtractor(now=nows[0], cache=cache).parse_datetime(f'március {day}')
+    assert len(cache) <= 10
+    assert len(cache._memory) == 5
+
+    cache.evict()
+    assert len(cache) == 10
+    assert cache.compiled('március 28', nows[0], 'datetime', SearchScopes.NOT_RESTRICTED, True, False,
+                          parse=None) is not None
+
+    with pytest.raises(ValueError):
+        ParseCache(cache_path, max_entries=0)
+
+
+def test_not_compilable(cache_path):
+    def parse(now, text):
+        return [{'start_date': now.replace(day=now.day % 28 + 1), 'end_date': None}]
+
+    cache = ParseCache(cache_path)
+    for _ in range(2):
+        assert cache.compiled('x', nows[0], 'datetime', SearchScopes.NOT_RESTRICTED, True, False, parse) is None
+    assert cache.to_dict() == {'hits': 1, 'misses': 1, 'errors': 0}
+
+
+def test_restricted_scope_not_cached(cache_path):
+    cache = ParseCache(cache_path)
+    extractor = DatetimeExtractor(now=nows[0], search_scope=SearchScopes.PAST_SEARCH, cache=cache)
+    extractor.parse_datetime('március 5-én')
+    assert cache.misses == 0 and len(cache) == 0
+
+
+def test_parse_many_workers(cache_path):
+    cache = ParseCache(cache_path)
+    batch = [f'{text} {i}' for i, text in enumerate(texts * 2)][:300]
+
+    expected = parse_many(batch, now=nows[0])
+    assert parse_many(batch, now=nows[0], cache=cache, workers=2) == expected
+    assert len(cache) == len(batch)
+    assert parse_many(batch, now=nows[0], cache=pickle.loads(pickle.dumps(cache))) == expected
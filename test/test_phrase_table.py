@@ -0,0 +1,64 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+
+from hun_date_parser import DatetimeExtractor, Profiler, text2datetime
+from hun_date_parser.date_parser.datetime_extractor import get_phrase_table
+from hun_date_parser.date_parser.phrase_table import FAST_PATH_PHRASES, PhraseTable, compile_phrase
+from hun_date_parser.utils import SearchScopes
+
+# every 6th day of two years (covering every weekday and most month ends), at varying times of day
+nows = [datetime(2020, 1, 1) + timedelta(days=6 * i, hours=i % 24, minutes=7 * i % 60, seconds=13 * i % 60)
+        for i in range(122)] + [datetime(2024, 2, 29, 23, 59, 59), datetime(2021, 12, 31, 0, 0),
+                                datetime(2022, 7, 3, 10, 20, 30, tzinfo=timezone(timedelta(hours=2)))]
+
+configurations = [(container, scope) for container in ('datetime', 'date', 'time') for scope in SearchScopes]
+
+
+@pytest.mark.parametrize("output_container,search_scope", configurations)
+def test_fast_path_matches_rules(output_container, search_scope):
+    for phrase in get_phrase_table(output_container, search_scope).phrases:
+        for now in nows:
+            fast = DatetimeExtractor(now=now, output_container=output_container, search_scope=search_scope)
+            rules = DatetimeExtractor(now=now, output_container=output_container, search_scope=search_scope,
+                                      fast_path=False)
+            for options in ((False, False), (True, True)):
+                assert fast._parse_datetime(phrase, *options) == rules._parse_datetime(phrase, *options), (phrase, now)
+
+
+def test_table_covers_phrases():
+    assert set(get_phrase_table().phrases) == set(FAST_PATH_PHRASES)
+    # the next monday is not a constant offset from now, it can't be compiled
+    assert 'hétfőn' not in get_phrase_table(search_scope=SearchScopes.FUTURE_DAY).phrases
+
+
+def test_lookup():
+    table = get_phrase_table()
+    assert table.lookup('holnap', include_spans=True) is table.phrases['holnap']
+    assert table.lookup('Holnap', include_spans=False) is table.phrases['holnap']
+    assert table.lookup('Holnap', include_spans=True) is None
+    assert table.lookup('holnap délután', include_spans=False) is None
+
+    now = datetime(2021, 3, 1, 18, 30)
+    assert text2datetime('Holnap', now=now) == [{'start_date': datetime(2021, 3, 2),
+                                                 'end_date': datetime(2021, 3, 2, 23, 59, 59)}]
+
+
+def test_results_are_copies():
+    extractor = DatetimeExtractor(now=datetime(2021, 3, 1, 18, 30))
+    extractor._parse_datetime('ma este', include_rules=True)[0]['rules'].append('changed')
+    assert extractor._parse_datetime('ma este', include_rules=True)[0]['rules'] == ['relative_day', 'time_words']
+
+
+def test_not_compilable():
+    def parse(now, phrase):
+        return [{'start_date': now.replace(day=now.day % 28 + 1), 'end_date': None}]
+
+    assert compile_phrase('x', parse, 'datetime') is None
+    assert PhraseTable(parse, 'datetime', phrases=['x']).phrases == {}
+
+
+def test_skipped_while_profiling():
+    profiler = Profiler()
+    with profiler:
+        text2datetime('holnap', now=datetime(2021, 3, 1))
+    assert profiler.to_dict()['stages']['match_multi_match']['calls'] == 1
@@ -0,0 +1,96 @@
+import ast
+import pytest
+from datetime import datetime
+from pathlib import Path
+
+from hun_date_parser import (DatetimeExtractor, Prefilter, has_temporal_expression, text2datetime_with_spans,
+                             parse_duration, parse_frequency)
+from hun_date_parser.batch import parse_many
+from hun_date_parser.batch.synthetic import sentences as synthetic_sentences
+
+from benchmarks.corpus import all_sentences
+
+now = datetime(2021, 3, 1, 18, 30)
+
+negatives = [
+    'köszönöm a segítséget',
+    'nincs benne dátum',
+    'Szia, megkaptad a levelemet?',
+    'A szép kert tele van virággal.',
+    'majd meglátjuk',
+    'Rendben, akkor így csináljuk.',
+    '',
+]
+
+
+def _test_strings():
+    """All string constants of the test modules, most of them are parser inputs."""
+    strings = set()
+    for path in Path(__file__).parent.glob('test_*.py'):
+        for node in ast.walk(ast.parse(path.read_text(encoding='utf-8'))):
+            if isinstance(node, ast.Constant) and isinstance(node.value, str):
+                strings.add(node.value)
+    return sorted(strings)
+
+
+def _extracts_nothing(text):
+    return not text2datetime_with_spans(text, now=now) and parse_duration(text) is None and not parse_frequency(text)
+
+
+@pytest.mark.parametrize("texts", [_test_strings(), all_sentences(), synthetic_sentences(3000, seed=7)],
+                         ids=['test_strings', 'corpus', 'synthetic'])
+def test_no_false_negatives(texts):
+    rejected = [text for text in texts if not has_temporal_expression(text)]
+    assert rejected, 'every text passed the check'
+    assert [text for text in rejected if not _extracts_nothing(text)] == []
+
+
+@pytest.mark.parametrize("text", negatives)
+def test_negatives_rejected(text):
+    assert _extracts_nothing(text)
+    assert not has_temporal_expression(text)
+
+
+@pytest.mark.parametrize("text", ['holnap', 'MÁRCIUS 5', 'Jövő héten', 'hetente kétszer', '3 órán át', '2021'])
+def test_positives_pass(text):
+    assert has_temporal_expression(text)
+
+
+def test_prefilter_counts():
+    prefilter = Prefilter()
+    assert prefilter.reject_rate == 0.0
+
+    passed = [prefilter(text) for text in ['holnap', 'nincs benne dátum', 'ma este', 'köszönöm']]
+    assert passed == [True, False, True, False]
+    assert prefilter.to_dict() == {'checked': 4, 'rejected': 2, 'reject_rate': 0.5}
+
+    prefilter.reset()
+    assert (prefilter.checked, prefilter.rejected) == (0, 0)
+
+
+@pytest.mark.parametrize("sentence", ['holnap', 'jövő kedden reggel 8-kor', *negatives])
+def test_extractor_prefilter(sentence):
+    prefilter = Prefilter()
+    extractor = DatetimeExtractor(now=now, prefilter=prefilter)
+
+    assert extractor._parse_datetime(sentence, include_spans=True) == text2datetime_with_spans(sentence, now=now)
+    assert prefilter.checked == 1
+    assert prefilter.rejected == (0 if has_temporal_expression(sentence) else 1)
+
+
+@pytest.mark.parametrize("output", ['records', 'numpy'])
+def test_parse_many_prefilter(output):
+    np = pytest.importorskip('numpy')
+    sentences = ['holnap', 'köszönöm', 'ma este', 'köszönöm', *negatives, 'jövő héten']
+    prefilter = Prefilter()
+
+    expected = parse_many(sentences, now=now, output=output)
+    filtered = parse_many(sentences, now=now, output=output, prefilter=prefilter)
+
+    if output == 'records':
+        assert filtered == expected
+    else:
+        filtered, expected = filtered.to_dict(), expected.to_dict()
+        assert all(np.array_equal(filtered[key], expected[key]) for key in expected)
+    assert prefilter.checked == len(set(sentences))
+    assert prefilter.rejected == len(set(sentences)) - 3
@@ -0,0 +1,86 @@
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from hun_date_parser import DatetimeExtractor, text2datetime
+from hun_date_parser.date_parser import datetime_extractor
+from hun_date_parser.date_parser.profiling import Profiler, STAGES, RULES
+
+now = datetime(2021, 3, 1, 18, 30)
+
+profiling_scenarios = [
+    'holnap reggel 8-kor',
+    'holnaptól 5 napig',
+    'kedd óta',
+    'január 5-től február 3-ig és jövő héten',
+    'nincs benne dátum',
+]
+
+
+@pytest.mark.parametrize("sentence", profiling_scenarios)
+def test_profiled_results(sentence):
+    profiler = Profiler()
+    extractor = DatetimeExtractor(now=now, profiler=profiler)
+
+    assert extractor.parse_datetime(sentence) == text2datetime(sentence, now=now)
+    assert extractor._parse_datetime(sentence, include_spans=True) == \
+        DatetimeExtractor(now=now)._parse_datetime(sentence, include_spans=True)
+
+    stats = profiler.to_dict()
+    assert stats['stages']['match_multi_match']['calls'] == 2
+    assert stats['stages']['filter_intervals']['calls'] == 2
+    assert set(stats['rules']) <= set(RULES)
+
+
+def test_profiler_counts():
+    with Profiler() as profiler:
+        text2datetime('holnap reggel 8-kor', now=now)
+        text2datetime('holnaptól 5 napig', now=now)
+
+    stats = profiler.to_dict()
+    assert stats['rules']['match_relative_day'] == {**stats['rules']['match_relative_day'], 'calls': 3, 'hits': 3}
+    assert stats['rules']['match_time_words']['hits'] == 1
+    assert stats['rules']['match_date_offset']['calls'] == 1
+    assert stats['stages']['assemble_datetime']['calls'] == 4
+    assert all(s['total'] >= s['max'] >= 0 for table in stats.values() for s in table.values())
+
+    report = profiler.report()
+    assert 'match_relative_day' in report and 'assemble_datetime' in report
+    assert len(report.splitlines()) == 1 + len(stats['stages']) + len(stats['rules'])
+
+    profiler.reset()
+    assert profiler.to_dict() == {'stages': {}, 'rules': {}}
+
+
+def test_profiler_patches_nothing():
+    rules = {attr: getattr(datetime_extractor, attr) for attr in RULES}
+    assemble = DatetimeExtractor.assemble_datetime
+
+    with Profiler():
+        text2datetime('holnap', now=now)
+        assert {attr: getattr(datetime_extractor, attr) for attr in RULES} == rules
+        assert DatetimeExtractor.assemble_datetime is assemble
+    assert {name for name, _ in datetime_extractor._RULES} | {'match_date_offset'} == set(RULES)
+
+
+def test_profiler_of_extractor_in_thread():
+    profiler = Profiler()
+    extractor = DatetimeExtractor(now=now, profiler=profiler)
+    with ThreadPoolExecutor(2) as executor:
+        results = list(executor.map(extractor.parse_datetime, ['holnap', 'kedd óta']))
+
+    assert results == [text2datetime('holnap', now=now), text2datetime('kedd óta', now=now)]
+    assert profiler.to_dict()['stages']['match_rules']['calls'] == 2
+    assert set(profiler.to_dict()['stages']) <= set(STAGES)
+
+
+def test_profiler_nesting():
+    outer, inner = Profiler(), Profiler()
+    with outer:
+        text2datetime('holnap', now=now)
+        with inner:
+            text2datetime('holnap', now=now)
+        text2datetime('holnap', now=now)
+
+    assert outer.to_dict()['stages']['match_multi_match']['calls'] == 2
+    assert inner.to_dict()['stages']['match_multi_match']['calls'] == 1
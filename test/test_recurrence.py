@@ -0,0 +1,82 @@
+import pytest
+from datetime import datetime, time
+from itertools import islice
+
+from hun_date_parser import parse_recurrence
+from hun_date_parser.frequency_parser import Frequency
+
+now = datetime(2024, 5, 8, 10, 0, 12, 345)
+
+tf_recurrences = [
+    ("minden hétfőn 9-kor", {"frequency": Frequency.WEEKLY, "weekdays": (0,), "time_of_day": time(9)}),
+    ("Minden Hétfőn 9-kor", {"frequency": Frequency.WEEKLY, "weekdays": (0,), "time_of_day": time(9)}),
+    ("hétfőnként", {"frequency": Frequency.WEEKLY, "weekdays": (0,), "match_end": 10}),
+    ("keddenként reggel 7-kor", {"frequency": Frequency.WEEKLY, "weekdays": (1,), "time_of_day": time(7)}),
+    ("kéthetente pénteken délután", {"frequency": Frequency.FORTNIGHTLY, "weekdays": (4,),
+                                     "time_of_day": time(12)}),
+    ("hetente kedden és csütörtökön", {"frequency": Frequency.WEEKLY, "weekdays": (1, 3)}),
+    ("minden nap 8-kor", {"frequency": Frequency.DAILY, "time_of_day": time(8)}),
+    ("minden este 10-kor", {"frequency": Frequency.DAILY, "time_of_day": time(22)}),
+    ("naponta este", {"frequency": Frequency.DAILY, "time_of_day": time(18)}),
+    ("minden héten", {"frequency": Frequency.WEEKLY, "weekdays": (), "start": datetime(2024, 5, 8, 10, 0, 12)}),
+    ("havonta 15-én", {"frequency": Frequency.MONTHLY, "month_day": 15}),
+    ("évente március 15-én", {"frequency": Frequency.YEARLY, "month_day": 15, "month": 3}),
+    ("jövő héttől hetente kedden", {"frequency": Frequency.WEEKLY, "weekdays": (1,),
+                                    "start": datetime(2024, 5, 13), "until": None}),
+    ("március 1-től május 31-ig minden hétfőn 10:30-kor", {"start": datetime(2024, 3, 1),
+                                                           "until": datetime(2024, 5, 31, 23, 59, 59),
+                                                           "weekdays": (0,), "time_of_day": time(10, 30),
+                                                           "match_start": 0, "match_end": 45}),
+    ("hetente pénteken 2024-06-01-ig", {"weekdays": (4,), "until": datetime(2024, 6, 1, 23, 59, 59)}),
+    ("jövő hónapban minden hétfőn", {"start": datetime(2024, 6, 1), "until": datetime(2024, 6, 30, 23, 59, 59)}),
+    ("havonta az első hétfőn", {"frequency": Frequency.MONTHLY, "weekdays": (0,), "weekday_positions": (1,),
+                                "match_end": 21}),
+    ("havonta az első és a harmadik szerdán 10-kor", {"weekdays": (2,), "weekday_positions": (1, 3),
+                                                      "time_of_day": time(10)}),
+    ("negyedévente az utolsó pénteken", {"frequency": Frequency.QUARTERLY, "weekdays": (4,),
+                                         "weekday_positions": (-1,)}),
+    ("évente március első vasárnapján", {"frequency": Frequency.YEARLY, "weekdays": (6,), "weekday_positions": (1,),
+                                         "month": 3, "until": None}),
+    ("Találkozzunk hetente a parkban", {"frequency": Frequency.WEEKLY, "match_start": 13, "match_end": 20}),
+]
+
+
+@pytest.mark.parametrize("inp,exp", tf_recurrences)
+def test_parse_recurrence(inp, exp):
+    recurrence = parse_recurrence(inp, now)
+    assert {key: getattr(recurrence, key) for key in exp} == exp
+
+
+@pytest.mark.parametrize("inp", ["holnap 3-kor", "két óra", "hétfőn", "", "hetente az első hétfőn",
+                                 "havonta az első napon", "havonta az első hétfőn és az utolsó pénteken"])
+def test_no_recurrence(inp):
+    assert parse_recurrence(inp, now) is None
+
+
+tf_rrule = ["minden hétfőn 9-kor", "kéthetente pénteken délután", "havonta 31-én", "évente február 29-én",
+            "negyedévente", "félévente", "naponta", "hetente kedden és csütörtökön", "havonta hétfőn", "havonta 15-én",
+            "évente", "jövő héttől hetente kedden", "március 1-től május 31-ig minden hétfőn 10:30-kor",
+            "havonta az első hétfőn", "havonta az utolsó pénteken", "havonta az első és a harmadik szerdán",
+            "negyedévente az ötödik csütörtökön", "évente március első vasárnapján"]
+
+
+@pytest.mark.parametrize("inp", tf_rrule)
+def test_same_as_rrule(inp):
+    recurrence = parse_recurrence(inp, datetime(2024, 1, 31, 10, 0, 12))
+    rule = recurrence.to_rrule()
+    assert list(islice(recurrence.occurrences(), 50)) == list(islice(rule, 50))
+
+    a, b = datetime(2031, 2, 3), datetime(2033, 7, 1)
+    assert recurrence.occurrences_between(a, b) == rule.between(a, b, inc=True)
+
+
+def test_occurrences_between():
+    recurrence = parse_recurrence("kéthetente pénteken 18:30-kor", datetime(2024, 5, 8))
+    assert recurrence.occurrences_between(datetime(2024, 5, 24, 18, 30), datetime(2024, 6, 21)) == [
+        datetime(2024, 5, 24, 18, 30), datetime(2024, 6, 7, 18, 30)]
+    assert recurrence.occurrences_between(datetime(2024, 6, 1), datetime(2024, 5, 1)) == []
+
+    # far windows are reached without generating the periods before them
+    a, b = datetime(9000, 1, 1), datetime(9000, 1, 15)
+    assert recurrence.occurrences_between(a, b) == recurrence.to_rrule().between(a, b, inc=True)
+    assert len(recurrence.occurrences_between(a, b)) == 1
@@ -0,0 +1,97 @@
+import json
+import pytest
+from datetime import datetime
+
+from hun_date_parser import text2datetime_with_spans, parse_duration_with_spans, parse_frequency
+from hun_date_parser.batch.metrics import percentile
+from hun_date_parser.batch import replay as replay_module
+from hun_date_parser.batch.replay import replay, replay_one, compare, read_results, format_report
+
+now = datetime(2021, 3, 1, 18, 30)
+
+replay_scenarios = [
+    'holnap reggel 8-kor',
+    'hetente 2 órát',
+    'január 5-től február 3-ig',
+    'nincs benne dátum',
+]
+
+
+@pytest.mark.parametrize("sentence", replay_scenarios)
+def test_replay_one(sentence):
+    record = replay_one((sentence, now))
+
+    expected = text2datetime_with_spans(sentence, now=now)
+    assert [(i['start_date'], i['end_date'], i['match_start']) for i in record['intervals']] == \
+        [(i['start_date'].isoformat(), i['end_date'].isoformat(), i['match_start']) for i in expected]
+    assert record['duration'] == parse_duration_with_spans(sentence, return_preferred_unit=True)
+    assert (record['frequency'] or {}).get('frequency') == (parse_frequency(sentence) or {}).get('frequency')
+    assert record['elapsed'] > 0 and record['error'] is None
+
+
+@pytest.fixture
+def replayed(tmp_path):
+    inputs = tmp_path / 'inputs.jsonl'
+    with open(inputs, 'w', encoding='utf-8') as f:
+        for i, sentence in enumerate(replay_scenarios):
+            f.write(json.dumps({'text': sentence, 'now': now.isoformat()} if i % 2 else {'text': sentence}) + '\n')
+
+    old, new = tmp_path / 'old.jsonl', tmp_path / 'new.jsonl'
+    replay(str(inputs), str(old), default_now=datetime(2020, 12, 27))
+    replay(str(inputs), str(new), default_now=datetime(2020, 12, 27))
+    return old, new
+
+
+def test_replay(replayed):
+    old, new = replayed
+    meta, records = read_results(str(old))
+
+    assert meta['inputs'] == len(records) == len(replay_scenarios)
+    assert [r['id'] for r in records] == list(range(len(replay_scenarios)))
+    assert [r['now'] for r in records[:2]] == ['2020-12-27T00:00:00', now.isoformat()]
+    assert records[0]['rules'] == ['relative_day', 'time_words']
+
+    report = compare(str(old), str(new))
+    assert report['changed'] == 0 and report['by_rule'] == {}
+    assert report['old']['inputs'] == report['new']['inputs'] == len(replay_scenarios)
+    latencies = sorted(r['elapsed'] for r in records)
+    assert report['old']['p90_ms'] == round(percentile(latencies, 90) * 1000, 4)
+    assert report['old']['max_ms'] == round(latencies[-1] * 1000, 4)
+
+
+def test_compare_differences(replayed):
+    old, new = replayed
+    lines = new.read_text(encoding='utf-8').splitlines()
+    changed = json.loads(lines[1])
+    changed['intervals'][0]['end_date'] = None
+    lines[1] = json.dumps(changed)
+    changed = json.loads(lines[3])
+    changed['intervals'][0]['match_end'] += 1
+    changed['duration'] = {'minutes': 1}
+    lines[3] = json.dumps(changed)
+    new.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+
+    report = compare(str(old), str(new))
+    assert report['changed'] == 2
+    assert report['by_kind'] == {'intervals': 1, 'spans': 1, 'durations': 1, 'frequencies': 0}
+    assert report['by_rule']['relative_day,time_words']['kinds'] == {'intervals': 1}
+    assert report['by_rule']['named_month']['examples'][0]['kinds'] == ['spans', 'durations']
+    assert '2 of 4 inputs changed' in format_report(report)
+
+
+def test_replay_without_rules(replayed, monkeypatch):
+    old, new = replayed
+    monkeypatch.setattr(replay_module, 'RULES_SUPPORTED', False)
+    record = replay_one(('holnap reggel 8-kor', now))
+    assert record['rules'] is None and 'rules' not in record['intervals'][0]
+
+    lines = old.read_text(encoding='utf-8').splitlines()
+    changed = json.loads(lines[1])
+    changed['rules'] = None
+    changed['intervals'][0]['end_date'] = None
+    lines[1] = json.dumps(changed)
+    old.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+
+    report = compare(str(old), str(new))
+    assert report['changed'] == 1
+    assert report['by_rule']['relative_day,time_words']['kinds'] == {'intervals': 1}
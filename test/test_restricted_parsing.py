@@ -1,7 +1,11 @@
 import pytest
-from datetime import datetime
+from datetime import datetime, timedelta
 
-from hun_date_parser.date_parser.interval_restriction import extract_datetime_within_interval, ExtractWithinRangeSuccess
+from hun_date_parser import ParseCache
+from hun_date_parser.date_parser.interval_restriction import (extract_datetime_within_interval,
+                                                              extract_datetime_within_intervals,
+                                                              ExtractWithinRangeSuccess, RestrictedQuery)
+from hun_date_parser.utils import SearchScopes
 
 
 scenarios = [
@@ -79,3 +83,61 @@ def test_extract_within_interval(interval_restriction, query_sentence, expected)
                                               fallback_now=datetime(2021, 10, 11))
 
     assert result == expected
+
+
+@pytest.mark.parametrize("interval_restriction, query_sentence, expected", scenarios)
+def test_extract_within_interval_cached(tmp_path, interval_restriction, query_sentence, expected):
+    cache = ParseCache(str(tmp_path / 'parses.sqlite'))
+    for _ in range(2):
+        result = extract_datetime_within_interval(interval_restriction['start_date'],
+                                                  interval_restriction['end_date'],
+                                                  query_sentence,
+                                                  fallback_now=datetime(2021, 10, 11),
+                                                  cache=cache)
+        assert result == expected
+
+
+def test_query_parsed_once_per_now():
+    query = RestrictedQuery('augusztusban vagy szeptemberben három órakor')
+    assert query.possible_am_pm_missmatch and not query.relative
+
+    for day in range(1, 4):
+        status, _ = query.restrict(datetime(2021, 1, 1), datetime(2021, 3, 31, 23, 59, 59),
+                                   fallback_now=datetime(2021, 10, day))
+        assert status == ExtractWithinRangeSuccess.OUT_OF_RANGE_FALLBACK
+    assert len(query._parses) == 4
+
+
+# hourly slots of three weeks, plus overlapping and unsorted ones
+slots = [(datetime(2021, 3, 1, 8) + timedelta(hours=7 * i), datetime(2021, 3, 1, 11) + timedelta(hours=7 * i))
+         for i in range(72)]
+slots += [(datetime(2021, 3, 2), datetime(2021, 3, 12)), (datetime(2021, 2, 1), datetime(2021, 4, 1)),
+          (datetime(2021, 3, 9), datetime(2021, 3, 10))]
+
+
+@pytest.mark.parametrize("query_sentence", ['csütörtök délután', '2021 március 5-én', '2021. március 9. 9 órakor',
+                                            '2021 március 5-től', 'jövő kedden', 'augusztusban', 'nincs benne dátum',
+                                            'holnap 3-kor', '2021 március 3-án vagy 2021 március 16-án'])
+@pytest.mark.parametrize("search_scope", [SearchScopes.NOT_RESTRICTED, SearchScopes.FUTURE_DAY])
+@pytest.mark.parametrize("intervals", [slots, slots[::-1], slots[:72], slots[:5]], ids=['mixed', 'reversed',
+                                                                                       'sorted', 'few'])
+def test_extract_within_intervals(query_sentence, search_scope, intervals):
+    fallback_now = datetime(2021, 10, 11)
+    expected = [extract_datetime_within_interval(start, end, query_sentence, search_scope, fallback_now)
+                for start, end in intervals]
+
+    assert extract_datetime_within_intervals(intervals, query_sentence, search_scope, fallback_now) == expected
+
+
+# slots of 30 hours every 13 hours across a new year
+new_year_slots = [(datetime(2019, 12, 20, 7, 47, 42) + timedelta(hours=13 * i),
+                   datetime(2019, 12, 21, 13, 47, 42) + timedelta(hours=13 * i)) for i in range(100)]
+
+
+@pytest.mark.parametrize("query_sentence", ['az elmúlt hét', 'elmúlt hét', 'jövő héten', '2020 január 5-én'])
+def test_extract_within_intervals_new_year(query_sentence):
+    fallback_now = datetime(2020, 1, 7, 7, 47, 42)
+    expected = [extract_datetime_within_interval(start, end, query_sentence, fallback_now=fallback_now)
+                for start, end in new_year_slots]
+
+    assert extract_datetime_within_intervals(new_year_slots, query_sentence, fallback_now=fallback_now) == expected
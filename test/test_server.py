@@ -0,0 +1,109 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from hun_date_parser import text2datetime_with_spans
+from hun_date_parser.batch.cli import json_default
+from hun_date_parser.batch.server import make_server
+
+texts = ['holnap reggel 8-kor', 'jövő kedden', 'Szia', 'március 5-én 3-kor'] * 8
+now = datetime(2024, 5, 8, 10)
+
+
+@pytest.fixture(scope='module', params=[0, 1], ids=['thread', 'process'])
+def server(request, tmp_path_factory):
+    cache_path = str(tmp_path_factory.mktemp('server') / 'cache.sqlite')
+    server = make_server(port=0, workers=request.param, max_wait_ms=20, cache_path=cache_path)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _request(server, path, body=None):
+    data = None if body is None else json.dumps(body).encode('utf-8')
+    request = urllib.request.Request(f'http://127.0.0.1:{server.server_address[1]}{path}', data=data)
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def _expected(text):
+    return json.loads(json.dumps(text2datetime_with_spans(text, now), default=json_default))
+
+
+def test_parse_concurrent(server):
+    _, before = _request(server, '/metrics')
+    with ThreadPoolExecutor(16) as executor:
+        responses = list(executor.map(
+            lambda text: _request(server, '/parse', {'text': text, 'now': now.isoformat()}), texts))
+
+    assert [status for status, _ in responses] == [200] * len(texts)
+    assert [body['results'] for _, body in responses] == [_expected(text) for text in texts]
+
+    _, after = _request(server, '/metrics')
+    assert after['batches']['total'] - before['batches']['total'] == len(texts)
+    assert after['batches']['count'] - before['batches']['count'] < len(texts)
+    parses_before = before['endpoints'].get('/parse', {'count': 0})['count']
+    assert after['endpoints']['/parse']['count'] - parses_before == len(texts)
+    assert after['cache']['misses'] <= len(set(texts))
+    assert after['queue_depth'] == 0
+
+
+def test_endpoints(server):
+    status, body = _request(server, '/parse_batch', {'texts': ['holnap', 'ma'], 'nows': [now.isoformat()] * 2})
+    assert status == 200 and body['results'] == [_expected('holnap'), _expected('ma')]
+
+    assert _request(server, '/duration', {'text': '2 órát'})[1] == {
+        'result': {'match_text': '2 órát', 'match_start': 0, 'match_end': 6, 'minutes': 120}}
+    assert _request(server, '/frequency', {'text': 'hetente'})[1] == {
+        'result': {'frequency': 'WEEKLY', 'start': 0, 'end': 7}}
+    status, body = _request(server, '/textualize', {'datetime': '2020-12-20T18:34:00', 'now': '2020-12-27T00:00:00',
+                                                    'time_precision': 2})
+    assert status == 200 and body['result']['dates'] == ['múlt héten vasárnap', '2020 december 20']
+
+
+@pytest.mark.parametrize("path,body,status", [
+    ('/parse', {'text': 1}, 400),
+    ('/parse', {'text': 'holnap', 'now': 'yesterday'}, 400),
+    ('/parse', {'text': 'holnap', 'output_container': 'time'}, 400),
+    ('/parse_batch', {'texts': ['holnap'], 'nows': []}, 400),
+    ('/textualize', {'datetime': '2020-12-20T18:34:00', 'time_precision': 4}, 400),
+    ('/unknown', {}, 404),
+    ('/metrics', {}, 405),
+])
+def test_errors(server, path, body, status):
+    code, response = _request(server, path, body)
+    assert code == status and 'error' in response
+
+
+def test_timeout():
+    # the first request of a batch waits max_wait_ms for others, longer than the timeout
+    server = make_server(port=0, workers=0, max_wait_ms=300, timeout=0.05)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        status, body = _request(server, '/parse', {'text': 'holnap', 'now': now.isoformat()})
+        assert status == 503 and 'error' in body
+
+        # the worker is busy, the batch doesn't start within the timeout and it is cancelled
+        release = threading.Event()
+        busy = server.service.executor.submit(release.wait)
+        status, body = _request(server, '/parse_batch', {'texts': ['holnap'], 'now': now.isoformat()})
+        assert status == 503 and 'error' in body
+        release.set()
+        busy.result()
+
+        metrics = server.service.metrics()
+        assert metrics['batches']['count'] == 0
+        assert metrics['endpoints']['/parse']['errors'] == metrics['endpoints']['/parse_batch']['errors'] == 1
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,88 @@
+import os
+import pytest
+from datetime import date, datetime, time
+
+from hun_date_parser.batch import parse_many
+from hun_date_parser.batch.shared_results import (KIND_DATE, KIND_DATETIME, KIND_TIME, NAT_VALUE, _decode_end,
+                                                  _encode_end, parse_shared)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+requires_numpy = pytest.mark.skipif(np is None, reason='numpy is not installed')
+
+now = datetime(2021, 3, 1, 10, 15, 30, 250000)
+sentences = [f'{i} nap múlva' for i in range(300)] + [
+    'holnap délután 3-kor és jövő héten', 'nincs benne dátum', 'kedd óta', 'holnaptól', 'most', '2021 januárig',
+    'január 5-től február 3-ig', 'nincs benne dátum',
+] * 20
+
+
+@pytest.mark.parametrize("value,kind", [
+    (datetime(2021, 3, 1, 10, 15, 30, 250000), KIND_DATETIME),
+    (datetime(1850, 12, 31, 23, 59, 59), KIND_DATETIME),
+    (date(2021, 3, 1), KIND_DATE),
+    (date(1900, 1, 1), KIND_DATE),
+    (time(23, 59, 59), KIND_TIME),
+    (None, -1),
+])
+def test_encode_end(value, kind):
+    encoded, encoded_kind = _encode_end(value)
+    assert encoded_kind == kind
+    assert _decode_end(encoded, kind) == value
+    assert (encoded == NAT_VALUE) == (value is None)
+
+
+@requires_numpy
+@pytest.mark.parametrize("workers", [1, 2])
+@pytest.mark.parametrize("output_container", ['datetime', 'date'])
+def test_same_as_records(workers, output_container):
+    expected = parse_many(sentences, now=now, output_container=output_container)
+    with parse_many(sentences, now=now, output_container=output_container, output='shared',
+                    workers=workers) as results:
+        assert len(results) == len(sentences)
+        assert results[301] == expected[301]
+        assert results.to_records() == expected
+        assert results.num_intervals == sum(len(intervals) for intervals in expected)
+
+
+@requires_numpy
+@pytest.mark.parametrize("output_container", ['datetime', 'date'])
+def test_to_columns(output_container):
+    expected = parse_many(sentences, now=now, output_container=output_container, output='numpy')
+    with parse_many(sentences, now=now, output_container=output_container, output='shared', workers=2) as results:
+        columns = results.to_columns()
+    for name in ('offsets', 'input_index', 'match_start', 'match_end', 'rule'):
+        assert list(getattr(columns, name)) == list(getattr(expected, name))
+    for name in ('start', 'end'):
+        assert getattr(columns, name).dtype == getattr(expected, name).dtype
+        assert np.array_equal(getattr(columns, name), getattr(expected, name), equal_nan=True)
+
+
+@requires_numpy
+def test_zero_copy_views():
+    results = parse_shared(sentences, [now] * len(sentences), workers=2, chunk_size=100)
+    records = results.segments[0].records
+    assert not records.flags.owndata
+    assert records['start'].view('datetime64[us]')[0] == np.datetime64('2021-03-01T00:00:00')
+
+    names = [shm._name for shm in results._handles]
+    assert len(names) == len(results.segments)
+    results.close()
+    assert not results.segments
+    if os.path.isdir('/dev/shm'):
+        assert not any(os.path.exists('/dev/shm' + name) for name in names)
+
+
+@requires_numpy
+def test_prefilter_and_errors():
+    with parse_many(sentences, now=now, output='shared', prefilter=True, workers=2) as results:
+        assert results.to_records() == parse_many(sentences, now=now)
+        assert results[-1] == []
+        with pytest.raises(IndexError):
+            results.records(len(sentences))
+
+    with pytest.raises(ValueError):
+        parse_many(sentences, now=now, output='shared', slow_log=object())
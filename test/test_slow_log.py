@@ -0,0 +1,97 @@
+import io
+import json
+import threading
+import pytest
+from datetime import datetime
+
+from hun_date_parser import DatetimeExtractor, SlowLog, text2datetime, text2datetime_with_spans
+from hun_date_parser.batch import parse_many
+
+now = datetime(2021, 3, 1, 18, 30)
+
+slow_log_scenarios = [
+    'holnap',
+    'jövő kedden reggel 8-kor',
+    'január 5-től február 3-ig',
+    'nincs benne dátum',
+]
+
+
+@pytest.mark.parametrize("sentence", slow_log_scenarios)
+def test_logged_results(sentence):
+    slow_log = SlowLog()
+    extractor = DatetimeExtractor(now=now, slow_log=slow_log)
+
+    assert extractor.parse_datetime(sentence) == text2datetime(sentence, now=now)
+    assert extractor._parse_datetime(sentence, include_spans=True) == text2datetime_with_spans(sentence, now=now)
+
+    entries = slow_log.entries()
+    assert len(entries) == 1 and slow_log.seen == 2
+    assert entries[0]['text'] == sentence
+    assert entries[0]['now'] == now.isoformat()
+    assert len(entries[0]['intervals']) == len(text2datetime(sentence, now=now))
+
+
+def test_slow_log_bounded():
+    slow_log = SlowLog(size=3)
+    for i, elapsed in enumerate([0.5, 0.1, 0.3, 0.2, 0.4, 0.05]):
+        slow_log.add(f'text {i}', elapsed, now, [])
+    slow_log.add('text 1', 0.6, now, [{'start_date': now, 'end_date': None, 'rules': ['now']}])
+    slow_log.add('text 0', 0.01, now, [])
+
+    entries = slow_log.entries()
+    assert [(e['text'], e['elapsed']) for e in entries] == [('text 1', 0.6), ('text 0', 0.5), ('text 4', 0.4)]
+    assert entries[0]['rules'] == ['now']
+    assert entries[0]['intervals'] == [{'start_date': now.isoformat(), 'end_date': None}]
+    assert slow_log.seen == 8
+
+
+def test_slow_log_threshold_and_sampling():
+    slow_log = SlowLog(threshold=0.1)
+    assert not slow_log.add('fast', 0.01, now, [])
+    assert slow_log.add('slow', 0.2, now, [])
+    assert len(slow_log) == 1
+
+    sampled = SlowLog(sample_rate=0.25, seed=1)
+    assert 150 < sum(sampled.sample() for _ in range(1000)) < 350
+    assert not any(SlowLog(sample_rate=0).sample() for _ in range(100))
+
+    with pytest.raises(ValueError):
+        SlowLog(sample_rate=2)
+    with pytest.raises(ValueError):
+        SlowLog(size=0)
+
+
+def test_slow_log_threads():
+    slow_log = SlowLog(size=10)
+
+    def work(k):
+        for i in range(200):
+            slow_log.add(f'{k} {i}', i / 1000, now, [])
+
+    threads = [threading.Thread(target=work, args=(k,)) for k in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert slow_log.seen == 800
+    assert sorted(e['elapsed'] for e in slow_log.entries()) == [0.197] * 2 + [0.198] * 4 + [0.199] * 4
+
+
+def test_slow_log_dump():
+    slow_log = SlowLog()
+    DatetimeExtractor(now=now, slow_log=slow_log).parse_datetime('jövő kedden reggel 8-kor')
+
+    buffer = io.StringIO()
+    slow_log.dump(buffer)
+    dumped = json.loads(buffer.getvalue())
+    assert dumped['seen'] == 1
+    assert dumped['entries'][0]['rules'] == ['weekday', 'time_words']
+
+
+def test_parse_many_slow_log():
+    slow_log = SlowLog()
+    sentences = slow_log_scenarios + slow_log_scenarios
+    assert parse_many(sentences, now=now, slow_log=slow_log) == parse_many(sentences, now=now)
+    assert sorted(e['text'] for e in slow_log.entries()) == sorted(slow_log_scenarios)
@@ -1,6 +1,6 @@
 import pytest
 
-from hun_date_parser.date_parser.structure_parsers import match_interval, match_multi_match
+from hun_date_parser.date_parser.structure_parsers import match_interval, match_interval_with_spans, match_multi_match
 
 interval_fixtures = [
     ('keddtől egészen péntekig', {'start_date': 'keddtől', 'end_date': 'egészen péntekig'}),
@@ -34,6 +34,33 @@ def test_match_interval(inp, out):
     assert match_interval(inp) == out
 
 
+interval_span_fixtures = [
+    ('keddtől egészen péntekig', ('keddtől', 0), ('egészen péntekig', 8)),
+    ('  ma reggeltől bármikor', ('ma reggeltől', 2), ('OPEN', None)),
+    ('egészen péntekig jó lesz', ('OPEN', None), ('egészen péntekig', 0)),
+    ('2020 dec 13 - 2020 december 6', ('2020 dec 13', 0), ('2020 december 6', 14)),
+    ('kezdés: holnap : jövő kedd', ('holnap', 8), ('jövő kedd', 17)),
+    ('5-étől', ('5-étől', 0), ('OPEN', None)),
+]
+
+
+@pytest.mark.parametrize("inp, start, end", interval_span_fixtures)
+def test_match_interval_with_spans(inp, start, end):
+    res = match_interval_with_spans(inp)
+
+    assert (res['start_date'], res['start_offset']) == start
+    assert (res['end_date'], res['end_offset']) == end
+    for part, offset in (start, end):
+        if offset is not None:
+            assert inp[offset:offset + len(part)] == part
+
+
+def test_match_interval_with_spans_no_interval():
+    assert match_interval_with_spans('március 20-tól 22-ig') == {}
+    assert match_interval_with_spans('kedden') == {}
+    assert match_interval_with_spans('') == {}
+
+
 def test_match_multi_match():
     w = [('kedden és szerdán', ['kedden', 'szerdán']),
          # ('kedden, szerdán és pénteken', ['kedden', 'szerdán', 'pénteken']),
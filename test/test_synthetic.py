@@ -0,0 +1,66 @@
+import json
+import re
+import pytest
+from datetime import datetime
+
+from hun_date_parser import text2datetime, parse_duration, parse_frequency
+from hun_date_parser.batch.replay import read_inputs
+from hun_date_parser.batch.synthetic import generate, sentences, main, FAMILIES, MONTHS, WEEKDAYS
+from hun_date_parser.date_parser.patterns import R_NAMED_MONTH, R_WEEKDAY
+
+nows = [datetime(2021, 3, 10, 14, 25), datetime(2024, 2, 28, 9, 0), datetime(2020, 12, 31, 23, 59)]
+
+
+@pytest.mark.parametrize("now", nows)
+def test_gold_matches_parser(now):
+    for record in generate(600, seed=3, now=now):
+        text, gold = record['text'], record['gold']
+        intervals = [{key: value.isoformat() for key, value in interval.items()}
+                     for interval in text2datetime(text, now=now)]
+        frequency = parse_frequency(text)
+
+        assert intervals == gold['intervals'], text
+        assert parse_duration(text) == gold['duration'], text
+        assert (frequency['frequency'].value if frequency else None) == gold['frequency'], text
+
+
+@pytest.mark.parametrize("name,abbreviation", MONTHS)
+def test_month_forms(name, abbreviation):
+    for form in (name, abbreviation):
+        assert re.fullmatch(R_NAMED_MONTH, f'{form} 5') is not None
+
+
+@pytest.mark.parametrize("form", WEEKDAYS)
+def test_weekday_forms(form):
+    assert re.search(R_WEEKDAY, form) is not None
+
+
+def test_seeded():
+    assert sentences(200, seed=5) == sentences(200, seed=5)
+    assert sentences(200, seed=5) != sentences(200, seed=6)
+    assert [r['text'] for r in generate(200, seed=5, now=nows[1])] == sentences(200, seed=5)
+
+
+def test_families():
+    records = list(generate(300, seed=1, families=['duration', 'negative']))
+    assert {r['family'] for r in records} == {'duration', 'negative'}
+    assert all('gold' not in r for r in records)
+    assert len(list(generate(300, families=list(FAMILIES)))) == 300
+
+    with pytest.raises(ValueError):
+        next(generate(1, families=['unknown']))
+
+
+def test_negatives():
+    for record in generate(100, seed=2, now=nows[0], families=['negative']):
+        assert record['gold'] == {'intervals': [], 'duration': None, 'frequency': None}
+
+
+def test_cli(tmp_path):
+    output = tmp_path / 'inputs.jsonl'
+    main(['50', '--seed', '4', '--now', nows[0].isoformat(), '--output', str(output)])
+
+    with open(output, encoding='utf-8') as f:
+        records = [json.loads(line) for line in f]
+    assert [r['text'] for r in records] == sentences(50, seed=4)
+    assert list(read_inputs(str(output), datetime(2000, 1, 1))) == [(r['text'], nows[0]) for r in records]
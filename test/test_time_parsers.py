@@ -1,8 +1,11 @@
+import re
 import pytest
 from datetime import datetime
 
 from hun_date_parser.utils import Year, Month, Day, Daypart, Hour, Minute
+from hun_date_parser.date_parser.patterns import R_HOUR_MIN, R_HOUR_MIN_REV
 from hun_date_parser.date_parser.time_parsers import match_digi_clock, match_time_words, match_now, match_hwords
+from hun_date_parser.date_parser.time_expressions import scan_time_words
 
 
 def test_match_digi_clock():
@@ -100,3 +103,39 @@ def test_match_hwords(inp, exp):
     for e in out:
         date_parts.append(e['date_parts'])
     assert date_parts == exp
+
+
+scan_scenarios = [
+    'ma 2 órára',
+    'reggel 8-kor',
+    'hajnali fél 5',
+    'délután háromnegyed négykor',
+    '10 perccel 8 előtt',
+    'negyed 11 után 5 perccel',
+    'negyedelutan 3',
+    'estejjel 9-kor',
+    'x   5-kor',
+    'x    5-kor',
+    'semmi\n  hat óra\nreggel',
+    'perc\n5 perc 6 után',
+    'percet  este',
+    '2021 január 5',
+    'nincs benne időpont',
+    '',
+]
+
+
+def _first_matches(pattern, s):
+    matches = list(re.finditer(pattern, s))
+    non_empty = [m.groups() for m in matches if ''.join([g for g in m.groups() if g])]
+    if not non_empty:
+        return None
+    return matches[0].start(), matches[0].end(), matches[0].group(0), matches[0].groups(), non_empty[0]
+
+
+@pytest.mark.parametrize("inp", scan_scenarios)
+def test_scan_time_words(inp):
+    regular, reverse = scan_time_words(inp)
+    for match, pattern in ((regular, R_HOUR_MIN), (reverse, R_HOUR_MIN_REV)):
+        out = (match.start, match.end, match.text, match.groups, match.values) if match else None
+        assert out == _first_matches(pattern, inp)
@@ -1,5 +1,7 @@
+import calendar
 import pytest
-from hun_date_parser.utils import word_to_num, num_to_word, remove_accent
+from datetime import date, timedelta
+from hun_date_parser.utils import word_to_num, num_to_word, remove_accent, calendar_index, monday_of_calenderweek
 
 
 def test_remove_accent():
@@ -55,3 +57,49 @@ def test_num_to_word():
 
     for inp, exp in tf:
         assert num_to_word(inp) == exp
+
+
+calendar_index_years = [1899, 1900, 1901, 2004, 2020, 2021, 2099, 2100, 2101, 2500]
+
+
+@pytest.mark.parametrize("year", calendar_index_years)
+def test_calendar_index(year):
+    day = date(year, 1, 1) - timedelta(days=10)
+    while day.year <= year:
+        assert calendar_index.iso_year_week(day.toordinal()) == tuple(day.isocalendar()[0:2])
+        assert calendar_index.weekday(day.toordinal()) == day.weekday()
+        assert calendar_index.day_of_year(day.year, day.month, day.day) == day.timetuple().tm_yday
+        assert calendar_index.ordinal(day.year, day.month, day.day) == day.toordinal()
+        day += timedelta(days=1)
+
+    for month in range(1, 13):
+        assert calendar_index.month_length(year, month) == calendar.monthrange(year, month)[1]
+
+    for week in range(1, 54):
+        monday = monday_of_calenderweek(year, week)
+        assert monday.weekday() == 0
+        assert monday == date.fromisocalendar(year, 1, 1) + timedelta(days=7 * (week - 1))
+
+
+@pytest.mark.parametrize("year, month, day", [(2020, 13, 1), (2020, 0, 1), (2021, 2, 29), (2020, 4, 31)])
+def test_calendar_index_invalid_dates(year, month, day):
+    with pytest.raises(ValueError):
+        calendar_index.day_of_year(year, month, day)
+
+
+def test_numpy_calendar_index():
+    np = pytest.importorskip('numpy')
+    np_index = calendar_index.to_numpy()
+
+    days = np.arange(np.datetime64('1900-01-01'), np.datetime64('2101-01-01'), 5)
+    dates = [date.fromisoformat(str(d)) for d in days]
+    years, months, day_nums = (np.array([getattr(d, a) for d in dates]) for a in ('year', 'month', 'day'))
+
+    iso_years, iso_weeks = np_index.iso_year_week(days)
+    assert list(zip(iso_years.tolist(), iso_weeks.tolist())) == [tuple(d.isocalendar()[0:2]) for d in dates]
+    assert np_index.weekday(days).tolist() == [d.weekday() for d in dates]
+    assert (np_index.to_datetime64(years, months, day_nums) == days).all()
+    assert np_index.month_length(years, months).tolist() == [calendar.monthrange(d.year, d.month)[1] for d in dates]
+    assert np_index.day_of_year(years, months, day_nums).tolist() == [d.timetuple().tm_yday for d in dates]
+    assert np_index.monday_of_week(iso_years, iso_weeks).tolist() == [d - timedelta(days=d.weekday()) for d in dates]
+    assert np_index.in_range([1899, 1900, 2100, 2101]).tolist() == [False, True, True, False]